@@ -0,0 +1,99 @@
+"""Benchmark: `data_flatten` on large list responses.
+
+Compares the current in-place walk against the previous implementation, which
+re-serialized every response with `orjson.dumps(..., OPT_SORT_KEYS)` and
+parsed it back inside an `lru_cache(maxsize=128)` just to key the cache.
+
+Each variant runs in its own subprocess so peak RSS is measured in isolation:
+
+    python -m benchmarks.bench_data_flatten [--rows 40000] [--repeat 20]
+"""
+
+import argparse
+import resource
+import subprocess
+import sys
+import time
+from functools import lru_cache
+
+import orjson
+
+
+def build_response(rows):
+    """A `{data: {measurements: [...]}}` response of roughly 130 bytes/row."""
+    return {
+        "data": {
+            "measurements": [
+                {
+                    "id": str(i),
+                    "value": i * 0.5,
+                    "insertedAt": "2026-01-01T00:00:00Z",
+                    "sensor": {"id": str(i % 97), "name": f"sensor-{i % 97}"},
+                }
+                for i in range(rows)
+            ]
+        }
+    }
+
+
+@lru_cache(maxsize=128)
+def _legacy_cacheable(data_str, single_child):
+    from pygqlc.GraphQLClient import data_flatten
+
+    return data_flatten(orjson.loads(data_str), single_child)
+
+
+def legacy_data_flatten(data, single_child=False):
+    data_str = orjson.dumps(data, option=orjson.OPT_SORT_KEYS).decode("utf-8")
+    return _legacy_cacheable(data_str, single_child)
+
+
+def run_variant(variant, rows, repeat):
+    from pygqlc.GraphQLClient import data_flatten
+
+    flatten = legacy_data_flatten if variant == "legacy" else data_flatten
+    responses = [build_response(rows) for _ in range(2)]
+    baseline_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    started = time.perf_counter()
+    for n in range(repeat):
+        # Responses are almost never identical in practice: vary one value
+        response = responses[n % 2]
+        response["data"]["measurements"][0]["value"] = n
+        flatten(response["data"])
+    elapsed = (time.perf_counter() - started) / repeat
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    size_mb = len(orjson.dumps(responses[0])) / 1e6
+    print(
+        f"{variant:>8}: {size_mb:.1f} MB response, {elapsed * 1e3:9.3f} ms/call, "
+        f"peak RSS +{(peak_rss - baseline_rss) / 1024:.1f} MB"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=40000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--variant", choices=["legacy", "current"])
+    args = parser.parse_args()
+    if args.variant:
+        run_variant(args.variant, args.rows, args.repeat)
+        return
+    for variant in ("legacy", "current"):
+        subprocess.run(
+            [
+                sys.executable,
+                "-m",
+                "benchmarks.bench_data_flatten",
+                "--variant",
+                variant,
+                "--rows",
+                str(args.rows),
+                "--repeat",
+                str(args.repeat),
+            ],
+            check=True,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Benchmark: routing subscription frames, full decode vs `read_frame_header`.
+
+Times what the websocket router spends per `next` frame of N measurements
+before handing it to its subscription: `orjson.loads` is what
+`_sub_routing_loop` did before, `read_frame_header` reads just the id and
+type (the payload is decoded later, once, by the consumer; frames of unknown
+or killed subscriptions never are):
+
+    python -m benchmarks.bench_frame_routing [--rows 20000] [--repeat 200]
+"""
+
+import argparse
+import time
+
+import orjson
+
+from pygqlc.GraphQLClient import read_frame_header
+
+
+def build_frame(rows):
+    measurements = [
+        {"id": str(i), "sensorId": str(i % 97), "value": round(i * 0.37, 3)}
+        for i in range(rows)
+    ]
+    return orjson.dumps(
+        {
+            "id": "1",
+            "type": "next",
+            "payload": {"data": {"measurementsCreated": measurements}},
+        }
+    ).decode("utf-8")  # websocket-client hands text frames over as str
+
+
+def report(name, elapsed, repeat):
+    print(f"{name:>18}: {elapsed / repeat * 1e6:10.1f} µs/frame")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+    frame = build_frame(args.rows)
+    print(f"frame: {len(frame) / 1e6:.1f} MB")
+    for name, route in (
+        ("orjson.loads", orjson.loads),
+        ("read_frame_header", read_frame_header),
+    ):
+        started = time.perf_counter()
+        for _ in range(args.repeat):
+            route(frame)
+        report(name, time.perf_counter() - started, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
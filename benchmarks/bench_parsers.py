@@ -0,0 +1,83 @@
+"""Benchmark: document validation, legacy regexes vs the GraphQL parser.
+
+Scales the documents of `tests/pygqlc/gql_parsers/queries.py` up by repeating
+their root selections, and times `QueryParser.validate` against the previous
+backtracking `query_regex`, on valid documents and on the same documents with
+the final `}` missing. Legacy runs are capped with a timeout, since malformed
+documents backtrack catastrophically.
+
+    python -m benchmarks.bench_parsers [--sizes 1 10 100 1000] [--timeout 10]
+"""
+
+import argparse
+import multiprocessing
+import re
+import time
+
+from pygqlc import QueryParser
+from pygqlc.DocumentParser import parse_document
+from tests.pygqlc.gql_parsers import queries as q
+
+legacy_query_regex = r"^\s*(query(\s+[a-zA-Z_]+[a-zA-Z_0-9]?)?)?\s*(\(\s*(((\$[a-zA-Z_]+[a-zA-Z_0-9]?)\s*:\s*([a-zA-Z_]+[a-zA-Z_0-9]?!?)\s*)+\s*)\))?\s*{\s*((.\s*)+)\s*}\s*}"
+
+DOCUMENTS = [name for name in dir(q) if name.startswith("q_") and "_bad_" not in name]
+
+
+def scale(doc, times):
+    """Repeat the root selections of `doc` `times` times (aliased)."""
+    operation = parse_document(doc).operations[0]
+    start, end = operation.selection_start + 1, operation.selection_end - 1
+    body = doc[start:end]
+    selections = "\n".join(f"a{n}: {body.strip()}" if n else body for n in range(times))
+    return doc[:start] + selections + doc[end:]
+
+
+def _legacy(doc, result):
+    started = time.perf_counter()
+    re.match(legacy_query_regex, doc)
+    result.put(time.perf_counter() - started)
+
+
+def time_legacy(doc, timeout):
+    result = multiprocessing.Queue()
+    process = multiprocessing.Process(target=_legacy, args=(doc, result))
+    process.start()
+    process.join(timeout)
+    if process.is_alive():
+        process.terminate()
+        process.join()
+        return None
+    return result.get()
+
+
+def time_parser(doc):
+    started = time.perf_counter()
+    QueryParser(doc).validate()
+    return time.perf_counter() - started
+
+
+def fmt(seconds, timeout):
+    return f"> {timeout:.0f} s" if seconds is None else f"{seconds * 1e3:.2f} ms"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 10, 100, 1000])
+    parser.add_argument("--timeout", type=float, default=10)
+    args = parser.parse_args()
+    print(
+        f"{'document':<26}{'size':>6}{'bytes':>10}  {'variant':<10}{'regex':>12}{'parser':>12}"
+    )
+    for name in DOCUMENTS:
+        for size in args.sizes:
+            doc = scale(getattr(q, name), size)
+            for variant, text in (("valid", doc), ("malformed", doc.rstrip()[:-1])):
+                print(
+                    f"{name:<26}{size:>6}{len(text):>10}  {variant:<10}"
+                    f"{fmt(time_legacy(text, args.timeout), args.timeout):>12}"
+                    f"{fmt(time_parser(text), args.timeout):>12}"
+                )
+
+
+if __name__ == "__main__":
+    main()
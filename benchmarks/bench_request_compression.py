@@ -0,0 +1,83 @@
+"""Benchmark: request body compression for bulk mutation variables.
+
+For a `createMeasurements`-style body of N rows, reports the bytes sent on the
+wire and the request latency (body encoding + compression + upload at the
+given link speed) for the uncompressed body and every available compression:
+
+    python -m benchmarks.bench_request_compression [--rows 50000] [--mbps 20]
+"""
+
+import argparse
+import json
+import time
+
+import orjson
+
+from pygqlc.GraphQLClient import REQUEST_COMPRESSIONS, compress_body, zstandard
+
+MUTATION = """mutation($rows: [MeasurementInput!]!){
+  createMeasurements(rows: $rows) { successful messages { message } }
+}"""
+
+
+def build_payload(rows):
+    return {
+        "query": MUTATION,
+        "variables": {
+            "rows": [
+                {
+                    "sensorId": str(i % 97),
+                    "value": round(i * 0.37, 3),
+                    "measuredAt": f"2026-01-01T00:{i // 60 % 60:02d}:{i % 60:02d}Z",
+                }
+                for i in range(rows)
+            ]
+        },
+    }
+
+
+def timed(encode, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        body = encode()
+    return body, (time.perf_counter() - started) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--mbps", type=float, default=20.0, help="upload Mbit/s")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    payload = build_payload(args.rows)
+    bytes_per_second = args.mbps * 1e6 / 8
+    print(f"{args.rows} rows, upload link {args.mbps:g} Mbit/s")
+
+    variants = [
+        # what httpx's json= did: stdlib encoder, no compression
+        ("json= (stdlib)", lambda: json.dumps(payload).encode("utf-8")),
+        ("orjson", lambda: orjson.dumps(payload)),
+    ]
+    for compression in REQUEST_COMPRESSIONS:
+        if compression == "zstd" and zstandard is None:
+            print("zstd: skipped (pip install pygqlc[zstd])")
+            continue
+        variants.append(
+            (
+                f"orjson+{compression}",
+                lambda c=compression: compress_body(orjson.dumps(payload), c),
+            )
+        )
+
+    for name, encode in variants:
+        body, encode_time = timed(encode, args.repeat)
+        upload_time = len(body) / bytes_per_second
+        print(
+            f"{name:>16}: {len(body) / 1e6:8.3f} MB on the wire, "
+            f"encode {encode_time * 1e3:8.1f} ms, "
+            f"latency {(encode_time + upload_time) * 1e3:9.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
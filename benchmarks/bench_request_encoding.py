@@ -0,0 +1,92 @@
+"""Benchmark: request body encoding, httpx `json=` (stdlib) vs `encode_json`.
+
+Sends a bulk mutation with N rows of variables through an in-memory transport
+(no network), both on the sync and the async path. `json=` is what `execute`
+and `async_execute` did before; `execute` is the current request path (orjson
+bytes as `content=`):
+
+    python -m benchmarks.bench_request_encoding [--rows 20000] [--repeat 20]
+"""
+
+import argparse
+import asyncio
+import time
+
+import httpx
+
+from pygqlc import GraphQLClient
+
+MUTATION = """mutation($rows: [MeasurementInput!]!){
+  createMeasurements(rows: $rows) { successful }
+}"""
+URL = "http://bench/api"
+HEADERS = {"Accept": "application/json", "Content-Type": "application/json"}
+
+
+def handler(request):
+    request.read()
+    return httpx.Response(200, content=b'{"data":{"createMeasurements":null}}')
+
+
+def build_variables(rows):
+    return {
+        "rows": [
+            {
+                "sensorId": str(i % 97),
+                "value": round(i * 0.37, 3),
+                "measuredAt": f"2026-01-01T00:{i // 60 % 60:02d}:{i % 60:02d}Z",
+            }
+            for i in range(rows)
+        ]
+    }
+
+
+def report(name, elapsed, repeat):
+    print(f"{name:>22}: {elapsed / repeat * 1e3:8.2f} ms/request")
+
+
+def bench_sync(gql, variables, repeat):
+    client = httpx.Client(transport=httpx.MockTransport(handler))
+    data = {"query": MUTATION, "variables": variables}
+    started = time.perf_counter()
+    for _ in range(repeat):
+        client.post(URL, json=data, headers=HEADERS, timeout=60.0)
+    report("sync json=", time.perf_counter() - started, repeat)
+    started = time.perf_counter()
+    for _ in range(repeat):
+        gql.execute(MUTATION, variables)
+    report("sync execute", time.perf_counter() - started, repeat)
+
+
+async def bench_async(gql, variables, repeat):
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    data = {"query": MUTATION, "variables": variables}
+    started = time.perf_counter()
+    for _ in range(repeat):
+        await client.post(URL, json=data, headers=HEADERS, timeout=60.0)
+    report("async json=", time.perf_counter() - started, repeat)
+    started = time.perf_counter()
+    for _ in range(repeat):
+        await gql.async_execute(MUTATION, variables)
+    report("async async_execute", time.perf_counter() - started, repeat)
+    await client.aclose()
+    await gql.async_cleanup()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    gql = GraphQLClient()
+    gql.addEnvironment("bench", url=URL, default=True)
+    gql.client_params["transport"] = httpx.MockTransport(handler)
+    gql.async_client_params["transport"] = httpx.MockTransport(handler)
+    variables = build_variables(args.rows)
+    print(f"{args.rows} rows of variables")
+    bench_sync(gql, variables, args.repeat)
+    asyncio.run(bench_async(gql, variables, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
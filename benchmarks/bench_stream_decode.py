@@ -0,0 +1,104 @@
+"""Benchmark: full-body decode vs `StreamingListDecoder` on a large response.
+
+The response body is written to a temporary file and read back in 64 KiB
+chunks, standing in for `iter_bytes`. The `full` variant joins the chunks and
+calls `orjson.loads` once (what `execute` does); the `stream` variant feeds
+them to the streaming decoder and drops every row once processed. Each variant
+runs in its own subprocess so peak RSS is measured in isolation:
+
+    python -m benchmarks.bench_stream_decode [--rows 400000]
+"""
+
+import argparse
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+import orjson
+
+CHUNK_SIZE = 64 * 1024
+
+
+def write_response(path, rows):
+    """A `{data: {measurements: [...]}}` body of roughly 130 bytes/row."""
+    response = {
+        "data": {
+            "measurements": [
+                {
+                    "id": str(i),
+                    "value": i * 0.5,
+                    "insertedAt": "2026-01-01T00:00:00Z",
+                    "sensor": {"id": str(i % 97), "name": f"sensor-{i % 97}"},
+                }
+                for i in range(rows)
+            ]
+        }
+    }
+    with open(path, "wb") as body:
+        body.write(orjson.dumps(response))
+
+
+def read_chunks(path):
+    with open(path, "rb") as body:
+        while chunk := body.read(CHUNK_SIZE):
+            yield chunk
+
+
+def run_variant(variant, path):
+    from pygqlc.StreamDecoder import StreamingListDecoder
+
+    baseline_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    started = time.perf_counter()
+    total = 0.0
+    if variant == "full":
+        response = orjson.loads(b"".join(read_chunks(path)))
+        for row in response["data"]["measurements"]:
+            total += row["value"]
+    else:
+        decoder = StreamingListDecoder("data.measurements")
+        for chunk in read_chunks(path):
+            for row in decoder.feed(chunk):
+                total += row["value"]
+        for row in decoder.close():
+            total += row["value"]
+    elapsed = time.perf_counter() - started
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    size_mb = os.path.getsize(path) / 1e6
+    print(
+        f"{variant:>6}: {size_mb:.1f} MB response, {elapsed:7.3f} s, "
+        f"peak RSS +{(peak_rss - baseline_rss) / 1024:.1f} MB"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=400000)
+    parser.add_argument("--variant", choices=["full", "stream"])
+    parser.add_argument("--path")
+    args = parser.parse_args()
+    if args.variant:
+        run_variant(args.variant, args.path)
+        return
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "response.json")
+        write_response(path, args.rows)
+        for variant in ("full", "stream"):
+            subprocess.run(
+                [
+                    sys.executable,
+                    "-m",
+                    "benchmarks.bench_stream_decode",
+                    "--variant",
+                    variant,
+                    "--path",
+                    path,
+                ],
+                check=True,
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,325 @@
+"""Asyncio subscription transport
+
+This module implements `GraphQLClient.async_subscribe`: every async
+subscription of a client is multiplexed over a single asyncio websocket
+speaking the same graphql-transport-ws protocol (and frames) as the
+thread-based `subscribe`. Requires the optional `websockets` package
+(`pip install pygqlc[async-subscriptions]`).
+"""
+
+import asyncio
+import inspect
+import orjson
+from websockets.asyncio.client import connect
+from pygqlc.logging import log, LogLevel
+from .GraphQLClient import (
+    GQL_WS_SUBPROTOCOL,
+    PING_JSON,
+    CONNECTION_ACK_TYPE,
+    PONG_TYPE,
+    NEXT_TYPE,
+    ERROR_TYPE,
+    COMPLETE_TYPE,
+    connection_init_frame,
+    subscribe_frame,
+    complete_frame,
+    data_flatten,
+    decode_frame,
+    read_frame_header,
+    is_ws_payloadErrors_msg,
+    is_ws_connection_init_msg,
+)
+
+# Ends an AsyncSubscription iterator (unsubscribe / router shutdown)
+_END = object()
+
+
+class AsyncSubscription:
+    """Handle of a single async subscription.
+
+    It is an async iterator over the (optionally flattened) subscription
+    messages; iteration ends on `complete`, on an `error` frame or after
+    `unsubscribe()`.
+
+    Examples:
+        >>> Iterator example:
+          sub = await gql.async_subscribe(subs.sub_author_created)
+          async for message in sub:
+            print(message)
+        >>> Callback example:
+          sub = await gql.async_subscribe(
+            subs.sub_author_created, callback=on_author_created)
+          ...
+          await sub.unsubscribe()
+    """
+
+    def __init__(
+        self, router, _id, query, variables, flatten=True, on_error_callback=None
+    ):
+        self.router = router
+        self.id = _id
+        self.query = query
+        self.variables = variables
+        self.flatten = flatten
+        self.on_error_callback = on_error_callback
+        self.runs = 0
+        self.running = True
+        self.queue = asyncio.Queue()
+        self.callback_task = None
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        while self.running:
+            message = await self.queue.get()
+            if message is _END:
+                break
+            try:
+                message = decode_frame(message)  # routed undecoded
+            except orjson.JSONDecodeError:
+                log(
+                    LogLevel.WARNING,
+                    f"invalid WSS message for subscription id={self.id}",
+                )
+                continue
+            message_type = message.get("type")
+            if message_type == NEXT_TYPE:
+                pass  # continue with payload handling
+            elif message_type == ERROR_TYPE:
+                await self._on_error(message)
+                log(
+                    LogLevel.WARNING,
+                    f"stopping subscription id={self.id} on {message_type}",
+                )
+                break
+            elif message_type == COMPLETE_TYPE:
+                log(
+                    LogLevel.INFO,
+                    f"stopping subscription id={self.id} on {message_type}",
+                )
+                break
+            else:
+                log(LogLevel.WARNING, f"unknown msg type: {message}")
+                continue
+
+            if is_ws_payloadErrors_msg(message):
+                if self.on_error_callback:
+                    await self._on_error(message)
+                    continue
+                log(LogLevel.ERROR, "Subscription message has payload Errors")
+                log(LogLevel.ERROR, f"{message}")
+            elif is_ws_connection_init_msg(message):
+                pass  # Subscription successfully initialized
+            else:
+                self.runs += 1
+                data = message.get("payload", {})
+                return data_flatten(data) if self.flatten else data
+        self.running = False
+        self.router.forget(self.id)
+        raise StopAsyncIteration
+
+    async def _on_error(self, message):
+        if self.on_error_callback:
+            result = self.on_error_callback(message)
+            if inspect.isawaitable(result):
+                await result
+
+    async def unsubscribe(self):
+        """Stops the subscription on the server and ends its iterator."""
+        if not self.running:
+            return
+        self.running = False
+        await self.router.stop(self.id)
+        self.queue.put_nowait(_END)
+        if self.callback_task and self.callback_task is not asyncio.current_task():
+            await asyncio.gather(self.callback_task, return_exceptions=True)
+
+    async def _run_callback(self, callback):
+        async for message in self:
+            try:
+                result = callback(message)
+                if inspect.isawaitable(result):
+                    await result
+            except Exception:  # pylint: disable=broad-except
+                log(LogLevel.ERROR, "Error on subscription callback")
+                log(LogLevel.ERROR, f"subscription document: \n\t{self.query}")
+                if self.variables:
+                    log(
+                        LogLevel.ERROR,
+                        f"subscription variables: \n\t{self.variables}",
+                    )
+
+
+class AsyncSubscriptionRouter:
+    """Owns the asyncio websocket of a client and routes frames by id.
+
+    Reconnects with the same back-off as the thread-based router and
+    re-sends the `subscribe` frame of every live subscription (same ids)
+    once the new connection is acknowledged.
+    """
+
+    def __init__(self, client):
+        self.client = client
+        self.loop = asyncio.get_running_loop()
+        self.subs = {}
+        self.sub_counter = 0
+        self._ws = None
+        self._connected = asyncio.Event()
+        self._lock = asyncio.Lock()
+        self._router_task = None
+        self._ping_task = None
+        self.closing = False
+
+    async def subscribe(
+        self, query, variables=None, flatten=True, on_error_callback=None, _id=None
+    ):
+        if not _id:
+            self.sub_counter += 1
+            _id = str(self.sub_counter)
+        await self._ensure_connection()
+        sub = AsyncSubscription(
+            self,
+            _id,
+            query,
+            variables,
+            flatten=flatten,
+            on_error_callback=on_error_callback,
+        )
+        await self._send(subscribe_frame(_id, {"query": query, "variables": variables}))
+        # Registered only once sent, so a concurrent reconnect can't send it twice
+        self.subs[_id] = sub
+        return sub
+
+    async def stop(self, _id):
+        if self.subs.pop(_id, None) is None:
+            return
+        try:
+            await self._send(complete_frame(_id))
+        except Exception as e:  # pylint: disable=broad-except
+            log(LogLevel.WARNING, f"WSS Pipe broken, nothing to stop ({e})")
+
+    def forget(self, _id):
+        self.subs.pop(_id, None)
+
+    async def close(self):
+        """Ends every subscription and closes the websocket."""
+        self.closing = True
+        for sub in list(self.subs.values()):
+            await sub.unsubscribe()
+        for task in (self._router_task, self._ping_task):
+            if task is not None:
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+        await self._close_ws()
+
+    async def _send(self, frame):
+        await self._connected.wait()
+        await self._ws.send(frame)
+
+    async def _ensure_connection(self):
+        async with self._lock:
+            if self._router_task is None:
+                await self._connect()
+                self._router_task = asyncio.create_task(self._routing_loop())
+                self._ping_task = asyncio.create_task(self._ping_pong())
+
+    async def _connect(self):
+        client = self.client
+        env = client.environments.get(client.environment)
+        if not env:
+            raise Exception("cannot subscribe without setting an environment")
+        if not env.get("wss"):
+            raise Exception(
+                f"No WSS URL configured for environment {client.environment}"
+            )
+        ws = await connect(env["wss"], subprotocols=[GQL_WS_SUBPROTOCOL])
+        try:
+            await ws.send(connection_init_frame(env.get("headers", {})))
+            message = orjson.loads(
+                await asyncio.wait_for(ws.recv(), client.ack_timeout)
+            )
+            if (
+                not isinstance(message, dict)
+                or message.get("type") != CONNECTION_ACK_TYPE
+            ):
+                raise Exception(f"unexpected connection ack: {message}")
+        except BaseException:
+            await ws.close()
+            raise
+        self._ws = ws
+        self._connected.set()
+
+    async def _close_ws(self):
+        self._connected.clear()
+        ws, self._ws = self._ws, None
+        if ws is not None:
+            try:
+                await ws.close()
+            except Exception as e:  # pylint: disable=broad-except
+                log(LogLevel.DEBUG, f"Ignoring error closing stale WSS connection: {e}")
+
+    async def _reconnect(self):
+        await self._close_ws()
+        reconnect_delay = 1.0
+        while not self.closing:
+            log(LogLevel.WARNING, "Connection halted, attempting reconnection...")
+            try:
+                await self._connect()
+            except Exception:  # pylint: disable=broad-except
+                log(LogLevel.ERROR, "Failed reconnecting async WSS")
+                await asyncio.sleep(reconnect_delay)
+                reconnect_delay = min(reconnect_delay * 1.5, 5.0)
+                continue
+            log(
+                LogLevel.SUCCESS,
+                "WSS Reconnection succeeded, attempting resubscription to lost subs",
+            )
+            for _id, sub in list(self.subs.items()):
+                await self._ws.send(
+                    subscribe_frame(
+                        _id, {"query": sub.query, "variables": sub.variables}
+                    )
+                )
+            log(LogLevel.INFO, "finished resubscriptions")
+            return
+
+    async def _routing_loop(self):
+        while not self.closing:
+            try:
+                raw = await self._ws.recv()
+                # only the id and type: the payload is decoded by the consumer
+                _id, message_type, message = read_frame_header(raw)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:  # pylint: disable=broad-except
+                if self.closing:
+                    break
+                log(LogLevel.WARNING, f"Async WSS connection lost: {e!r}")
+                await self._reconnect()
+                continue
+
+            if _id is None and message_type is None and not isinstance(message, dict):
+                log(LogLevel.WARNING, "invalid WSS message, reconnecting")
+                await self._reconnect()
+                continue
+
+            if _id is not None:
+                sub = self.subs.get(_id)
+                if sub and sub.running:  # else dropped without decoding
+                    sub.queue.put_nowait(raw if message is None else message)
+            elif message_type in (CONNECTION_ACK_TYPE, PONG_TYPE):
+                pass
+            else:
+                log(LogLevel.WARNING, f"unknown msg type: {message or raw}")
+
+    async def _ping_pong(self):
+        while not self.closing:
+            await asyncio.sleep(self.client.pingIntervalTime)
+            if not self._connected.is_set():
+                continue
+            try:
+                await self._ws.send(PING_JSON)
+            except Exception:  # pylint: disable=broad-except
+                # The routing loop notices the broken socket and reconnects
+                log(LogLevel.WARNING, "error trying to send ping, WSS Pipe is broken")
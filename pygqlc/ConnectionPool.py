@@ -0,0 +1,308 @@
+"""HTTP connection pools of the environments
+
+`PoolConfig` describes the connection pool of an environment (sizes,
+keep-alive, HTTP/2 and timeouts) and translates it into httpx settings;
+`EnvironmentPool` owns the httpx clients of one environment, so every
+environment gets its own isolated connections and counts the requests
+using them; `pool_stats` reports the connections of an httpx client's pool.
+"""
+
+import asyncio
+import contextlib
+import threading
+import time
+import weakref
+from dataclasses import dataclass
+
+import httpx
+
+
+@dataclass(frozen=True)
+class PoolConfig:
+    """Connection pool settings of an environment.
+
+    Attributes:
+        max_connections (int): Connections open at once (None: unlimited).
+          Defaults to 100.
+        max_keepalive_connections (int): Idle connections kept open for reuse.
+          Defaults to 20.
+        keepalive_expiry (float): Seconds an idle connection is kept. Defaults
+          to 5.
+        http2 (bool): Negotiate HTTP/2. Defaults to True.
+        http2_max_streams (int): Requests of the environment in flight at once
+          (with HTTP/2, streams multiplexed over the pooled connections). The
+          h2 stack also caps every connection at the server's
+          SETTINGS_MAX_CONCURRENT_STREAMS. Defaults to None (no extra cap).
+        connect_timeout (float): Seconds to establish a connection. Defaults
+          to None (the environment's post_timeout).
+        read_timeout (float): Seconds to wait for response data. Defaults to
+          None (post_timeout).
+        write_timeout (float): Seconds to send request data. Defaults to None
+          (post_timeout).
+        pool_timeout (float): Seconds to wait for a free connection. Defaults
+          to None (post_timeout).
+        shared_client (bool): Use one thread-safe sync client (and pool) for
+          every thread instead of one per thread. Defaults to False.
+    """
+
+    max_connections: int | None = 100
+    max_keepalive_connections: int | None = 20
+    keepalive_expiry: float | None = 5.0
+    http2: bool = True
+    http2_max_streams: int | None = None
+    connect_timeout: float | None = None
+    read_timeout: float | None = None
+    write_timeout: float | None = None
+    pool_timeout: float | None = None
+    shared_client: bool = False
+
+    def limits(self):
+        """This function builds the httpx pool limits.
+
+        Returns:
+            (httpx.Limits): Pool limits.
+        """
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry,
+        )
+
+    def timeout(self, default):
+        """This function builds the request timeout.
+
+        Args:
+            default (float): Seconds for the phases without their own timeout
+              (the environment's post_timeout).
+
+        Returns:
+            (httpx.Timeout): Request timeout.
+        """
+
+        def phase(value):
+            return default if value is None else value
+
+        return httpx.Timeout(
+            default,
+            connect=phase(self.connect_timeout),
+            read=phase(self.read_timeout),
+            write=phase(self.write_timeout),
+            pool=phase(self.pool_timeout),
+        )
+
+
+DEFAULT_POOL = PoolConfig()
+
+
+def pool_stats(client, max_connections=None):
+    """This function reports the connections of an httpx client's pool.
+
+    Best-effort: httpx does not expose its connection pool, so the counts
+    come from httpcore's public `connections` of the client's default
+    transport and are all 0 when it has none (e.g. a mock transport). The
+    requests in flight and waiting are counted by `EnvironmentPool`.
+
+    Args:
+        client (httpx.Client, httpx.AsyncClient): Client to inspect.
+        max_connections (int, optional): Configured pool size, reported as
+          is. Defaults to None.
+
+    Returns:
+        (dict): `connections` open, of which `active` serve requests and
+          `idle` wait for reuse, and the pool's `max_connections`.
+    """
+    stats = {
+        "connections": 0,
+        "active": 0,
+        "idle": 0,
+        "max_connections": max_connections,
+    }
+    pool = getattr(getattr(client, "_transport", None), "_pool", None)
+    if pool is None or client.is_closed:
+        return stats
+    connections = list(pool.connections)
+    idle = sum(1 for connection in connections if connection.is_idle())
+    stats.update(
+        connections=len(connections), active=len(connections) - idle, idle=idle
+    )
+    return stats
+
+
+class EnvironmentPool:
+    """The httpx clients of one environment, created on first use.
+
+    Sync requests use one client per thread (or a single shared one with
+    `PoolConfig.shared_client`), async requests the `async_client` kept by
+    GraphQLClient. Once retired (the environment's settings changed, or it
+    sat idle) the pool is closed as soon as no request is using it; its async
+    client is handed to `closing` to be `aclose()`d from an event loop.
+
+    Args:
+        config (PoolConfig): Pool settings of the environment.
+        client_params (dict): Keyword arguments of the sync clients.
+        async_client_params (dict): Keyword arguments of the async client.
+        closing (list): Receives async clients to close.
+
+    Attributes:
+        last_used (float): `time.monotonic()` of the last request.
+        in_flight (int): Requests using the pool right now.
+        pending (int): Of those, requests waiting for a slot of
+          `http2_max_streams`.
+    """
+
+    def __init__(self, config, client_params, async_client_params, closing):
+        self.config = config
+        self.client_params = client_params
+        self.async_client_params = async_client_params
+        self.async_client = None
+        self.last_used = time.monotonic()
+        self.in_flight = 0
+        self.pending = 0
+        self.retired = False
+        self._closing = closing
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._shared = None
+        self._clients = weakref.WeakSet()  # every live sync client
+        limit = config.http2_max_streams
+        self._slots = threading.BoundedSemaphore(limit) if limit else None
+        self._async_slots = weakref.WeakKeyDictionary()  # per event loop
+
+    def _new_client(self):
+        client = httpx.Client(**self.client_params)
+        self._clients.add(client)
+        return client
+
+    def client(self):
+        """This function returns the sync client of the calling thread.
+
+        Returns:
+            (httpx.Client): Thread-local client, or the shared one.
+        """
+        if self.config.shared_client:
+            with self._lock:
+                if self._shared is None or self._shared.is_closed:
+                    self._shared = self._new_client()
+                return self._shared
+        client = getattr(self._local, "client", None)
+        if client is None or client.is_closed:
+            client = self._local.client = self._new_client()
+        return client
+
+    def drop(self, client):
+        """This function replaces a failed sync client on the next request.
+
+        Args:
+            client (httpx.Client): The client that failed.
+        """
+        with self._lock:
+            if client is self._shared:
+                self._shared = None
+        if getattr(self._local, "client", None) is client:
+            self._local.client = None
+
+    @contextlib.contextmanager
+    def using(self):
+        """Marks a request in flight, so the pool is not closed under it."""
+        with self._lock:
+            self.in_flight += 1
+            self.last_used = time.monotonic()
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+                done = self.retired and not self.in_flight
+            if done:
+                self.close()
+
+    def _waiting(self, delta):
+        with self._lock:
+            self.pending += delta
+
+    @contextlib.contextmanager
+    def slot(self):
+        """Slot of the cap on requests in flight (`http2_max_streams`)."""
+        if self._slots is None:
+            yield
+            return
+        self._waiting(1)
+        try:
+            self._slots.acquire()
+        finally:
+            self._waiting(-1)
+        try:
+            yield
+        finally:
+            self._slots.release()
+
+    @contextlib.asynccontextmanager
+    async def async_slot(self):
+        """Async `slot`: semaphores are per running event loop."""
+        limit = self.config.http2_max_streams
+        if not limit:
+            yield
+            return
+        loop = asyncio.get_running_loop()
+        slot = self._async_slots.get(loop)
+        if slot is None:
+            slot = self._async_slots[loop] = asyncio.Semaphore(limit)
+        self._waiting(1)
+        try:
+            await slot.acquire()
+        finally:
+            self._waiting(-1)
+        try:
+            yield
+        finally:
+            slot.release()
+
+    def retire(self):
+        """This function closes the pool once no request uses it.
+
+        Returns:
+            (bool): The pool was closed right away.
+        """
+        with self._lock:
+            self.retired = True
+            if self.in_flight:
+                return False
+        self.close()
+        return True
+
+    def close(self):
+        """This function closes every sync client and hands the async client
+        over to `closing`."""
+        with self._lock:
+            clients = list(self._clients)
+            self._shared = None
+        for client in clients:
+            try:
+                client.close()
+            except Exception:  # pylint: disable=broad-except
+                pass
+        client, self.async_client = self.async_client, None
+        if client is not None:
+            self._closing.append(client)
+
+    def stats(self):
+        """This function reports the utilization of the pool's clients.
+
+        Returns:
+            (dict): `sync` (summed over the live sync clients, `clients` of
+              them) and `async` connections, as `pool_stats` reports them,
+              plus the pool's requests `in_flight` and, of those, `pending`.
+        """
+        clients = [client for client in list(self._clients) if not client.is_closed]
+        sync = {"clients": len(clients), "connections": 0, "active": 0, "idle": 0}
+        sync["max_connections"] = self.config.max_connections
+        for client in clients:
+            stats = pool_stats(client, self.config.max_connections)
+            for field in ("connections", "active", "idle"):
+                sync[field] += stats[field]
+        return {
+            "sync": sync,
+            "async": pool_stats(self.async_client, self.config.max_connections),
+            "in_flight": self.in_flight,
+            "pending": self.pending,
+        }
@@ -0,0 +1,368 @@
+"""GraphQL document lexer and parser
+
+Linear-time replacement for the old validation regexes: `tokenize` scans the
+document once with a single regex whose alternatives cannot backtrack into
+each other (possessive quantifiers), and `parse_document` is a recursive
+descent parser over those tokens for the executable part of the GraphQL
+grammar (operations and fragments). The resulting `Document` keeps source
+offsets, so callers can slice the original text (e.g. the root selection of a
+mutation for `MutationBatch`).
+
+Parsed documents are kept in a bounded LRU cache keyed by the document text,
+so a template used for every item of a batch is parsed once per process
+(`parse_document.cache_info()` reports hits and misses).
+"""
+
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+
+PUNCTUATOR = "punctuator"
+NAME = "name"
+NUMBER = "number"
+STRING = "string"
+BLOCK_STRING = "block_string"
+EOF = "eof"
+
+token_regex = re.compile(
+    r"""
+    (?P<ignored>(?:[\s,\ufeff]++|\#[^\n\r]*+)++)
+    |(?P<block_string>\"\"\"(?:[^"\\]|\\\"\"\"|\\|"(?!""))*+\"\"\")
+    |(?P<string>"(?:[^"\\\n\r]|\\.)*+")
+    |(?P<number>-?(?:0|[1-9][0-9]*+)(?:\.[0-9]++)?(?:[eE][+-]?[0-9]++)?)
+    |(?P<name>[_A-Za-z][_0-9A-Za-z]*+)
+    |(?P<punctuator>\.\.\.|[!$&()\:=@\[\]{}|])
+    """,
+    re.VERBOSE,
+)
+
+OPERATION_TYPES = ("query", "mutation", "subscription")
+
+# Number of distinct documents kept by the `parse_document` cache
+DOCUMENT_CACHE_SIZE = 512
+
+
+class GraphQLSyntaxError(Exception):
+    """Raised when a document is not valid GraphQL syntax.
+
+    Attributes:
+        position (int): Offset in the document where parsing failed.
+    """
+
+    def __init__(self, message: str, position: int) -> None:
+        super().__init__(f"{message} (at position {position})")
+        self.message = message
+        self.position = position
+
+
+@dataclass(frozen=True)
+class Token:
+    kind: str
+    value: str
+    start: int
+    end: int
+
+
+@dataclass(frozen=True)
+class VariableDefinition:
+    name: str
+    type: str
+    default: str | None
+
+
+@dataclass(frozen=True)
+class OperationDefinition:
+    """An operation; `selection_start`/`selection_end` span its `{...}` and
+    `variable_references` holds the (start, end, name) of each `$name` used in
+    it."""
+
+    operation: str
+    name: str | None
+    variable_definitions: tuple
+    start: int
+    end: int
+    selection_start: int
+    selection_end: int
+    variable_references: tuple = ()
+
+
+@dataclass(frozen=True)
+class FragmentDefinition:
+    name: str
+    start: int
+    end: int
+
+
+@dataclass(frozen=True)
+class Document:
+    source: str
+    definitions: tuple
+
+    @property
+    def operations(self):
+        return [d for d in self.definitions if isinstance(d, OperationDefinition)]
+
+
+def tokenize(source):
+    """This function splits a document into tokens (ignoring whitespace,
+    commas and comments), ending with an EOF token.
+
+    Args:
+        source (string): GraphQL document.
+
+    Raises:
+        GraphQLSyntaxError: On a character that starts no token.
+
+    Returns:
+        (list): List of Token.
+    """
+    tokens = []
+    position = 0
+    length = len(source)
+    match = token_regex.match
+    while position < length:
+        found = match(source, position)
+        if found is None:
+            raise GraphQLSyntaxError(
+                f"unexpected character {source[position]!r}", position
+            )
+        kind = found.lastgroup
+        if kind != "ignored":
+            tokens.append(Token(kind, found.group(), position, found.end()))
+        position = found.end()
+    tokens.append(Token(EOF, "", length, length))
+    return tokens
+
+
+class _Parser:
+    """Recursive descent parser over the token list."""
+
+    def __init__(self, source):
+        self.source = source
+        self.tokens = tokenize(source)
+        self.index = 0
+        self.references = []
+
+    @property
+    def token(self):
+        return self.tokens[self.index]
+
+    def fail(self, message):
+        token = self.token
+        found = "end of document" if token.kind == EOF else repr(token.value)
+        raise GraphQLSyntaxError(f"{message}, found {found}", token.start)
+
+    def peek(self, value):
+        token = self.token
+        return token.value == value and token.kind in (PUNCTUATOR, NAME)
+
+    def skip(self, value):
+        if self.peek(value):
+            self.index += 1
+            return True
+        return False
+
+    def expect(self, value):
+        if not self.skip(value):
+            self.fail(f"expected {value!r}")
+        return self.tokens[self.index - 1]
+
+    def name(self):
+        token = self.token
+        if token.kind != NAME:
+            self.fail("expected a name")
+        self.index += 1
+        return token.value
+
+    def document(self):
+        definitions = []
+        while self.token.kind != EOF:
+            definitions.append(self.definition())
+        if not definitions:
+            self.fail("expected a definition")
+        return Document(self.source, tuple(definitions))
+
+    def definition(self):
+        start = self.token.start
+        self.references = []
+        if self.peek("{"):
+            sel_start, sel_end = self.selection_set()
+            return OperationDefinition(
+                "query",
+                None,
+                (),
+                start,
+                sel_end,
+                sel_start,
+                sel_end,
+                tuple(self.references),
+            )
+        if self.token.kind == NAME and self.token.value in OPERATION_TYPES:
+            operation = self.name()
+            name = self.name() if self.token.kind == NAME else None
+            variables = self.variable_definitions()
+            self.directives(const=True)
+            sel_start, sel_end = self.selection_set()
+            return OperationDefinition(
+                operation,
+                name,
+                variables,
+                start,
+                sel_end,
+                sel_start,
+                sel_end,
+                tuple(self.references),
+            )
+        if self.peek("fragment"):
+            self.index += 1
+            name = self.name()
+            if name == "on":
+                self.fail("expected a fragment name")
+            self.expect("on")
+            self.name()
+            self.directives()
+            _, end = self.selection_set()
+            return FragmentDefinition(name, start, end)
+        self.fail("expected an operation or fragment")
+
+    def variable_definitions(self):
+        if not self.skip("("):
+            return ()
+        definitions = []
+        while True:
+            self.expect("$")
+            name = self.name()
+            self.expect(":")
+            type_start = self.token.start
+            self.type_reference()
+            var_type = self.source[type_start : self.tokens[self.index - 1].end]
+            default = None
+            if self.skip("="):
+                default_start = self.token.start
+                self.value(const=True)
+                default = self.source[default_start : self.tokens[self.index - 1].end]
+            self.directives(const=True)
+            definitions.append(
+                VariableDefinition(name, "".join(var_type.split()), default)
+            )
+            if self.skip(")"):
+                return tuple(definitions)
+
+    def type_reference(self):
+        if self.skip("["):
+            self.type_reference()
+            self.expect("]")
+        else:
+            self.name()
+        self.skip("!")
+
+    def directives(self, const=False):
+        while self.skip("@"):
+            self.name()
+            self.arguments(const)
+
+    def arguments(self, const=False):
+        if not self.skip("("):
+            return
+        while True:
+            self.name()
+            self.expect(":")
+            self.value(const)
+            if self.skip(")"):
+                return
+
+    def selection_set(self):
+        start = self.expect("{").start
+        while True:
+            self.selection()
+            if self.peek("}"):
+                return start, self.expect("}").end
+
+    def selection(self):
+        if self.skip("..."):
+            if self.token.kind == NAME and self.token.value != "on":
+                self.name()  # fragment spread
+                self.directives()
+                return
+            if self.skip("on"):
+                self.name()
+            self.directives()
+            self.selection_set()  # inline fragment
+            return
+        self.name()
+        if self.skip(":"):
+            self.name()  # aliased field
+        self.arguments()
+        self.directives()
+        if self.peek("{"):
+            self.selection_set()
+
+    def value(self, const=False):
+        token = self.token
+        if token.kind == PUNCTUATOR:
+            if token.value == "$" and not const:
+                self.index += 1
+                name = self.name()
+                self.references.append(
+                    (token.start, self.tokens[self.index - 1].end, name)
+                )
+                return
+            if token.value == "[":
+                self.index += 1
+                while not self.skip("]"):
+                    self.value(const)
+                return
+            if token.value == "{":
+                self.index += 1
+                while not self.skip("}"):
+                    self.name()
+                    self.expect(":")
+                    self.value(const)
+                return
+            self.fail("expected a value")
+        if token.kind == EOF:
+            self.fail("expected a value")
+        self.index += 1  # number, string, block string, boolean, null, enum
+
+
+def _parse(source):
+    try:
+        return _Parser(source).document()
+    except RecursionError:
+        raise GraphQLSyntaxError("document nested too deeply", 0) from None
+
+
+@lru_cache(maxsize=DOCUMENT_CACHE_SIZE)
+def _parse_cached(source):
+    # Invalid documents are cached too (as their error), so a bad template
+    # used in a loop is not re-parsed on every call
+    try:
+        return _parse(source)
+    except GraphQLSyntaxError as e:
+        return e
+
+
+def parse_document(source):
+    """This function parses a GraphQL executable document.
+
+    Results are cached by document text (LRU, `DOCUMENT_CACHE_SIZE` entries);
+    the returned `Document` is immutable and shared between callers.
+
+    Args:
+        source (string): GraphQL document.
+
+    Raises:
+        GraphQLSyntaxError: The document is not valid GraphQL syntax.
+
+    Returns:
+        (Document): The parsed document.
+    """
+    result = _parse_cached(source)
+    if isinstance(result, GraphQLSyntaxError):
+        raise GraphQLSyntaxError(result.message, result.position)
+    return result
+
+
+# functools-style cache introspection: hits, misses, maxsize, currsize
+parse_document.cache_info = _parse_cached.cache_info
+parse_document.cache_clear = _parse_cached.cache_clear
@@ -8,10 +8,17 @@ GQLResponse (type variable): [data[field(string)], errors[message(string),
 """
 
 import asyncio
+import decimal
+import gzip
+import hashlib
+import queue
+import re
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
 import traceback
 import time
 import threading
-from functools import lru_cache
 import websocket
 import httpx
 import pydash as py_
@@ -20,7 +27,24 @@ import logging
 from pygqlc.helper_modules.Singleton import Singleton
 from pygqlc.logging import log, LogLevel
 from tenacity import retry, retry_if_result, stop_after_attempt, wait_random
+from .ConnectionPool import DEFAULT_POOL, EnvironmentPool, PoolConfig
 from .MutationBatch import MutationBatch
+from .DocumentParser import DOCUMENT_CACHE_SIZE, GraphQLSyntaxError, parse_document
+from .ResponseCache import ResponseCache, cache_key
+from .SingleFlight import SingleFlight
+from .SubscriptionQueue import MessageBatch, SubscriptionQueue
+from .SubscriptionProcesses import (
+    DEFAULT_START_METHOD,
+    SubscriptionProcessPool,
+    callable_reference,
+)
+from .SubscriptionWorkers import PooledSubscription, SubscriptionWorkerPool
+from .StreamDecoder import StreamingListDecoder
+
+try:
+    import zstandard
+except ImportError:  # optional: pip install pygqlc[zstd]
+    zstandard = None
 
 # Set httpx logger to WARNING level to reduce HTTP request logs
 logging.getLogger("httpx").setLevel(logging.WARNING)
@@ -79,6 +103,211 @@ class GQLResponseException(Exception):
         self.response_body = response_body
 
 
+# Request bodies are encoded with orjson: datetimes, dataclasses, UUIDs and
+# enums natively, numpy arrays/scalars and non-string dict keys via options
+JSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+
+def json_default(value):
+    """orjson fallback for the types it does not serialize by itself."""
+    if isinstance(value, decimal.Decimal):
+        return str(value)  # exact, as GraphQL Decimal scalars expect
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def encode_json(value):
+    """This function encodes a request body (or variables) with orjson.
+
+    Args:
+        value (any): Payload to encode.
+
+    Raises:
+        TypeError: The payload has a value that can't be serialized.
+
+    Returns:
+        (bytes): JSON document.
+    """
+    return orjson.dumps(value, default=json_default, option=JSON_OPTIONS)
+
+
+# Automatic Persisted Queries (APQ) errors returned by the server
+PERSISTED_QUERY_NOT_FOUND = "PersistedQueryNotFound"
+PERSISTED_QUERY_NOT_SUPPORTED = "PersistedQueryNotSupported"
+_PERSISTED_QUERY_CODES = {
+    "PERSISTED_QUERY_NOT_FOUND": PERSISTED_QUERY_NOT_FOUND,
+    "PERSISTED_QUERY_NOT_SUPPORTED": PERSISTED_QUERY_NOT_SUPPORTED,
+}
+
+
+@lru_cache(maxsize=DOCUMENT_CACHE_SIZE)
+def persisted_query_hash(query):
+    """SHA-256 hex digest of a document, memoized per document text."""
+    return hashlib.sha256(query.encode("utf-8")).hexdigest()
+
+
+def persisted_query_error(result):
+    """This function finds an APQ error in a GraphQL response.
+
+    Args:
+        result (dict): Raw GraphQLResponse.
+
+    Returns:
+        (string): `PERSISTED_QUERY_NOT_FOUND`, `PERSISTED_QUERY_NOT_SUPPORTED`
+          or None.
+    """
+    if not isinstance(result, dict):
+        return None
+    for error in result.get("errors") or []:
+        if not isinstance(error, dict):
+            continue
+        message = error.get("message")
+        if message in (PERSISTED_QUERY_NOT_FOUND, PERSISTED_QUERY_NOT_SUPPORTED):
+            return message
+        code = _PERSISTED_QUERY_CODES.get(py_.get(error, "extensions.code"))
+        if code:
+            return code
+    return None
+
+
+def persisted_query_miss(content):
+    """APQ error of a raw response body; only bodies mentioning persisted
+    queries are decoded."""
+    if b"ersistedQuery" not in content and b"PERSISTED_QUERY" not in content:
+        return None
+    try:
+        return persisted_query_error(orjson.loads(content))
+    except orjson.JSONDecodeError:
+        return None
+
+
+# Request body compressions (Content-Encoding) an environment can opt into
+REQUEST_COMPRESSIONS = ("gzip", "zstd")
+GZIP_LEVEL = 6
+# Bodies smaller than this are sent uncompressed by default
+COMPRESSION_THRESHOLD = 16 * 1024
+
+
+def check_compression(compression):
+    """This function validates a request compression setting.
+
+    Args:
+        compression (string): None, 'gzip' or 'zstd'.
+
+    Raises:
+        ValueError: Unknown compression.
+        ImportError: 'zstd' without the optional `zstandard` package.
+    """
+    if compression is not None and compression not in REQUEST_COMPRESSIONS:
+        raise ValueError(
+            f"unknown request compression {compression!r}, "
+            f"expected one of {REQUEST_COMPRESSIONS}"
+        )
+    if compression == "zstd" and zstandard is None:
+        raise ImportError("zstd compression requires: pip install pygqlc[zstd]")
+
+
+def compress_body(body, compression):
+    """This function compresses an encoded request body.
+
+    Args:
+        body (bytes): Encoded body.
+        compression (string): 'gzip' or 'zstd'.
+
+    Returns:
+        (bytes): The body for a `Content-Encoding: <compression>` request.
+    """
+    if compression == "zstd":
+        return zstandard.ZstdCompressor().compress(body)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+@dataclass(frozen=True)
+class RequestTemplate:
+    """Everything `execute` needs from an environment, compiled once.
+
+    Rebuilt by `addEnvironment`, `setUrl`, `addHeader`, `setPostTimeout`,
+    `setPersistedQueries` and `setCompression`, and when the request path
+    finds the environment dict changed under it (its `source` no longer
+    matches), so the request path does no header merging or timeout parsing.
+    """
+
+    name: str
+    source: tuple
+    url: str
+    pool: PoolConfig
+    headers: httpx.Headers
+    compressed_headers: httpx.Headers | None
+    timeout: httpx.Timeout
+    compression: str | None
+    compression_threshold: int
+    persisted_queries: bool
+    persisted_queries_get: bool
+
+
+def environment_source(env, default_headers):
+    """Settings of an environment its template is compiled from, as a tuple
+    that is cheap to build and compare on every request."""
+    headers = env.get("headers") or {}
+    return (
+        env.get("url"),
+        tuple(default_headers.items()),
+        tuple(headers.items()),
+        env.get("pool"),
+        env.get("post_timeout"),
+        env.get("compression"),
+        env.get("compression_threshold"),
+        env.get("persisted_queries"),
+        env.get("persisted_queries_get"),
+    )
+
+
+def compile_environment(name, env, default_headers):
+    """This function builds the request template of an environment.
+
+    Args:
+        name (string): Name of the environment.
+        env (dict): The environment.
+        default_headers (dict): Headers the environment's headers extend.
+
+    Returns:
+        (RequestTemplate): The compiled template.
+    """
+    headers = httpx.Headers(default_headers)
+    headers.update(env.get("headers") or {})
+    compression = env.get("compression")
+    compressed_headers = None
+    if compression:
+        compressed_headers = httpx.Headers(headers)
+        compressed_headers["Content-Encoding"] = compression
+    pool = env.get("pool") or DEFAULT_POOL
+    return RequestTemplate(
+        name=name,
+        source=environment_source(env, default_headers),
+        url=env.get("url"),
+        pool=pool,
+        headers=headers,
+        compressed_headers=compressed_headers,
+        timeout=pool.timeout(float(env.get("post_timeout", 60))),
+        compression=compression,
+        compression_threshold=env.get("compression_threshold", COMPRESSION_THRESHOLD),
+        persisted_queries=bool(env.get("persisted_queries")),
+        persisted_queries_get=bool(env.get("persisted_queries_get")),
+    )
+
+
+@lru_cache(maxsize=DOCUMENT_CACHE_SIZE)
+def is_query_document(query):
+    """True when every operation of the document is a query (safe for GET),
+    memoized per document text."""
+    try:
+        operations = parse_document(query).operations
+    except GraphQLSyntaxError:
+        return False
+    return bool(operations) and all(op.operation == "query" for op in operations)
+
+
 def is_ws_payloadErrors_msg(message):
     return bool(py_.get(message, "payload.errors"))
 
@@ -120,51 +349,13 @@ def exception_errors(error: Exception) -> list[dict]:
     return [{"message": str(error) or repr(error)}]
 
 
-@lru_cache(maxsize=128)
-def _data_flatten_cacheable(data_str, single_child):
-    """Internal cacheable version of data_flatten using string representation of data.
-
-    Args:
-        data_str (str): String representation of data object
-        single_child (bool): Whether to flatten if data has only one child
-
-    Returns:
-        The flattened data structure
-    """
-    data = orjson.loads(data_str)
-    return _data_flatten_impl(data, single_child)
-
-
-def _data_flatten_impl(data, single_child=False):
-    """Implementation of data_flatten that works on data structures directly.
-
-    Args:
-        data (dict, list): The data of a GqlResponse.
-        single_child (bool): Checks if the data has only one element.
-
-    Returns:
-        (dict): Returns a formatted data.
-    """
-    if isinstance(data, dict):
-        keys = list(data.keys())
-        if len(keys) == 1:
-            return _data_flatten_impl(data[keys[0]], single_child)
-        else:
-            return data  # ! various elements, nothing to flatten
-    elif single_child and isinstance(data, list):
-        if len(data) == 1:
-            return _data_flatten_impl(data[0], single_child)
-        elif len(data) == 0:
-            return None  # * Return none if no child was found
-        else:
-            return data
-    else:
-        return data  # ! not a dict, nothing to flatten
-
-
 def data_flatten(data, single_child=False):
     """This function formats the data structure of a GqlResponse.
 
+    Walks the already-decoded response in place: it only descends through
+    single-key dicts (and single-element lists when `single_child`), so it
+    never copies or re-serializes the payload, whatever its size.
+
     Args:
         data (dict, list): The data of a GqlResponse.
         single_child (bool, optional): Checks if the data has only one element.
@@ -173,21 +364,20 @@ def data_flatten(data, single_child=False):
     Returns:
         (dict): Returns a formatted data.
     """
-    if data is None:
-        return None
-
-    # For simple types or non-serializable objects, use direct implementation
-    if isinstance(data, (str, int, float, bool)) or not isinstance(data, (dict, list)):
-        return data
-
-    try:
-        # For cacheable data structures, use the cached version with orjson
-        # orjson doesn't have sort_keys parameter, but has OPT_SORT_KEYS option
-        data_str = orjson.dumps(data, option=orjson.OPT_SORT_KEYS).decode("utf-8")
-        return _data_flatten_cacheable(data_str, single_child)
-    except (TypeError, ValueError):
-        # Fall back to direct implementation for non-serializable data
-        return _data_flatten_impl(data, single_child)
+    while True:
+        if isinstance(data, dict):
+            if len(data) != 1:
+                return data  # ! various elements, nothing to flatten
+            data = next(iter(data.values()))
+        elif single_child and isinstance(data, list):
+            if len(data) == 1:
+                data = data[0]
+            elif len(data) == 0:
+                return None  # * Return none if no child was found
+            else:
+                return data
+        else:
+            return data  # ! not a dict, nothing to flatten
 
 
 def safe_pop(data, index=0, default=None):
@@ -217,6 +407,90 @@ ERROR_TYPE = "error"
 COMPLETE_TYPE = "complete"
 
 
+# A string `"id"`/`"type"` field at the start of a frame (read_frame_header)
+_FRAME_FIELD = re.compile(r'\s*"(id|type)"\s*:\s*"([^"\\]*)"\s*([,}])')
+_FRAME_FIELD_BYTES = re.compile(rb'\s*"(id|type)"\s*:\s*"([^"\\]*)"\s*([,}])')
+
+
+def read_frame_header(raw):
+    """This function reads the `id` and `type` of a graphql-transport-ws
+    frame without decoding its payload.
+
+    Servers send both fields before the payload, so matching the leading
+    fields is enough to route a frame; any other frame (another key order,
+    escaped strings, not an object) is decoded in full instead.
+
+    Args:
+        raw (string, bytes): Frame as read off the websocket.
+
+    Raises:
+        orjson.JSONDecodeError: A frame decoded in full is not valid JSON.
+
+    Returns:
+        (tuple): `(id, type, message)`; `message` is the decoded frame when it
+          had to be decoded, else None. A frame that is not an object reads
+          as `(None, None, <its value>)`.
+    """
+    is_bytes = isinstance(raw, (bytes, bytearray))
+    pattern = _FRAME_FIELD_BYTES if is_bytes else _FRAME_FIELD
+    fields = {}
+    if raw[:1] in (b"{", "{"):
+        pos = 1
+        while True:
+            match = pattern.match(raw, pos)
+            if match is None:
+                break
+            key, value, end = match.groups()
+            if is_bytes:
+                key, value, end = key.decode(), value.decode(), end.decode()
+            fields[key] = value
+            if end == "}" or len(fields) == 2:
+                # the whole frame, or everything routing needs
+                return fields.get("id"), fields.get("type"), None
+            pos = match.end()
+    message = orjson.loads(raw)
+    if not isinstance(message, dict):
+        return None, None, message
+    return message.get("id"), message.get("type"), message
+
+
+def decode_frame(frame):
+    """This function decodes a routed frame (once: decoded frames pass).
+
+    Args:
+        frame (string, bytes, dict): Raw or already decoded frame.
+
+    Raises:
+        orjson.JSONDecodeError: The frame is not valid JSON.
+
+    Returns:
+        (dict): The decoded frame.
+    """
+    return frame if isinstance(frame, dict) else orjson.loads(frame)
+
+
+def connection_init_frame(headers):
+    """graphql-transport-ws `connection_init` frame carrying the env headers."""
+    return orjson.dumps({"type": "connection_init", "payload": headers}).decode("utf-8")
+
+
+def subscribe_frame(_id, payload):
+    """graphql-transport-ws `subscribe` frame for subscription `_id`."""
+    return encode_json({"id": _id, "type": "subscribe", "payload": payload}).decode(
+        "utf-8"
+    )
+
+
+def complete_frame(_id):
+    """graphql-transport-ws `complete` frame that stops subscription `_id`."""
+    return orjson.dumps({"id": _id, "type": COMPLETE_TYPE}).decode("utf-8")
+
+
+# Pushed into a subscription queue to wake its (blocked) dispatch thread so it
+# re-checks its kill flag; never delivered to callbacks.
+_WAKEUP = object()
+
+
 class GraphQLClient(metaclass=Singleton):
     """The GraphQLClient class follows the singleton design pattern. It can
     make a query, mutation or subscription from an api.
@@ -285,18 +559,49 @@ class GraphQLClient(metaclass=Singleton):
         self.websocket_timeout = 60
         self.pingIntervalTime = 15
         self.pingTimer = time.time()
-
-        # Setup common client parameters
-        self.client_params = {"http2": True}
-        self.async_client_params = {"http2": True}
-
-        # Reuse HTTP client for better performance
-        self._http_client = None
-        self._thread_local = threading.local()
-        self._async_client = None
-
-        # Configure sleep time for polling loops
-        self.poll_interval = 0.005  # reduced from 0.01 for faster response
+        # Callbacks run on one thread per subscription unless set (see
+        # setSubscriptionWorkers); the pool is created on first use
+        self.subscription_workers = None
+        self._sub_worker_pool = None
+        self._retired_sub_worker_pools = []
+        # ...or on worker processes (see setSubscriptionProcesses)
+        self.subscription_processes = None
+        self.subscription_start_method = DEFAULT_START_METHOD
+        self._sub_process_pool = None
+        self._retired_sub_process_pools = []
+
+        # Extra httpx client arguments for every environment (e.g. a custom
+        # transport); they override the environment's PoolConfig settings
+        self.client_params = {}
+        self.async_client_params = {}
+
+        # Compiled request template per environment (see compile_environment)
+        self._templates = {}
+
+        # HTTP clients per environment (see EnvironmentPool), created on first
+        # use; pools idle for `pool_idle_timeout` seconds are closed
+        self._pools = {}
+        self._pools_lock = threading.Lock()
+        self._retired_async_clients = []  # of retired pools, to aclose()
+        self.pool_idle_timeout = 300
+        self._next_reap = time.monotonic()
+        # Worker threads for query_many/mutate_many (created on first use);
+        # each keeps its own thread-local HTTP/2 client across batches
+        self.max_workers = 8
+        self._executor = None
+        self._executor_lock = threading.Lock()
+        # Responses of queries run with a TTL (see addEnvironment cache_ttl)
+        self.response_cache = ResponseCache()
+        # Identical queries in flight at the same time share one request
+        self.single_flight = SingleFlight()
+        # Shared asyncio websocket for async_subscribe (created on first use)
+        self._async_sub_router = None
+
+        # Subscription dispatch is event-driven (blocking queues); this is only
+        # the short back-off used while an unsubscribe is in progress.
+        self.poll_interval = 0.005
+        # Set by close() to wake the router out of its reconnect back-off.
+        self._router_wakeup = threading.Event()
 
     # * with <Object> implementation
     def __enter__(self):
@@ -343,6 +648,7 @@ class GraphQLClient(metaclass=Singleton):
         variables: dict | None = None,
         flatten: bool = True,
         single_child: bool = False,
+        cache_ttl: float | None = None,
     ) -> tuple:
         """This function makes a query transaction to the actual environment.
 
@@ -353,6 +659,9 @@ class GraphQLClient(metaclass=Singleton):
              not. Defaults to True.
             single_child (bool, optional): Check if GraphQLResponse only has one
              element. Defaults to False.
+            cache_ttl (float, optional): Seconds a successful response is
+             served from `response_cache`. Defaults to None (the environment's
+             `cache_ttl`; mutations are never cached).
 
         Returns:
             tuple: Tuple containing (data, errors) from the GraphQL response.
@@ -360,7 +669,11 @@ class GraphQLClient(metaclass=Singleton):
         data = None
         errors = []
         try:
-            response = self.execute(query, variables)
+            ttl = self._cache_ttl(query, cache_ttl)
+            if ttl:
+                response = self._cached_execute(query, variables, ttl)
+            else:
+                response = self.execute(query, variables)
             if flatten:
                 data = response.get("data", None)
             else:
@@ -435,6 +748,179 @@ class GraphQLClient(metaclass=Singleton):
                         errors.extend(data_messages)
         return data, errors
 
+    # * Thread-pool fan-out for sync callers
+    def _get_executor(self):
+        """Return the shared worker pool, creating it on first use."""
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="pygqlc"
+                )
+            return self._executor
+
+    def _shutdown_executor(self):
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+    def setMaxWorkers(self, max_workers):
+        """This function sets the size of the query_many/mutate_many pool.
+
+        Args:
+            max_workers (int): Number of worker threads.
+        """
+        self.max_workers = max_workers
+        self._shutdown_executor()
+
+    def _run_many(self, run, requests, max_concurrency):
+        """Submits `run(document, variables)` for every request to the worker
+        pool, with at most `max_concurrency` of them in flight."""
+        executor = self._get_executor()
+        slots = threading.BoundedSemaphore(max_concurrency or self.max_workers)
+        futures = []
+        for document, variables in requests:
+            slots.acquire()
+            future = executor.submit(run, document, variables)
+            future.add_done_callback(lambda _future: slots.release())
+            futures.append(future)
+        return [future.result() for future in futures]
+
+    def query_many(
+        self,
+        requests,
+        flatten: bool = True,
+        single_child: bool = False,
+        max_concurrency: int | None = None,
+    ) -> list:
+        """Runs many independent queries on the internal worker pool
+        (`max_workers` threads, each reusing its own HTTP/2 client).
+
+        Args:
+            requests (iterable): (query, variables) pairs.
+            flatten (bool, optional): Same as `query`. Defaults to True.
+            single_child (bool, optional): Same as `query`. Defaults to False.
+            max_concurrency (int, optional): Max queries in flight. Defaults to
+             `max_workers`.
+
+        Returns:
+            list: One (data, errors) tuple per request, in request order.
+        """
+        return self._run_many(
+            lambda query, variables: self.query(
+                query, variables, flatten, single_child
+            ),
+            requests,
+            max_concurrency,
+        )
+
+    def mutate_many(
+        self, requests, flatten: bool = True, max_concurrency: int | None = None
+    ) -> list:
+        """Runs many independent mutations on the internal worker pool.
+
+        Args:
+            requests (iterable): (mutation, variables) pairs.
+            flatten (bool, optional): Same as `mutate`. Defaults to True.
+            max_concurrency (int, optional): Max mutations in flight. Defaults
+             to `max_workers`.
+
+        Returns:
+            list: One (data, errors) tuple per request, in request order.
+        """
+        return self._run_many(
+            lambda mutation, variables: self.mutate(mutation, variables, flatten),
+            requests,
+            max_concurrency,
+        )
+
+    # * Pagination high level implementation
+    def _first_page_variables(
+        self, variables, page_size, paginate, limit_var, offset_var, cursor_var
+    ):
+        if paginate not in ("offset", "cursor"):
+            raise ValueError(f"unknown pagination strategy ({paginate})")
+        page_vars = dict(variables or {})
+        if paginate == "offset":
+            page_vars[limit_var or "limit"] = page_size
+            page_vars[offset_var] = page_vars.get(offset_var) or 0
+        else:
+            page_vars[limit_var or "first"] = page_size
+            page_vars.setdefault(cursor_var, None)
+        return page_vars
+
+    def _read_page(
+        self, query, response, page_vars, page_size, paginate, offset_var, cursor_var
+    ):
+        """Returns the rows of a page response and the variables of the next
+        page (None when this was the last one)."""
+        errors = response.get("errors")
+        if errors:
+            raise GQLResponseException(
+                message=f"Page query returned errors: {errors}",
+                status_code=200,
+                query=query,
+                variables=page_vars,
+                response_body=orjson.dumps(response).decode("utf-8"),
+            )
+        page = data_flatten(response.get("data"))
+        if paginate == "offset":
+            rows = page or []
+            if len(rows) < page_size:
+                return rows, None
+            return rows, {**page_vars, offset_var: page_vars[offset_var] + len(rows)}
+        page = page or {}
+        if "nodes" in page:
+            rows = page["nodes"] or []
+        else:
+            rows = [edge["node"] for edge in page.get("edges") or []]
+        page_info = page.get("pageInfo") or {}
+        if not page_info.get("hasNextPage"):
+            return rows, None
+        return rows, {**page_vars, cursor_var: page_info.get("endCursor")}
+
+    def query_pages(
+        self,
+        query: str,
+        variables: dict | None = None,
+        page_size: int = 100,
+        paginate: str = "offset",
+        limit_var: str | None = None,
+        offset_var: str = "offset",
+        cursor_var: str = "after",
+    ):
+        """This function lazily pages through a list query, yielding its rows.
+
+        Args:
+            query (string): GraphQL query instructions, declaring the paging
+             variables.
+            variables (dict, optional): Other query variables. Defaults to None.
+            page_size (int, optional): Rows requested per page. Defaults to 100.
+            paginate (string, optional): "offset" (limit/offset variables, ends
+             on a short page) or "cursor" (Relay connection with
+             `pageInfo{endCursor hasNextPage}` and `edges{node}` or `nodes`).
+             Defaults to "offset".
+            limit_var (string, optional): Page size variable. Defaults to
+             "limit" for offset and "first" for cursor pagination.
+            offset_var (string, optional): Offset variable. Defaults to "offset".
+            cursor_var (string, optional): Cursor variable. Defaults to "after".
+
+        Raises:
+            GQLResponseException: A page returned errors.
+
+        Yields:
+            Each flattened row, one page in memory at a time.
+        """
+        page_vars = self._first_page_variables(
+            variables, page_size, paginate, limit_var, offset_var, cursor_var
+        )
+        while page_vars is not None:
+            response = self.execute(query, page_vars)
+            rows, page_vars = self._read_page(
+                query, response, page_vars, page_size, paginate, offset_var, cursor_var
+            )
+            yield from rows
+
     # * Subscription high level implementation ******************
 
     def subscribe(
@@ -445,6 +931,11 @@ class GraphQLClient(metaclass=Singleton):
         flatten=True,
         _id=None,
         on_error_callback=None,
+        max_queue=None,
+        overflow="block",
+        coalesce_key=None,
+        batch_size=None,
+        batch_window_ms=None,
     ):
         """This functions makes a subscription to the actual environment.
 
@@ -456,31 +947,84 @@ class GraphQLClient(metaclass=Singleton):
             flatten (bool, optional): Check if GraphqlResponse should be flatten or
              not. Defaults to True.
             _id (int, optional): Subscription id. Defaults to None.
+            max_queue (int, optional): Messages waiting for the callback at
+             most. Defaults to None (unbounded).
+            overflow (string, optional): What a full queue does with the next
+             message: 'block' the websocket reader until there is room (every
+             subscription of the socket waits, and pings go unanswered),
+             'drop_oldest', 'drop_newest' or 'coalesce' (replace the queued
+             message with the same `coalesce_key`). Defaults to 'block'.
+            coalesce_key (function, optional): With 'coalesce', returns the key
+             of a decoded (unflattened) `next` frame, e.g.
+             `lambda m: m["payload"]["data"]["measurementCreated"]["sensorId"]`.
+             Defaults to None.
+            batch_size (int, optional): Hand the callback a list of up to
+             `batch_size` messages instead of one message per call. Defaults
+             to None.
+            batch_window_ms (float, optional): Milliseconds a batch waits for
+             more messages after its first one; without it a batch is handed
+             over as soon as no more messages are queued. Error and complete
+             frames always flush the pending batch first. Defaults to None.
+
+        With `setSubscriptionProcesses`, `callback` and `on_error_callback`
+        run on a worker process and must be importable (a module-level
+        function or a "module:function" string); `max_queue`, `overflow`,
+        `coalesce_key` and batching don't apply there.
 
         Returns:
             (GraphqlResponse): Returns the GraphqlResponse of the subscription.
         """
+        if batch_size is not None and batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        remote = None
+        if self.subscription_processes:
+            if batch_size is not None or batch_window_ms is not None:
+                raise ValueError("subscription processes don't batch messages")
+            if callback is None:
+                raise ValueError("subscription processes need a callback")
+            # fail here, not on the worker, when a callback can't be imported
+            remote = (
+                callable_reference(callback),
+                callable_reference(on_error_callback) if on_error_callback else None,
+            )
         # ! initialize websocket only once
         if not self._conn:
             if not self._new_conn():
                 log(LogLevel.ERROR, "Error creating WSS connection for subscription")
                 return None
 
+        messages = SubscriptionQueue(max_queue, overflow, coalesce_key)
+        batch = None
+        if batch_size is not None or batch_window_ms is not None:
+            window = batch_window_ms / 1000 if batch_window_ms is not None else None
+            batch = MessageBatch(batch_size, window)
         _cb = callback if callback is not None else self._on_message
         _ecb = on_error_callback
         _id = self._registerSub(_id)
+        if remote is not None:
+            dispatcher = messages = self._process_subscription(_id, *remote, flatten)
+        elif self.subscription_workers:
+            dispatcher = self._pooled_subscription(_cb, _id, _ecb, messages)
+        else:
+            dispatcher = threading.Thread(
+                target=self._subscription_loop, args=(_cb, _id, _ecb)
+            )
         self.subs[_id].update(
             {
-                "thread": threading.Thread(
-                    target=self._subscription_loop, args=(_cb, _id, _ecb)
-                ),
+                "thread": dispatcher,
                 "flatten": flatten,
-                "queue": [],
+                "queue": messages,
                 "runs": 0,
                 "query": query,
                 "variables": variables,
                 "callback": callback,
                 "on_error_callback": on_error_callback,
+                "max_queue": max_queue,
+                "overflow": overflow,
+                "coalesce_key": coalesce_key,
+                "batch": batch,
+                "batch_size": batch_size,
+                "batch_window_ms": batch_window_ms,
             }
         )
         self.subs[_id]["thread"].start()
@@ -494,6 +1038,22 @@ class GraphQLClient(metaclass=Singleton):
         self.subs[_id].update({"unsub": unsubscribe})
         return unsubscribe
 
+    def subscription_stats(self):
+        """This function reports the queues of the running subscriptions.
+
+        Returns:
+            (dict): Per subscription id: `runs` (callbacks executed) and its
+              queue's `depth`, `maxsize`, `overflow`, `dropped`, `coalesced`
+              and `high_water`; on worker processes, the frames `forwarded`
+              and the `process` index instead (`runs` is known once it
+              stopped).
+        """
+        return {
+            _id: {"runs": sub.get("runs", 0), **sub["queue"].stats()}
+            for _id, sub in list(self.subs.items())
+            if "queue" in sub
+        }
+
     def _unsubscribe(self, _id):
         sub = self.subs.get(_id)
         if not sub:
@@ -501,6 +1061,7 @@ class GraphQLClient(metaclass=Singleton):
             return
         self.unsubscribing = True
         sub["kill"] = True
+        self._wake_subscription(sub)
         try:
             self._stop(_id)
         except BrokenPipeError as e:
@@ -516,27 +1077,30 @@ class GraphQLClient(metaclass=Singleton):
 
         while not self.closing:
             if self.wss_conn_halted:
-                # Rate limit reconnection attempts
+                # Rate limit reconnection attempts: sleep until the next one is
+                # due instead of spinning (close() sets the wakeup event)
                 current_time = time.time()
-                if current_time - last_reconnect_attempt >= reconnect_delay:
+                wait = last_reconnect_attempt + reconnect_delay - current_time
+                if wait > 0:
+                    self._router_wakeup.wait(wait)
+                    continue
+                log(
+                    LogLevel.WARNING,
+                    "Connection halted, attempting reconnection...",
+                )
+                if self._new_conn():
+                    self.wss_conn_halted = False
                     log(
-                        LogLevel.WARNING,
-                        "Connection halted, attempting reconnection...",
+                        LogLevel.SUCCESS,
+                        "WSS Reconnection succeeded, attempting resubscription to lost subs",
                     )
-                    if self._new_conn():
-                        self.wss_conn_halted = False
-                        log(
-                            LogLevel.SUCCESS,
-                            "WSS Reconnection succeeded, attempting resubscription to lost subs",
-                        )
-                        self._resubscribe_all()
-                        log(LogLevel.INFO, "finished resubscriptions")
-                        reconnect_delay = 1.0  # Reset delay on success
-                    else:
-                        # Use exponential backoff for reconnection attempts (up to 5 seconds)
-                        reconnect_delay = min(reconnect_delay * 1.5, 5.0)
-                    last_reconnect_attempt = current_time
-                time.sleep(self.poll_interval)
+                    self._resubscribe_all()
+                    log(LogLevel.INFO, "finished resubscriptions")
+                    reconnect_delay = 1.0  # Reset delay on success
+                else:
+                    # Use exponential backoff for reconnection attempts (up to 5 seconds)
+                    reconnect_delay = min(reconnect_delay * 1.5, 5.0)
+                last_reconnect_attempt = current_time
                 continue
 
             if self.unsubscribing:
@@ -557,12 +1121,14 @@ class GraphQLClient(metaclass=Singleton):
                 del self.subs[sub_id]
 
             try:
+                # recv blocks (up to 0.5s) for the next frame, so an idle socket
+                # costs a couple of wake-ups per second and no polling sleep
                 self._conn.settimeout(0.5)
                 raw = self._conn.recv()
-                message = orjson.loads(raw)
+                # only the id and type: the payload is decoded by the consumer
+                _id, message_type, message = read_frame_header(raw)
                 self._conn.settimeout(self.websocket_timeout)
             except (TimeoutError, websocket.WebSocketTimeoutException):
-                time.sleep(self.poll_interval)
                 continue
             except Exception as e:
                 if not self.closing:
@@ -573,31 +1139,34 @@ class GraphQLClient(metaclass=Singleton):
                     self.wss_conn_halted = True
                 continue
 
-            if not isinstance(message, dict):
+            if _id is None and message_type is None and not isinstance(message, dict):
                 if not self.closing:
                     log(LogLevel.WARNING, "invalid WSS message, reconnecting")
                     self.wss_conn_halted = True
                 continue
 
-            message_type = message.get("type")
-            if "id" in message:
+            if _id is not None:
                 # if the message has an ID request, it will be handled by the _subscription_loop
-                _id = message["id"]
                 active_sub = self.subs.get(_id)
                 # the connection may not be active due to:
                 # 1. server error (incorrect ID sent)
                 # 2. race condition (we closed connection, but a message was already on its way)
-                if active_sub:
-                    active_sub["queue"].append(message)
+                # its frames are dropped without decoding them
+                if active_sub and not active_sub["kill"]:
+                    if message is None and active_sub.get("overflow") == "coalesce":
+                        message = orjson.loads(raw)  # coalesce_key reads the payload
+                    # blocks while a full queue has the 'block' policy;
+                    # error/complete frames always get through
+                    active_sub["queue"].put(
+                        raw if message is None else message,
+                        control=message_type != NEXT_TYPE,
+                    )
             elif message_type == CONNECTION_ACK_TYPE:
                 pass  # Connection Ack with the server
             elif message_type == PONG_TYPE:
                 pass
             else:
-                log(LogLevel.WARNING, f"unknown msg type: {message}")
-
-            # Use non-blocking sleep
-            time.sleep(self.poll_interval)
+                log(LogLevel.WARNING, f"unknown msg type: {message or raw}")
 
     def _resubscribe_all(self):
         # Copy subscription info before killing threads
@@ -608,6 +1177,11 @@ class GraphQLClient(metaclass=Singleton):
                 "callback": sub.get("callback"),
                 "on_error_callback": sub.get("on_error_callback"),
                 "flatten": sub.get("flatten"),
+                "max_queue": sub.get("max_queue"),
+                "overflow": sub.get("overflow", "block"),
+                "coalesce_key": sub.get("coalesce_key"),
+                "batch_size": sub.get("batch_size"),
+                "batch_window_ms": sub.get("batch_window_ms"),
             }
             for sub_id, sub in self.subs.items()
         }
@@ -615,6 +1189,7 @@ class GraphQLClient(metaclass=Singleton):
         # First, signal all threads to stop
         for sub in self.subs.values():
             sub["kill"] = True
+            self._wake_subscription(sub)
 
         # Then join all threads with timeout to avoid blocking indefinitely
         for sub_id, sub in self.subs.items():
@@ -633,77 +1208,196 @@ class GraphQLClient(metaclass=Singleton):
                 on_error_callback=sub_info["on_error_callback"],
                 flatten=sub_info["flatten"],
                 _id=sub_id,
+                max_queue=sub_info["max_queue"],
+                overflow=sub_info["overflow"],
+                coalesce_key=sub_info["coalesce_key"],
+                batch_size=sub_info["batch_size"],
+                batch_window_ms=sub_info["batch_window_ms"],
             )
 
+    def _wake_subscription(self, sub):
+        """Unblock a subscription's dispatch thread so it notices its kill flag."""
+        messages = sub.get("queue")
+        if messages is None:
+            return
+        if sub.get("remote"):
+            messages.stop()  # the worker process stops it after its frames
+        else:
+            messages.put(_WAKEUP, control=True)
+
     def _subscription_loop(self, _cb, _id, _ecb):
-        self.subs[_id].update({"running": True, "starting": False})
-        while self.subs[_id]["running"]:
-            if self.subs[_id]["kill"]:
+        # Keep a local reference: _resubscribe_all may register a new
+        # subscription under the same id while this thread winds down.
+        sub = self.subs[_id]
+        sub.update({"running": True, "starting": False})
+        messages = sub["queue"]
+        batch = sub.get("batch")
+        while sub["running"]:
+            if sub["kill"]:
                 log(LogLevel.INFO, f"stopping subscription id={_id} on Unsubscribe")
                 break
 
-            # Get message without copying the queue
-            message = safe_pop(self.subs[_id]["queue"])
-            if not message:
-                time.sleep(self.poll_interval)
+            # Block until the router hands over a frame (or a kill wake-up);
+            # a pending batch only waits until its window ends
+            try:
+                message = messages.get(timeout=batch.remaining() if batch else None)
+            except queue.Empty:
+                self._flush_batch(sub, _cb)
                 continue
+            if not self._dispatch_frame(sub, _cb, _id, _ecb, message):
+                break
+        self._subscription_stopped(sub, _cb, _id)
+
+    def _pooled_subscription(self, _cb, _id, _ecb, messages):
+        """Dispatch handle of a subscription run by the shared worker pool."""
+        if self._sub_worker_pool is None:
+            self._sub_worker_pool = SubscriptionWorkerPool(self.subscription_workers)
+        sub = self.subs[_id]
+
+        def step(message):
+            if sub["kill"]:
+                log(LogLevel.INFO, f"stopping subscription id={_id} on Unsubscribe")
+                return False
+            return self._dispatch_frame(sub, _cb, _id, _ecb, message)
+
+        def idle():
+            # flushes a due batch, or asks for a wake-up when its window ends
+            batch = sub.get("batch")
+            wait = batch.remaining() if batch is not None else None
+            if wait is None:
+                return None
+            if wait > 0:
+                return batch.deadline
+            self._flush_batch(sub, _cb)
+            return None
+
+        handle = PooledSubscription(
+            self._sub_worker_pool,
+            messages,
+            step,
+            lambda: self._subscription_stopped(sub, _cb, _id),
+            idle,
+        )
+        messages.on_put = handle.schedule
+        sub.update({"running": True, "starting": False})
+        return handle
+
+    def _process_subscription(self, _id, callback, on_error, flatten):
+        """Handle of a subscription run by the worker process pool."""
+        if self._sub_process_pool is None:
+            self._sub_process_pool = SubscriptionProcessPool(
+                self.subscription_processes, self.subscription_start_method
+            )
+        sub = self.subs[_id]
+
+        def stopped(runs):
+            sub.update({"runs": runs, "running": False, "kill": True})
+            log(LogLevel.INFO, f"Subscription id={_id} stopped")
+
+        handle = self._sub_process_pool.register(
+            _id, callback, on_error, flatten, stopped
+        )
+        sub.update({"running": True, "starting": False, "remote": True})
+        return handle
+
+    def _dispatch_frame(self, sub, _cb, _id, _ecb, message):
+        """Handles one routed frame; returns False when the subscription ends."""
+        if message is _WAKEUP or sub["kill"]:
+            return not sub["kill"]  # late frames of a killed sub aren't decoded
+
+        try:
+            message = decode_frame(message)
+        except orjson.JSONDecodeError:
+            log(LogLevel.WARNING, f"invalid WSS message for subscription id={_id}")
+            return True
+
+        # Message type handling
+        message_type = message.get("type")
+        if message_type == NEXT_TYPE:
+            pass  # continue with payload handling
+        elif message_type == ERROR_TYPE:
+            self._flush_batch(sub, _cb)
+            if _ecb:
+                self._run_error_callback(_ecb, message)
+            log(
+                LogLevel.WARNING,
+                f"stopping subscription id={_id} on {message_type}",
+            )
+            return False
+        elif message_type == COMPLETE_TYPE:
+            self._flush_batch(sub, _cb)
+            log(LogLevel.INFO, f"stopping subscription id={_id} on {message_type}")
+            return False
+        else:
+            log(LogLevel.WARNING, f"unknown msg type: {message}")
+            return True
+
+        # Payload handling
+        if is_ws_payloadErrors_msg(message):
+            self._flush_batch(sub, _cb)
+            if _ecb:
+                self._run_error_callback(_ecb, message)
+                return True
+            log(LogLevel.ERROR, "Subscription message has payload Errors")
+            log(LogLevel.ERROR, f"{message}")
+        elif is_ws_connection_init_msg(message):
+            # Subscription successfully initialized
+            pass
+        else:
+            # Process message more efficiently
+            gql_msg = self._clean_sub_message(sub, message)
+            batch = sub.get("batch")
+            if batch is None:
+                self._run_callback(sub, _cb, gql_msg)
+            elif batch.add(gql_msg):
+                self._flush_batch(sub, _cb)
+        return True
 
-            # Message type handling
-            message_type = message.get("type")
-            if message_type == NEXT_TYPE:
-                pass  # continue with payload handling
-            elif message_type == ERROR_TYPE:
-                if _ecb:
-                    _ecb(message)
+    def _run_callback(self, sub, _cb, gql_msg):
+        try:
+            _cb(gql_msg)  # execute callback function
+            # Increment counter without locking
+            sub["runs"] += 1
+        except Exception as _e:
+            log(LogLevel.ERROR, f"Error on subscription callback")
+            sub_query = sub.get("query")
+            sub_variables = sub.get("variables")
+            if sub_query:
+                log(LogLevel.ERROR, f"subscription document: \n\t{sub_query}")
+            if sub_variables:
                 log(
-                    LogLevel.WARNING,
-                    f"stopping subscription id={_id} on {message_type}",
+                    LogLevel.ERROR,
+                    f"subscription variables: \n\t{sub_variables}",
                 )
-                break
-            elif message_type == COMPLETE_TYPE:
-                log(LogLevel.INFO, f"stopping subscription id={_id} on {message_type}")
-                break
-            else:
-                log(LogLevel.WARNING, f"unknown msg type: {message}")
-                continue
+            log(LogLevel.ERROR, traceback.format_exc())
 
-            # Payload handling
-            if is_ws_payloadErrors_msg(message):
-                if _ecb:
-                    _ecb(message)
-                    continue
-                log(LogLevel.ERROR, "Subscription message has payload Errors")
-                log(LogLevel.ERROR, f"{message}")
-            elif is_ws_connection_init_msg(message):
-                # Subscription successfully initialized
-                pass
-            else:
-                # Process message more efficiently
-                gql_msg = self._clean_sub_message(_id, message)
-                try:
-                    _cb(gql_msg)  # execute callback function
-                    # Increment counter without locking
-                    self.subs[_id]["runs"] += 1
-                except Exception as _e:
-                    log(LogLevel.ERROR, f"Error on subscription callback")
-                    sub_query = self.subs[_id].get("query")
-                    sub_variables = self.subs[_id].get("variables")
-                    if sub_query:
-                        log(LogLevel.ERROR, f"subscription document: \n\t{sub_query}")
-                    if sub_variables:
-                        log(
-                            LogLevel.ERROR,
-                            f"subscription variables: \n\t{sub_variables}",
-                        )
-                    log(LogLevel.ERROR, traceback.format_exc())
-
-        # Subscription stopped, update state atomically
-        self.subs[_id].update({"running": False, "kill": True})
+    def _run_error_callback(self, _ecb, message):
+        # a raising error callback must not end the dispatch thread (or a
+        # shared worker's other subscriptions)
+        try:
+            _ecb(message)
+        except Exception as _e:
+            log(LogLevel.ERROR, f"Error on subscription error callback")
+            log(LogLevel.ERROR, traceback.format_exc())
+
+    def _flush_batch(self, sub, _cb):
+        """Hands the pending batch (if any) to the callback."""
+        batch = sub.get("batch")
+        if batch:
+            self._run_callback(sub, _cb, batch.take())
+
+    def _subscription_stopped(self, sub, _cb, _id):
+        # Subscription stopped: deliver what is still batched, update state
+        # atomically and release the router if it waits for room in the queue
+        self._flush_batch(sub, _cb)
+        sub.update({"running": False, "kill": True})
+        sub["queue"].close()
         log(LogLevel.INFO, f"Subscription id={_id} stopped")
 
-    def _clean_sub_message(self, _id, message):
-        data = py_.get(message, "payload", {})
-        return data_flatten(data) if self.subs[_id]["flatten"] else data
+    def _clean_sub_message(self, sub, message):
+        # flattened in place: the decoded payload is never re-encoded
+        data = message.get("payload", {})
+        return data_flatten(data) if sub["flatten"] else data
 
     def _close_conn(self):
         """Best-effort close of the current WSS connection and clear the handle.
@@ -764,9 +1458,11 @@ class GraphQLClient(metaclass=Singleton):
             self.closing = False
             self._close()
             return
+        self._router_wakeup.set()
         for sub in self.subs.values():
             sub["unsub"]()
         self._close_conn()
+        self._close_sub_worker_pools()
         self.sub_router_thread.join()
         self.sub_pingpong_thread.join()
         self.sub_router_thread = None
@@ -774,8 +1470,23 @@ class GraphQLClient(metaclass=Singleton):
         self.sub_counter = 0
         self.subs = {}
         self.closing = False
+        self._router_wakeup.clear()
         self._close()
 
+    def _close_sub_worker_pools(self):
+        pools = self._retired_sub_worker_pools
+        if self._sub_worker_pool is not None:
+            pools.append(self._sub_worker_pool)
+        self._sub_worker_pool, self._retired_sub_worker_pools = None, []
+        for pool in pools:
+            pool.close(timeout=1)
+        pools = self._retired_sub_process_pools
+        if self._sub_process_pool is not None:
+            pools.append(self._sub_process_pool)
+        self._sub_process_pool, self._retired_sub_process_pools = None, []
+        for pool in pools:
+            pool.close(timeout=1)
+
     def _on_message(self, message):
         """Dummy callback for subscription"""
         # Message handling happens elsewhere - no need to print here
@@ -783,9 +1494,7 @@ class GraphQLClient(metaclass=Singleton):
 
     def _conn_init(self):
         env = self.environments.get(self.environment, None)
-        headers = env.get("headers", {})
-        payload = {"type": "connection_init", "payload": headers}
-        self._conn.send(orjson.dumps(payload).decode("utf-8"))
+        self._conn.send(connection_init_frame(env.get("headers", {})))
         self._waiting_connection_ack()
         self._conn.settimeout(self.websocket_timeout)
 
@@ -837,12 +1546,10 @@ class GraphQLClient(metaclass=Singleton):
         return _id
 
     def _start(self, payload, _id):
-        frame = {"id": _id, "type": "subscribe", "payload": payload}
-        self._conn.send(orjson.dumps(frame).decode("utf-8"))
+        self._conn.send(subscribe_frame(_id, payload))
 
     def _stop(self, _id):
-        payload = {"id": _id, "type": "complete"}
-        self._conn.send(orjson.dumps(payload).decode("utf-8"))
+        self._conn.send(complete_frame(_id))
 
     def resetSubsConnection(self):
         """This function resets all subscriptions connections.
@@ -874,27 +1581,48 @@ class GraphQLClient(metaclass=Singleton):
     # * END SUBSCRIPTION functions ******************************
 
     # * BATCH functions *****************************************
-    def batchMutate(self, label="mutation"):
+    def batchMutate(
+        self, label="mutation", max_ops_per_request=None, max_concurrency=1
+    ):
         """This fuction makes a batchs of mutation transactions.
 
         Args:
             label (str, optional): Name of the mutation batch. Defaults to 'mutation'.
+            max_ops_per_request (int, optional): Split the batch into requests of
+             at most this many mutations. Defaults to None (one request).
+            max_concurrency (int, optional): Chunks sent at the same time.
+             Defaults to 1.
 
         Returns:
             (MutationBatch): Returns a MutationBatch Object.
         """
-        return MutationBatch(client=self, label=label)
+        return MutationBatch(
+            client=self,
+            label=label,
+            max_ops_per_request=max_ops_per_request,
+            max_concurrency=max_concurrency,
+        )
 
-    def batchQuery(self, label="query"):
+    def batchQuery(self, label="query", max_ops_per_request=None, max_concurrency=1):
         """This fuction makes a batchs of query transactions.
 
         Args:
             label (str, optional): Name of the query batch. Defaults to 'query'.
+            max_ops_per_request (int, optional): Split the batch into requests of
+             at most this many queries. Defaults to None (one request).
+            max_concurrency (int, optional): Chunks sent at the same time.
+             Defaults to 1.
 
         Returns:
             (MutationBatch): Returns a MutationBatch Object.
         """
-        return MutationBatch(client=self, label=label)
+        return MutationBatch(
+            client=self,
+            label=label,
+            max_ops_per_request=max_ops_per_request,
+            max_concurrency=max_concurrency,
+            operation="query",
+        )
 
     # * END BATCH function **************************************
     # * helper methods
@@ -908,6 +1636,13 @@ class GraphQLClient(metaclass=Singleton):
         timeoutWebsocket=_KEEP,
         post_timeout=_KEEP,
         ipv4_only=_KEEP,
+        persisted_queries=_KEEP,
+        persisted_queries_get=_KEEP,
+        cache_ttl=_KEEP,
+        single_flight=_KEEP,
+        compression=_KEEP,
+        compression_threshold=_KEEP,
+        pool=_KEEP,
     ):
         """This fuction adds (or re-registers) an environment on the instance.
 
@@ -933,7 +1668,36 @@ class GraphQLClient(metaclass=Singleton):
             ipv4_only (bool, optional): Forces connections to use IPv4 only.
              Helps with slow connections on networks with problematic IPv6.
              Kept unchanged if omitted (defaults to False on first registration).
+            persisted_queries (bool, optional): Sends Automatic Persisted
+             Queries: only the document's sha256 hash, registering the full
+             document when the server answers `PersistedQueryNotFound`.
+             Kept unchanged if omitted (defaults to False on first registration).
+            persisted_queries_get (bool, optional): With `persisted_queries`,
+             sends query (not mutation) documents as GET requests so they can
+             be cached by HTTP proxies/CDNs. Kept unchanged if omitted
+             (defaults to False on first registration).
+            cache_ttl (float, optional): Seconds successful query responses are
+             served from `response_cache` (mutations are never cached). Kept
+             unchanged if omitted (defaults to None, no caching, on first
+             registration).
+            single_flight (bool, optional): Identical queries in flight at the
+             same time share one request (mutations never do). Kept unchanged
+             if omitted (defaults to True on first registration).
+            compression (string, optional): Compresses request bodies ('gzip',
+             or 'zstd' with `pip install pygqlc[zstd]`) and sets their
+             `Content-Encoding`; the server must accept it. Kept unchanged if
+             omitted (defaults to None, no compression, on first registration).
+            compression_threshold (int, optional): Bodies smaller than this
+             many bytes are sent uncompressed. Kept unchanged if omitted
+             (defaults to COMPRESSION_THRESHOLD on first registration).
+            pool (PoolConfig, optional): HTTP connection pool of the
+             environment: connection and keep-alive limits, HTTP/2, streams in
+             flight, per-phase timeouts and a shared sync client. Kept
+             unchanged if omitted (defaults to PoolConfig() on first
+             registration).
         """
+        if compression is not _KEEP:
+            check_compression(compression)
         existing = self.environments.get(name, {})
         self.environments[name] = {
             "url": existing.get("url") if url is _KEEP else url,
@@ -947,32 +1711,123 @@ class GraphQLClient(metaclass=Singleton):
             "ipv4_only": existing.get("ipv4_only", False)
             if ipv4_only is _KEEP
             else ipv4_only,
+            "persisted_queries": existing.get("persisted_queries", False)
+            if persisted_queries is _KEEP
+            else persisted_queries,
+            "persisted_queries_get": existing.get("persisted_queries_get", False)
+            if persisted_queries_get is _KEEP
+            else persisted_queries_get,
+            "cache_ttl": existing.get("cache_ttl") if cache_ttl is _KEEP else cache_ttl,
+            "single_flight": existing.get("single_flight", True)
+            if single_flight is _KEEP
+            else single_flight,
+            "compression": existing.get("compression")
+            if compression is _KEEP
+            else compression,
+            "compression_threshold": existing.get(
+                "compression_threshold", COMPRESSION_THRESHOLD
+            )
+            if compression_threshold is _KEEP
+            else compression_threshold,
+            "pool": existing.get("pool", DEFAULT_POOL) if pool is _KEEP else pool,
         }
 
-        if self.environments[name]["ipv4_only"]:
-            self._update_client_params(self.environments[name]["ipv4_only"])
+        self._compile_environment(name)
+
+        env = self.environments[name]
+        if (existing.get("ipv4_only"), existing.get("pool")) != (
+            env["ipv4_only"],
+            env["pool"],
+        ):
+            self._retire_pool(name)
 
         if default:
             self.setEnvironment(name)
         if timeoutWebsocket is not _KEEP:
             self.setTimeoutWebsocket(timeoutWebsocket)
 
-    def _update_client_params(self, ipv4_only):
-        """Update HTTP client parameters based on IPv4 setting"""
-        if ipv4_only:
+    def _environment_params(self, name):
+        """httpx client arguments (sync, async) of an environment's clients."""
+        env = self.environments[name]
+        pool = env.get("pool") or DEFAULT_POOL
+        params = {"http2": pool.http2, "limits": pool.limits()}
+        client_params, async_client_params = dict(params), dict(params)
+        if env.get("ipv4_only"):
             # Binding the local egress address to 0.0.0.0 forces httpx to use an
             # IPv4 source socket (the standard idiom for IPv4-only egress). This is
             # not a listening socket, so the bind-all-interfaces concern does not apply.
-            self.client_params["transport"] = httpx.HTTPTransport(
-                local_address="0.0.0.0"  # nosec B104
+            # A custom transport ignores the client's http2/limits: pass them on.
+            client_params["transport"] = httpx.HTTPTransport(
+                local_address="0.0.0.0",  # nosec B104
+                **params,
             )
-            self.async_client_params["transport"] = httpx.AsyncHTTPTransport(
-                local_address="0.0.0.0"  # nosec B104
+            async_client_params["transport"] = httpx.AsyncHTTPTransport(
+                local_address="0.0.0.0",  # nosec B104
+                **params,
             )
-        else:
-            # Remove transport if it exists
-            self.client_params.pop("transport", None)
-            self.async_client_params.pop("transport", None)
+        client_params.update(self.client_params)
+        async_client_params.update(self.async_client_params)
+        return client_params, async_client_params
+
+    def _environment_pool(self, name=None):
+        """HTTP clients of an environment (the current one by default)."""
+        name = name or self.environment
+        self._reap_idle_pools()
+        pool = self._pools.get(name)
+        if pool is None:
+            with self._pools_lock:
+                pool = self._pools.get(name)
+                if pool is None:
+                    if not self.environments.get(name):
+                        raise Exception(
+                            "cannot execute query without setting an environment"
+                        )
+                    pool = EnvironmentPool(
+                        self.environments[name].get("pool") or DEFAULT_POOL,
+                        *self._environment_params(name),
+                        self._retired_async_clients,
+                    )
+                    self._pools[name] = pool
+        return pool
+
+    def _retire_pool(self, name):
+        """Closes an environment's clients (once idle); the next request
+        builds new ones with its current settings."""
+        with self._pools_lock:
+            pool = self._pools.pop(name, None)
+        if pool is not None:
+            pool.retire()
+
+    def _reap_idle_pools(self):
+        # Checked at most every pool_idle_timeout / 4 seconds, from the request path
+        now = time.monotonic()
+        if not self.pool_idle_timeout or now < self._next_reap:
+            return
+        self._next_reap = now + self.pool_idle_timeout / 4
+        self.close_idle_pools(self.pool_idle_timeout)
+
+    def close_idle_pools(self, idle_for=0):
+        """This function closes the HTTP clients of environments without
+        requests for `idle_for` seconds; they are recreated when used again.
+
+        Args:
+            idle_for (float, optional): Seconds since the last request.
+             Defaults to 0 (every environment without requests in flight).
+
+        Returns:
+            (list): Names of the environments whose clients were closed.
+        """
+        now = time.monotonic()
+        with self._pools_lock:
+            idle = [
+                name
+                for name, pool in self._pools.items()
+                if not pool.in_flight and now - pool.last_used >= idle_for
+            ]
+            pools = [self._pools.pop(name) for name in idle]
+        for pool in pools:
+            pool.retire()
+        return idle
 
     def setUrl(self, environment=None, url=None):
         """This function sets a new url to an existing environment.
@@ -985,6 +1840,7 @@ class GraphQLClient(metaclass=Singleton):
         if not environment:
             environment = self.environment
         self.environments[environment]["url"] = url
+        self._compile_environment(environment)
 
     def setWss(self, environment=None, url=None):
         """This function sets a new WSS to an existing environment.
@@ -1009,6 +1865,7 @@ class GraphQLClient(metaclass=Singleton):
         if not environment:
             environment = self.environment
         self.environments[environment]["headers"].update(header)
+        self._compile_environment(environment)
 
     def setEnvironment(self, name):
         """This functions sets the actual environment of the instance.
@@ -1024,10 +1881,6 @@ class GraphQLClient(metaclass=Singleton):
             raise Exception(f"selected environment not set ({name})")
         self.environment = name
 
-        # Update client parameters based on environment settings
-        ipv4_only = env.get("ipv4_only", False)
-        self._update_client_params(ipv4_only)
-
     def setPostTimeout(self, environment=None, post_timeout=60):
         """This function sets the post's timeout.
 
@@ -1038,6 +1891,134 @@ class GraphQLClient(metaclass=Singleton):
         if not environment:
             environment = self.environment
         self.environments[environment]["post_timeout"] = post_timeout
+        self._compile_environment(environment)
+
+    def setPool(self, environment=None, pool=None):
+        """This function sets the HTTP connection pool of an environment.
+
+        Args:
+            environment (string, optional): Name of the environment. Defaults to None.
+            pool (PoolConfig, optional): Pool settings. Defaults to None
+             (PoolConfig()).
+        """
+        # if environment is not selected, use current environment
+        if not environment:
+            environment = self.environment
+        self.environments[environment]["pool"] = pool or DEFAULT_POOL
+        self._compile_environment(environment)
+        self._retire_pool(environment)
+
+    def setPersistedQueries(self, environment=None, enabled=True, use_get=False):
+        """This function toggles Automatic Persisted Queries on an environment.
+
+        Args:
+            environment (string, optional): Name of the environment. Defaults to None.
+            enabled (bool, optional): Send document hashes. Defaults to True.
+            use_get (bool, optional): Send queries as GET requests. Defaults to False.
+        """
+        # if environment is not selected, use current environment
+        if not environment:
+            environment = self.environment
+        self.environments[environment]["persisted_queries"] = enabled
+        self.environments[environment]["persisted_queries_get"] = use_get
+        self._compile_environment(environment)
+
+    def setCompression(
+        self, environment=None, compression="gzip", threshold=COMPRESSION_THRESHOLD
+    ):
+        """This function sets the request body compression of an environment.
+
+        Args:
+            environment (string, optional): Name of the environment. Defaults to None.
+            compression (string, optional): 'gzip', 'zstd' or None to disable
+             it. Defaults to 'gzip'.
+            threshold (int, optional): Smaller bodies are sent uncompressed.
+             Defaults to COMPRESSION_THRESHOLD.
+        """
+        check_compression(compression)
+        # if environment is not selected, use current environment
+        if not environment:
+            environment = self.environment
+        self.environments[environment]["compression"] = compression
+        self.environments[environment]["compression_threshold"] = threshold
+        self._compile_environment(environment)
+
+    def setCacheTtl(self, environment=None, cache_ttl=None):
+        """This function sets how long query responses are cached.
+
+        Args:
+            environment (string, optional): Name of the environment. Defaults to None.
+            cache_ttl (float, optional): Seconds, or None to stop caching.
+             Defaults to None.
+        """
+        # if environment is not selected, use current environment
+        if not environment:
+            environment = self.environment
+        self.environments[environment]["cache_ttl"] = cache_ttl
+
+    def invalidateCache(self, query=None, variables=None, environment=None):
+        """This function drops cached query responses.
+
+        Args:
+            query (string, optional): Only responses of this document. Defaults
+             to None (every document).
+            variables (dict, optional): Only the response for these variables.
+             Defaults to None (any variables).
+            environment (string, optional): Name of the environment. Defaults to
+             None (the current one).
+
+        Returns:
+            (int): Number of dropped responses.
+        """
+        if not environment:
+            environment = self.environment
+        return self.response_cache.invalidate(environment, query, variables)
+
+    def setSubscriptionWorkers(self, workers=None):
+        """This function runs the callbacks of new subscriptions on a shared
+        pool of threads instead of one thread per subscription. Messages of a
+        subscription are still handled one at a time and in order.
+
+        Args:
+            workers (int, optional): Size of the pool, or None for one thread
+             per subscription. Defaults to None.
+        """
+        if workers is not None and workers < 1:
+            raise ValueError("subscription workers must be at least 1")
+        if workers != self.subscription_workers and self._sub_worker_pool:
+            # its running subscriptions keep it until close()
+            self._retired_sub_worker_pools.append(self._sub_worker_pool)
+            self._sub_worker_pool = None
+        self.subscription_workers = workers
+
+    def setSubscriptionProcesses(self, processes=None, start_method=None):
+        """This function runs the callbacks of new subscriptions on a pool of
+        worker processes, for CPU-bound callbacks. The websocket router stays
+        in this process and forwards each raw frame to the worker of its
+        subscription, always the same one per subscription id, so messages
+        of a subscription are still handled one at a time and in order.
+        Takes precedence over setSubscriptionWorkers.
+
+        Args:
+            processes (int, optional): Size of the pool, or None to run
+             callbacks in this process. Defaults to None.
+            start_method (string, optional): `multiprocessing` start method of
+             the workers. Defaults to None (keep the current one, 'spawn'
+             unless changed).
+        """
+        if processes is not None and processes < 1:
+            raise ValueError("subscription processes must be at least 1")
+        start_method = start_method or self.subscription_start_method
+        changed = (processes, start_method) != (
+            self.subscription_processes,
+            self.subscription_start_method,
+        )
+        if changed and self._sub_process_pool:
+            # its running subscriptions keep it until close()
+            self._retired_sub_process_pools.append(self._sub_process_pool)
+            self._sub_process_pool = None
+        self.subscription_processes = processes
+        self.subscription_start_method = start_method
 
     def setTimeoutWebsocket(self, seconds):
         """This function sets the webscoket's timeout.
@@ -1051,12 +2032,162 @@ class GraphQLClient(metaclass=Singleton):
 
     # * LOW LEVEL METHODS ----------------------------------
     def _get_http_client(self):
-        """Get a thread-local HTTP client to improve performance with connection pooling"""
-        client = getattr(self._thread_local, "client", None)
-        if client is None or client.is_closed:
-            client = httpx.Client(**self.client_params)
-            self._thread_local.client = client
-        return client
+        """Get the current environment's HTTP client for this thread (thread-local
+        for better connection pooling, unless its pool shares one client)"""
+        return self._environment_pool().client()
+
+    @property
+    def _async_client(self):
+        """The current environment's shared async client."""
+        pool = self._pools.get(self.environment)
+        return pool.async_client if pool is not None else None
+
+    @_async_client.setter
+    def _async_client(self, client):
+        if client is not None or self.environment in self._pools:
+            self._environment_pool().async_client = client
+
+    def pool_stats(self):
+        """This function reports how the HTTP connection pools are used.
+
+        Returns:
+            (dict): Per environment with clients: `sync` (summed over the
+              live sync clients, `clients` of them) and `async` connections
+              (`connections`, `active`, `idle`, `max_connections`; best-effort,
+              read from httpcore), plus its requests `in_flight` and, of
+              those, `pending` a slot of `http2_max_streams`.
+        """
+        return {name: pool.stats() for name, pool in list(self._pools.items())}
+
+    def _compile_environment(self, name):
+        self._templates[name] = compile_environment(
+            name, self.environments[name], self.DEFAULT_HEADERS
+        )
+
+    def _request_environment(self):
+        """Request template of the current environment, recompiled when the
+        environment dict was changed directly (not through a setter)."""
+        env = self.environments.get(self.environment)
+        if not env:
+            raise Exception(f"cannot execute query without setting an environment")
+        template = self._templates.get(self.environment)
+        if template is None or template.source != environment_source(
+            env, self.DEFAULT_HEADERS
+        ):
+            self._compile_environment(self.environment)
+            template = self._templates[self.environment]
+        return template
+
+    def _build_request(
+        self, template, query, variables, persisted=False, register=False
+    ):
+        """This function prepares the HTTP request of a query or mutation.
+
+        Args:
+            template (RequestTemplate): Environment the request is sent to.
+            query (string): GraphQL instructions.
+            variables (dict): Variables of the transaction.
+            persisted (bool, optional): Send an APQ request (document hash).
+              Defaults to False.
+            register (bool, optional): With `persisted`, send the full document
+              too so the server stores it under its hash. Defaults to False.
+
+        Returns:
+            (tuple): HTTP method ('post' or 'get') and the request kwargs.
+        """
+        request = {"headers": template.headers, "timeout": template.timeout}
+        if not persisted:
+            self._set_body(template, request, {"query": query, "variables": variables})
+            return "post", request
+        extensions = {
+            "persistedQuery": {"version": 1, "sha256Hash": persisted_query_hash(query)}
+        }
+        if register:
+            payload = {"query": query, "variables": variables, "extensions": extensions}
+        elif template.persisted_queries_get and is_query_document(query):
+            params = {"extensions": orjson.dumps(extensions).decode("utf-8")}
+            if variables is not None:
+                params["variables"] = encode_json(variables).decode("utf-8")
+            request["params"] = params
+            return "get", request
+        else:
+            payload = {"variables": variables, "extensions": extensions}
+        self._set_body(template, request, payload)
+        return "post", request
+
+    @staticmethod
+    def _set_body(template, request, payload):
+        """Sets the POST body, encoded once with orjson (`encode_json`) and
+        compressed when the environment opted in and it is big enough."""
+        body = encode_json(payload)
+        if template.compression and len(body) >= template.compression_threshold:
+            body = compress_body(body, template.compression)
+            request["headers"] = template.compressed_headers
+        request["content"] = body
+
+    @staticmethod
+    def _read_response(response, query, variables, persisted=False):
+        """This function checks a query or mutation response.
+
+        Args:
+            response (httpx.Response): Server response.
+            query (string): GraphQL instructions (for the error report).
+            variables (dict): Variables of the transaction (for the error report).
+            persisted (bool, optional): The request was an APQ one; APQ errors
+              are returned even on a non-200 status so they can be retried.
+              Defaults to False.
+
+        Raises:
+            GQLResponseException: Raised when the GraphQL query fails.
+
+        Returns:
+            (bytes): Raw GraphQLResponse body.
+        """
+        if response.status_code == 200:
+            return response.content
+        if persisted and persisted_query_miss(response.content):
+            return response.content
+        body = response.text
+        error_message = (
+            f"Query failed to run by returning code of "
+            f"{response.status_code}.\n{body}\n{query}"
+        )
+        raise GQLResponseException(
+            message=error_message,
+            status_code=response.status_code,
+            query=query,
+            variables=variables,
+            response_body=body,
+        )
+
+    def _persisted_query_fallback(self, template, query, variables, apq_error):
+        """Request to send after an APQ error: register the document, or send
+        it in full (disabling APQ on the environment) when unsupported."""
+        if apq_error == PERSISTED_QUERY_NOT_SUPPORTED:
+            log(
+                LogLevel.WARNING,
+                f"Persisted queries not supported by {template.url}, disabling them",
+            )
+            if template.name in self.environments:
+                self.environments[template.name]["persisted_queries"] = False
+                self._compile_environment(template.name)
+            return self._build_request(template, query, variables)
+        return self._build_request(
+            template, query, variables, persisted=True, register=True
+        )
+
+    def _send(self, method, template, request):
+        pool = self._environment_pool(template.name)
+        with pool.using(), pool.slot():
+            # Use thread-local client for better connection pooling
+            client = pool.client()
+            try:
+                return getattr(client, method)(template.url, **request)
+            except Exception as _e:
+                # If connection fails, create a new client and retry
+                pool.drop(client)
+                client = pool.client()
+                return getattr(client, method)(template.url, **request)
 
     def execute(self, query: str, variables: dict | None = None) -> dict:
         """This function executes the intructions of a query or mutation.
@@ -1073,52 +2204,130 @@ class GraphQLClient(metaclass=Singleton):
         Returns:
             dict: Raw GraphQLResponse.
         """
-        data = {"query": query, "variables": variables}
-        env = self.environments.get(self.environment)
-        if not env:
-            raise Exception(f"cannot execute query without setting an environment")
+        key = self._flight_key(query)
+        if key is None:
+            return orjson.loads(self._execute_content(query, variables))
+        content = self.single_flight.do(
+            self.environment,
+            key,
+            lambda: self._execute_content(query, variables),
+            variables,
+            lambda: is_query_document(query),
+        )
+        return orjson.loads(content)
+
+    def _execute_content(self, query, variables):
+        """`execute` without decoding: returns the response body."""
+        template = self._request_environment()
+        persisted = template.persisted_queries
+        method, request = self._build_request(template, query, variables, persisted)
+        response = self._send(method, template, request)
+        content = self._read_response(response, query, variables, persisted)
+        apq_error = persisted and persisted_query_miss(content)
+        if apq_error:
+            method, request = self._persisted_query_fallback(
+                template, query, variables, apq_error
+            )
+            response = self._send(method, template, request)
+            content = self._read_response(response, query, variables)
+        return content
 
-        headers = self.DEFAULT_HEADERS.copy()
-        env_headers = env.get("headers")
-        if env_headers:
-            headers.update(env_headers)
+    def execute_stream(
+        self, query: str, variables: dict | None = None, path: str = "data"
+    ):
+        """This function executes a query and yields the elements of one list
+        of the response while the body is still being received.
 
-        # Use thread-local client for better connection pooling
-        try:
-            client = self._get_http_client()
-            response = client.post(
-                env["url"],
-                json=data,
-                headers=headers,
-                timeout=float(env.get("post_timeout", 60)),
-            )
-        except Exception as _e:
-            # If connection fails, create a new client and retry
-            self._thread_local.client = httpx.Client(**self.client_params)
-            client = self._thread_local.client
-            response = client.post(
-                env["url"],
-                json=data,
-                headers=headers,
-                timeout=float(env.get("post_timeout", 60)),
-            )
+        The body is read with `iter_bytes` and every element is decoded on its
+        own, so memory stays proportional to one element instead of the whole
+        response. Requests are sent in full (no persisted queries, cache or
+        single-flight) and are not retried once elements were yielded.
 
-        if response.status_code == 200:
-            return orjson.loads(response.content)
-        else:
-            body = response.text
-            error_message = (
-                f"Query failed to run by returning code of "
-                f"{response.status_code}.\n{body}\n{query}"
-            )
+        Args:
+            query (string): GraphQL instructions.
+            variables (dict, optional): Variables of the transaction. Defaults
+             to None.
+            path (string, optional): Dotted keys of the list to stream, e.g.
+             'data.measurements'. Defaults to 'data'.
+
+        Raises:
+            Exception: There is not setted a main environment.
+            GQLResponseException: Raised when the request fails or the response
+             has errors (after the streamed elements).
+            StreamDecodeError: Raised when the body is not valid JSON.
+
+        Yields:
+            any: Decoded elements of the list at `path`.
+        """
+        template = self._request_environment()
+        method, request = self._build_request(template, query, variables)
+        decoder = StreamingListDecoder(path)
+        pool = self._environment_pool(template.name)
+        with (
+            pool.using(),
+            pool.slot(),
+            pool.client().stream(method.upper(), template.url, **request) as response,
+        ):
+            if response.status_code != 200:
+                response.read()
+                self._read_response(response, query, variables)
+            for chunk in response.iter_bytes():
+                yield from decoder.feed(chunk)
+            yield from decoder.close()
+        self._raise_stream_errors(decoder, query, variables)
+
+    @staticmethod
+    def _raise_stream_errors(decoder, query, variables):
+        response = decoder.response()
+        errors = response.get("errors") if isinstance(response, dict) else None
+        if errors:
             raise GQLResponseException(
-                message=error_message,
-                status_code=response.status_code,
+                message=f"Streamed query returned errors: {errors}",
+                status_code=200,
                 query=query,
                 variables=variables,
-                response_body=body,
+                response_body=orjson.dumps(response).decode("utf-8"),
             )
 
+    def _flight_key(self, query):
+        """Single-flight key of a document in the current environment, or None
+        when single_flight is disabled. Kept cheap: the raw text, with the
+        variables compared only on contention (mutations are ruled out by the
+        memoized `is_query_document`)."""
+        env = self.environments.get(self.environment) or {}
+        if not env.get("single_flight", True):
+            return None
+        return (self.environment, query)
+
+    def _cache_ttl(self, query, cache_ttl):
+        """TTL to cache `query` with in the current environment, or None."""
+        if cache_ttl is None:
+            env = self.environments.get(self.environment) or {}
+            cache_ttl = env.get("cache_ttl")
+        if not cache_ttl or not is_query_document(query):
+            return None
+        return cache_ttl
+
+    def _cache_response(self, key, content, ttl):
+        """Decodes a response body, caching it when it has no errors."""
+        result = orjson.loads(content)
+        if key is not None and isinstance(result, dict) and not result.get("errors"):
+            self.response_cache.set(key, content, ttl)
+        return result
+
+    def _cached_execute(self, query, variables, ttl):
+        key = cache_key(self.environment, query, variables)
+        content = self.response_cache.get(key) if key is not None else None
+        if content is not None:
+            return orjson.loads(content)
+        if key is None:
+            return self.execute(query, variables)
+        # Concurrent misses of the key share one request
+        content = self.single_flight.do(
+            self.environment, key, lambda: self._execute_content(query, variables)
+        )
+        return self._cache_response(key, content, ttl)
+
     # * ASYNC METHODS ----------------------------------
     async def _get_async_client(self):
         """Return the shared async client, rebuilding only when missing or closed.
@@ -1126,9 +2335,16 @@ class GraphQLClient(metaclass=Singleton):
         No per-call liveness probe — a dead event loop is recovered lazily by
         async_execute's retry.
         """
-        if self._async_client is None or self._async_client.is_closed:
-            self._async_client = httpx.AsyncClient(**self.async_client_params)
-        return self._async_client
+        while self._retired_async_clients:
+            retired = self._retired_async_clients.pop()
+            try:
+                await retired.aclose()
+            except Exception as e:  # pylint: disable=broad-except
+                log(LogLevel.WARNING, f"Warning: Error closing async client: {str(e)}")
+        pool = self._environment_pool()
+        if pool.async_client is None or pool.async_client.is_closed:
+            pool.async_client = httpx.AsyncClient(**pool.async_client_params)
+        return pool.async_client
 
     async def _drop_async_client(self):
         """Best-effort aclose() of the current async client before dropping it.
@@ -1156,6 +2372,28 @@ class GraphQLClient(metaclass=Singleton):
             return True
         return isinstance(error, TRANSIENT_TRANSPORT_ERRORS)
 
+    async def _async_send(self, method, template, request):
+        pool = self._environment_pool(template.name)
+        with pool.using():
+            async with pool.async_slot():
+                # Get a client that we know is connected to a valid event loop
+                client = await self._get_async_client()
+
+                try:
+                    # Make the actual request
+                    return await getattr(client, method)(template.url, **request)
+                except (httpx.RequestError, RuntimeError) as e:
+                    if not self._should_retry_on_fresh_connection(e):
+                        raise
+                    # Retry on the SAME shared client (httpx opens a fresh
+                    # connection). Only a closed event loop needs a full rebuild —
+                    # and it's the only RuntimeError the predicate admits. Dropping
+                    # the shared pool per transient error would churn connections.
+                    if isinstance(e, RuntimeError):
+                        await self._drop_async_client()
+                        client = await self._get_async_client()
+                    return await getattr(client, method)(template.url, **request)
+
     async def async_execute(self, query: str, variables: dict | None = None) -> dict:
         """Async version of execute method that executes instructions of a query or mutation.
 
@@ -1171,59 +2409,88 @@ class GraphQLClient(metaclass=Singleton):
         Returns:
             dict: Raw GraphQLResponse.
         """
-        data = {"query": query, "variables": variables}
-        env = self.environments.get(self.environment)
-        if not env:
-            raise Exception(f"cannot execute query without setting an environment")
+        key = self._flight_key(query)
+        if key is None:
+            return orjson.loads(await self._async_execute_content(query, variables))
+        content = await self.single_flight.async_do(
+            self.environment,
+            key,
+            lambda: self._async_execute_content(query, variables),
+            variables,
+            lambda: is_query_document(query),
+        )
+        return orjson.loads(content)
+
+    async def _async_execute_content(self, query, variables):
+        """`async_execute` without decoding: returns the response body."""
+        template = self._request_environment()
+        persisted = template.persisted_queries
+        method, request = self._build_request(template, query, variables, persisted)
+        response = await self._async_send(method, template, request)
+        content = self._read_response(response, query, variables, persisted)
+        apq_error = persisted and persisted_query_miss(content)
+        if apq_error:
+            method, request = self._persisted_query_fallback(
+                template, query, variables, apq_error
+            )
+            response = await self._async_send(method, template, request)
+            content = self._read_response(response, query, variables)
+        return content
+
+    async def _async_cached_execute(self, query, variables, ttl):
+        key = cache_key(self.environment, query, variables)
+        if key is None:
+            return await self.async_execute(query, variables)
+        content = self.response_cache.get(key)
+        if content is not None:
+            return orjson.loads(content)
+        # Concurrent misses of the key share one request
+        content = await self.single_flight.async_do(
+            self.environment, key, lambda: self._async_execute_content(query, variables)
+        )
+        return self._cache_response(key, content, ttl)
 
-        headers = self.DEFAULT_HEADERS.copy()
-        env_headers = env.get("headers")
-        if env_headers:
-            headers.update(env_headers)
+    async def async_execute_stream(
+        self, query: str, variables: dict | None = None, path: str = "data"
+    ):
+        """Async version of `execute_stream`: reads the body with
+        `aiter_bytes` and yields the elements of the list at `path`.
 
-        # Get a client that we know is connected to a valid event loop
-        client = await self._get_async_client()
+        Args:
+            query (string): GraphQL instructions.
+            variables (dict, optional): Variables of the transaction. Defaults
+             to None.
+            path (string, optional): Dotted keys of the list to stream, e.g.
+             'data.measurements'. Defaults to 'data'.
 
-        try:
-            # Make the actual request
-            response = await client.post(
-                env["url"],
-                json=data,
-                headers=headers,
-                timeout=float(env.get("post_timeout", 60)),
-            )
-        except (httpx.RequestError, RuntimeError) as e:
-            if not self._should_retry_on_fresh_connection(e):
-                raise
-            # Retry on the SAME shared client (httpx opens a fresh connection).
-            # Only a closed event loop needs a full rebuild — and it's the only
-            # RuntimeError the predicate admits. Dropping the shared pool per
-            # transient error would churn connections.
-            if isinstance(e, RuntimeError):
-                await self._drop_async_client()
-                client = await self._get_async_client()
-            response = await client.post(
-                env["url"],
-                json=data,
-                headers=headers,
-                timeout=float(env.get("post_timeout", 60)),
-            )
+        Raises:
+            Exception: There is not setted a main environment.
+            GQLResponseException: Raised when the request fails or the response
+             has errors (after the streamed elements).
+            StreamDecodeError: Raised when the body is not valid JSON.
 
-        if response.status_code == 200:
-            return orjson.loads(response.content)
-        else:
-            body = response.text
-            error_message = (
-                f"Query failed to run by returning code of "
-                f"{response.status_code}.\n{body}\n{query}"
-            )
-            raise GQLResponseException(
-                message=error_message,
-                status_code=response.status_code,
-                query=query,
-                variables=variables,
-                response_body=body,
-            )
+        Yields:
+            any: Decoded elements of the list at `path`.
+        """
+        template = self._request_environment()
+        method, request = self._build_request(template, query, variables)
+        decoder = StreamingListDecoder(path)
+        pool = self._environment_pool(template.name)
+        with pool.using():
+            async with pool.async_slot():
+                client = await self._get_async_client()
+                async with client.stream(
+                    method.upper(), template.url, **request
+                ) as response:
+                    if response.status_code != 200:
+                        await response.aread()
+                        self._read_response(response, query, variables)
+                    async for chunk in response.aiter_bytes():
+                        for item in decoder.feed(chunk):
+                            yield item
+                    for item in decoder.close():
+                        yield item
+        self._raise_stream_errors(decoder, query, variables)
 
     async def async_query(
         self,
@@ -1231,6 +2498,7 @@ class GraphQLClient(metaclass=Singleton):
         variables: dict | None = None,
         flatten: bool = True,
         single_child: bool = False,
+        cache_ttl: float | None = None,
     ) -> tuple:
         """Async version of query method that makes a query transaction to the actual environment.
 
@@ -1241,6 +2509,9 @@ class GraphQLClient(metaclass=Singleton):
              not. Defaults to True.
             single_child (bool, optional): Check if GraphQLResponse only has one
              element. Defaults to False.
+            cache_ttl (float, optional): Seconds a successful response is
+             served from `response_cache`. Defaults to None (the environment's
+             `cache_ttl`; mutations are never cached).
 
         Returns:
             tuple: Tuple containing (data, errors) from the GraphQL response.
@@ -1248,7 +2519,11 @@ class GraphQLClient(metaclass=Singleton):
         data = None
         errors = []
         try:
-            response = await self.async_execute(query, variables)
+            ttl = self._cache_ttl(query, cache_ttl)
+            if ttl:
+                response = await self._async_cached_execute(query, variables, ttl)
+            else:
+                response = await self.async_execute(query, variables)
             if flatten:
                 data = response.get("data", None)
             else:
@@ -1260,6 +2535,56 @@ class GraphQLClient(metaclass=Singleton):
             errors = exception_errors(e)
         return data, errors
 
+    async def async_query_pages(
+        self,
+        query: str,
+        variables: dict | None = None,
+        page_size: int = 100,
+        paginate: str = "offset",
+        limit_var: str | None = None,
+        offset_var: str = "offset",
+        cursor_var: str = "after",
+    ):
+        """Async version of query_pages. Page N+1 is requested as soon as page N
+        arrives, so it downloads while the caller processes the rows of page N.
+
+        Args:
+            Same as `query_pages`.
+
+        Raises:
+            GQLResponseException: A page returned errors.
+
+        Yields:
+            Each flattened row, one page (plus the prefetched one) in memory at
+             a time.
+        """
+        page_vars = self._first_page_variables(
+            variables, page_size, paginate, limit_var, offset_var, cursor_var
+        )
+        pending = asyncio.ensure_future(self.async_execute(query, page_vars))
+        try:
+            while pending is not None:
+                response = await pending
+                pending = None
+                rows, page_vars = self._read_page(
+                    query,
+                    response,
+                    page_vars,
+                    page_size,
+                    paginate,
+                    offset_var,
+                    cursor_var,
+                )
+                if page_vars is not None:
+                    pending = asyncio.ensure_future(
+                        self.async_execute(query, page_vars)
+                    )
+                for row in rows:
+                    yield row
+        finally:
+            if pending is not None:
+                pending.cancel()
+
     async def async_query_one(self, query: str, variables: dict | None = None) -> tuple:
         """Async version of query_one method that makes a single child query.
 
@@ -1307,6 +2632,180 @@ class GraphQLClient(metaclass=Singleton):
                         errors.extend(data_messages)
         return data, errors
 
+    # * Concurrent fan-out
+    def _async_concurrency_limit(self) -> int:
+        """Default max in-flight requests: the current environment's async pool
+        connection limit, so a fan-out queues in pygqlc instead of timing out
+        in the pool."""
+        limits = self.async_client_params.get("limits")
+        if limits is None:
+            env = self.environments.get(self.environment) or {}
+            limits = (env.get("pool") or DEFAULT_POOL).limits()
+        max_connections = getattr(limits, "max_connections", None)
+        return max_connections or 100  # httpx's default pool size
+
+    async def _async_as_completed(self, run, requests, max_concurrency):
+        """Runs `run(document, variables)` for every request with at most
+        `max_concurrency` in flight, pulling from `requests` only when a slot
+        frees up. Yields (index, result) as each one completes."""
+        limit = max_concurrency or self._async_concurrency_limit()
+        requests = enumerate(requests)
+        pending = {}
+        try:
+            while True:
+                while len(pending) < limit:
+                    request = next(requests, None)
+                    if request is None:
+                        break
+                    index, (document, variables) = request
+                    pending[asyncio.ensure_future(run(document, variables))] = index
+                if not pending:
+                    return
+                done, _ = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    yield pending.pop(task), task.result()
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _async_many(self, run, requests, max_concurrency):
+        results = []
+        async for index, result in self._async_as_completed(
+            run, requests, max_concurrency
+        ):
+            results.extend([None] * (index + 1 - len(results)))
+            results[index] = result
+        return results
+
+    async def async_query_many(
+        self,
+        requests,
+        max_concurrency: int | None = None,
+        flatten: bool = True,
+        single_child: bool = False,
+    ) -> list:
+        """Runs many independent queries concurrently on the shared async pool.
+
+        Args:
+            requests (iterable): (query, variables) pairs; consumed lazily.
+            max_concurrency (int, optional): Max queries in flight. Defaults to
+             the async pool's `max_connections`.
+            flatten (bool, optional): Same as `async_query`. Defaults to True.
+            single_child (bool, optional): Same as `async_query`. Defaults to False.
+
+        Returns:
+            list: One (data, errors) tuple per request, in request order.
+        """
+
+        async def run(query, variables):
+            return await self.async_query(query, variables, flatten, single_child)
+
+        return await self._async_many(run, requests, max_concurrency)
+
+    def async_query_as_completed(
+        self,
+        requests,
+        max_concurrency: int | None = None,
+        flatten: bool = True,
+        single_child: bool = False,
+    ):
+        """Like `async_query_many`, but an async iterator of
+        (index, (data, errors)) in completion order."""
+
+        async def run(query, variables):
+            return await self.async_query(query, variables, flatten, single_child)
+
+        return self._async_as_completed(run, requests, max_concurrency)
+
+    async def async_mutate_many(
+        self, requests, max_concurrency: int | None = None, flatten: bool = True
+    ) -> list:
+        """Runs many independent mutations concurrently on the shared async pool.
+
+        Args:
+            requests (iterable): (mutation, variables) pairs; consumed lazily.
+            max_concurrency (int, optional): Max mutations in flight. Defaults
+             to the async pool's `max_connections`.
+            flatten (bool, optional): Same as `async_mutate`. Defaults to True.
+
+        Returns:
+            list: One (data, errors) tuple per request, in request order.
+        """
+
+        async def run(mutation, variables):
+            return await self.async_mutate(mutation, variables, flatten)
+
+        return await self._async_many(run, requests, max_concurrency)
+
+    def async_mutate_as_completed(
+        self, requests, max_concurrency: int | None = None, flatten: bool = True
+    ):
+        """Like `async_mutate_many`, but an async iterator of
+        (index, (data, errors)) in completion order."""
+
+        async def run(mutation, variables):
+            return await self.async_mutate(mutation, variables, flatten)
+
+        return self._async_as_completed(run, requests, max_concurrency)
+
+    async def async_subscribe(
+        self,
+        query: str,
+        variables: dict | None = None,
+        callback=None,
+        flatten: bool = True,
+        on_error_callback=None,
+        _id: str | None = None,
+    ):
+        """Async version of subscribe. All async subscriptions of the client are
+        multiplexed over a single asyncio websocket (graphql-transport-ws), which
+        reconnects and resubscribes on its own. Requires the optional
+        `websockets` package.
+
+        Args:
+            query (string): Graphql subscription instructions.
+            variables (dict, optional): Subscription variables. Defaults to None.
+            callback (function, optional): Called (and awaited, if it returns an
+             awaitable) with every message. Defaults to None, in which case the
+             returned subscription must be iterated with `async for`.
+            flatten (bool, optional): Check if GraphqlResponse should be flatten or
+             not. Defaults to True.
+            on_error_callback (function, optional): Called with error frames.
+             Defaults to None.
+            _id (string, optional): Subscription id. Defaults to None.
+
+        Returns:
+            (AsyncSubscription): Async iterator over the subscription messages,
+             with an `unsubscribe()` coroutine.
+        """
+        from .AsyncSubscription import AsyncSubscriptionRouter
+
+        router = self._async_sub_router
+        if (
+            router is None
+            or router.closing
+            or router.loop is not asyncio.get_running_loop()
+        ):
+            router = self._async_sub_router = AsyncSubscriptionRouter(self)
+        sub = await router.subscribe(
+            query,
+            variables,
+            flatten=flatten,
+            on_error_callback=on_error_callback,
+            _id=_id,
+        )
+        if callback is not None:
+            sub.callback_task = asyncio.create_task(sub._run_callback(callback))
+        return sub
+
+    async def async_close_subscriptions(self):
+        """Ends every async subscription and closes their websocket."""
+        router, self._async_sub_router = self._async_sub_router, None
+        if router is not None and router.loop is asyncio.get_running_loop():
+            await router.close()
+
     # Ensure cleanup of resources
     async def async_cleanup(self):
         """Close any open async resources
@@ -1315,26 +2814,35 @@ class GraphQLClient(metaclass=Singleton):
         async operations are in progress. It handles cases where
         the event loop might already be closed.
         """
+        await self.async_close_subscriptions()
         await self._drop_async_client()
+        self.close_idle_pools()
+        while self._retired_async_clients:
+            client = self._retired_async_clients.pop()
+            try:
+                await client.aclose()
+            except Exception as e:  # pylint: disable=broad-except
+                log(LogLevel.WARNING, f"Warning: Error closing async client: {str(e)}")
 
     def _close(self):
         """Explicitly close resources"""
-        # Clean up synchronous client
-        if hasattr(self, "_thread_local") and hasattr(self._thread_local, "client"):
-            try:
-                self._thread_local.client.close()
-            except Exception:  # pylint: disable=broad-except
-                pass
+        if hasattr(self, "_executor_lock"):
+            self._shutdown_executor()
+        # Clean up the environments' clients (sync ones close right away, async
+        # ones are queued in _retired_async_clients)
+        if not hasattr(self, "_pools_lock"):
+            return
+        self.close_idle_pools()
 
-        # For the async client we can't await here. If this thread has a running
+        # For the async clients we can't await here. If this thread has a running
         # event loop (e.g. __del__ triggered by GC inside a loop thread), schedule
         # aclose() on it; otherwise the transports are left to GC, as before.
         # __del__ can run on any thread, hence call_soon_threadsafe.
-        if hasattr(self, "_async_client") and self._async_client is not None:
-            client, self._async_client = self._async_client, None
+        while self._retired_async_clients:
+            client = self._retired_async_clients.pop()
             try:
                 loop = asyncio.get_running_loop()
-                loop.call_soon_threadsafe(lambda: loop.create_task(client.aclose()))
+                loop.call_soon_threadsafe(lambda c=client: loop.create_task(c.aclose()))
             except Exception:  # pylint: disable=broad-except
                 pass  # no usable loop — GC fallback, as before
 
@@ -50,6 +50,11 @@ class MutationBatch:
           Defaults to None.
         label (str, optional): Label that will get each transaction of the batch.
           Defaults to 'mutation'.
+        max_ops_per_request (int, optional): Split the batch into requests of at
+          most this many transactions. Defaults to None (a single request).
+        max_concurrency (int, optional): Number of chunks sent at the same time.
+          Defaults to 1.
+        operation (str, optional): 'mutation' or 'query'. Defaults to 'mutation'.
 
     Examples:
         >>> Batch example:
@@ -99,14 +104,25 @@ class MutationBatch:
 
     """
 
-    def __init__(self, client=None, label="mutation"):
+    def __init__(
+        self,
+        client=None,
+        label="mutation",
+        max_ops_per_request=None,
+        max_concurrency=1,
+        operation="mutation",
+    ):
         """Constructor of the MutatuibBatch object."""
         self.client = client
-        self.start_tag = "mutation BatchMutation {"
-        self.batch_doc = ""
+        self.max_ops_per_request = max_ops_per_request
+        self.max_concurrency = max_concurrency
+        self.operation = operation
+        self.start_tag = f"{operation} Batch{operation.capitalize()}"
         self.close_tag = "}"
         self.label = label
         self.count = 1
+        # * one (variable definitions, aliased selection, variables) per append
+        self.items = []
 
     def __enter__(self):
         return self
@@ -114,9 +130,18 @@ class MutationBatch:
     def __exit__(self, type, value, traceback):
         pass
 
+    @property
+    def batch_doc(self):
+        """Aliased selections of the batch, one per line."""
+        return "".join(f"\t{selection}\n" for _, selection, _ in self.items)
+
     def append(self, doc, variables={}):
         """This function makes each transactions for the batch.
 
+        Declared variables are sent as real GraphQL variables, renamed per
+        label (`$name` -> `$mutation_1_name`); variables the document uses
+        without declaring them are inlined as literals.
+
         Args:
             doc (string): GraphQL transaction intructions.
             variables (dict, optional): Variables of the transaction. Defaults to {}.
@@ -129,33 +154,142 @@ class MutationBatch:
         valid_doc = mp.parse()
         if not valid_doc:
             raise InvalidMutationException("Invalid mutation document")
-        # build batch mutation from extracted tokens
-        parsed_doc = mp.content
-        for key, value in variables.items():
-            parsed_doc = parsed_doc.replace(f"${key}", mp.format_value(value))
-        self.batch_doc += f"\t{self.label}_{self.count}: {parsed_doc}\n"
+        alias = f"{self.label}_{self.count}"
+        variables = variables or {}
+        declared = mp.variable_definitions
+        definitions = []
+        bound = {}
+        for name, (var_type, default) in declared.items():
+            definition = f"${alias}_{name}: {var_type}"
+            definitions.append(f"{definition} = {default}" if default else definition)
+            if name in variables:
+                bound[f"{alias}_{name}"] = variables[name]
+
+        def bind(name):
+            if name in declared:
+                return f"${alias}_{name}"
+            if name in variables:
+                return mp.format_value(variables[name])
+            return f"${name}"
+
+        content = mp.substitute_variables(bind)
+        self.items.append((definitions, f"{alias}: {content}", bound))
         self.count += 1
 
-    def get_doc(self):
+    def get_doc(self, items=None):
         """This function builds the transaction.
 
+        Args:
+            items (list, optional): Subset of `items` to build. Defaults to all.
+
         Returns:
             (string): Returns the full transaction, ready to execute.
         """
-        full_doc = f"""{self.start_tag}\n{self.batch_doc} {self.close_tag}"""
-        return full_doc
+        items = self.items if items is None else items
+        definitions = [d for item_defs, _, _ in items for d in item_defs]
+        header = self.start_tag
+        if definitions:
+            header += "(\n\t" + "\n\t".join(definitions) + "\n)"
+        selections = "".join(f"\t{selection}\n" for _, selection, _ in items)
+        return f"{header} {{\n{selections} {self.close_tag}"
+
+    def get_variables(self, items=None):
+        """This function merges the (renamed) variables of the batch.
+
+        Args:
+            items (list, optional): Subset of `items`. Defaults to all.
+
+        Returns:
+            (dict): Variables for the document built by `get_doc`.
+        """
+        items = self.items if items is None else items
+        variables = {}
+        for _, _, item_vars in items:
+            variables.update(item_vars)
+        return variables
+
+    def chunks(self):
+        """This function splits the batch by `max_ops_per_request`.
+
+        Returns:
+            (list): Lists of items, one per request.
+        """
+        size = self.max_ops_per_request or len(self.items) or 1
+        return [self.items[i : i + size] for i in range(0, len(self.items), size)]
+
+    def requests(self):
+        """This function builds one (document, variables) pair per chunk.
+
+        Returns:
+            (list): Requests ready to execute.
+        """
+        return [
+            (self.get_doc(chunk), self.get_variables(chunk) or None)
+            for chunk in self.chunks()
+        ]
+
+    def _chunk_result(self, result):
+        """Normalizes a chunk's (data, errors). Messages of every label count
+        as errors, as `mutate` does when it flattens a multi-label response."""
+        data, errors = result
+        if self.operation == "query":
+            return (data or {}).get("data"), errors  # unflattened GqlResponse
+        if not errors:
+            errors.extend(self.client._get_messages(data))
+        return data, errors
+
+    def _merge(self, results):
+        """Merges chunk responses into the single-request (data, error_dict)."""
+        merged = {}
+        error_dict = {}
+        for data, errors in map(self._chunk_result, results):
+            if errors:
+                error_dict.setdefault("server", []).extend(errors)
+            if data:
+                merged.update(data)
+                for label, response in data.items():
+                    if isinstance(response, dict):
+                        error_dict[label] = response.get("messages", [])
+                    else:
+                        error_dict[label] = []
+        return merged or None, error_dict
 
     def execute(self):
-        """This function can execute a TransactionBatch.
+        """This function can execute a TransactionBatch, chunk by chunk
+        (`max_concurrency` chunks at a time, on the client's worker pool).
 
         Returns:
             (GraphqlResponse): Returns the Graphql response.
         """
-        error_dict = {}
-        data, errors = self.client.mutate(self.get_doc())
-        if errors:
-            error_dict["server"] = errors
-        if data:
-            for label, response in data.items():
-                error_dict[label] = response.get("messages", [])
-        return data, error_dict
+        requests = self.requests()
+        if self.operation == "query":
+            send, send_many = self.client.query, self.client.query_many
+        else:
+            send, send_many = self.client.mutate, self.client.mutate_many
+        if len(requests) == 1:
+            results = [send(*requests[0], flatten=False)]
+        else:
+            results = send_many(
+                requests, flatten=False, max_concurrency=self.max_concurrency
+            )
+        return self._merge(results)
+
+    async def async_execute(self):
+        """Async version of execute: chunks run as tasks on the shared async
+        client (`max_concurrency` at a time).
+
+        Returns:
+            (GraphqlResponse): Returns the Graphql response.
+        """
+        requests = self.requests()
+        if self.operation == "query":
+            send, send_many = self.client.async_query, self.client.async_query_many
+        else:
+            send, send_many = self.client.async_mutate, self.client.async_mutate_many
+        if len(requests) == 1:
+            results = [await send(*requests[0], flatten=False)]
+        else:
+            results = await send_many(
+                requests, flatten=False, max_concurrency=self.max_concurrency
+            )
+        return self._merge(results)
@@ -1,18 +1,11 @@
-import re
+import orjson
+from .DocumentParser import parse_document, GraphQLSyntaxError
 
 """
 The purpose of this module is to prepare a graphql transaction, such as a query
  or mutation, to be able to carry out a batch of them.
 """
 
-mutation_regex = r"^\s*mutation\s*(\s+[a-zA-Z_]+[a-zA-Z_0-9]?)?\s*(\(\s*(((\$[a-zA-Z_]+[a-zA-Z_0-9]?)\s*:\s*([a-zA-Z_]+[a-zA-Z_0-9]?!?)\s*)+\s*)\))?\s*{\s*((.\s*)+\s*})\s*}"
-rgx_groups = {
-    "full_doc": 0,
-    "alias": 1,
-    "variables": 3,
-    "content": 7,
-}
-
 
 class MutationParser:
     """This is the MutationParser class, it can parse a graphql instructions."""
@@ -24,72 +17,122 @@ class MutationParser:
             gql_doc (string): Graphql instructions
 
         Attributes:
-            re (module): Regexp module.
-            regex (regex): Transaction Regex.
-            match (Match Object): Match object of the pattern and doc. Defaults to
-              None.
+            document (Document): Parsed document. Defaults to None.
+            error (GraphQLSyntaxError): Why the doc is invalid. Defaults to None.
             isValid (boolean): Checks if the gql_doc is valid. Defaults to False.
             full_doc (string): All Graphql instructions.
             alias (string): Name of the transaction.
             variables (string): Variables of the transaction.
             content (content): The transaction content.
+            variable_definitions (dict): Declared variables, name -> (type,
+              default or None).
         """
-        self.re = re
-        self.regex = mutation_regex
         self.gql_doc = gql_doc
-        self.match = None
+        self.document = None
+        self.error = None
         self.isValid = False
         self.full_doc = None
         self.alias = None
         self.variables = None
         self.content = None
+        self.variable_definitions = {}
+        self._content_start = None
 
     def parse(self):
-        """This fuction parses and validates the transaction instructions.3
+        """This fuction parses and validates the transaction instructions.
+
+        Query operations are accepted as well, so batches of queries can be
+        built from the same tokens.
 
         Returns:
             (boolean): Returns if the parsed doc was succesful.
         """
-        # ! First, remove variable definitions:
-        doc = self.gql_doc
-        var_end = doc.find("{")
-        short_doc = doc[var_end:]
-        self.gql_doc = f"mutation {short_doc}"
-        if self.validate():
-            self.full_doc = self.match.group(rgx_groups["full_doc"])
-            self.alias = self.match.group(rgx_groups["alias"])
-            self.variables = self.match.group(rgx_groups["variables"])
-            self.content = self.match.group(rgx_groups["content"])
-            return True
-        return False
+        if not self._parse_operation(("mutation", "query")):
+            return False
+        operation = self.document.operations[0]
+        source = self.document.source
+        self.full_doc = source[operation.start : operation.end]
+        self.alias = operation.name
+        self.variable_definitions = {
+            v.name: (v.type, v.default) for v in operation.variable_definitions
+        }
+        self.variables = (
+            " ".join(f"${v.name}: {v.type}" for v in operation.variable_definitions)
+            or None
+        )
+        selection = source[operation.selection_start + 1 : operation.selection_end - 1]
+        self.content = selection.strip()
+        self._content_start = (
+            operation.selection_start + 1 + len(selection) - len(selection.lstrip())
+        )
+        return True
+
+    def substitute_variables(self, replace):
+        """This function rewrites the `$variable` references of `content`,
+        using the positions recorded by the (cached) parse instead of scanning
+        the text again.
+
+        Args:
+            replace (function): Called with a variable name; returns the text
+              that replaces `$name`.
+
+        Returns:
+            (string): The rewritten content.
+        """
+        source = self.document.source
+        end = self._content_start + len(self.content)
+        parts = []
+        last = self._content_start
+        for ref_start, ref_end, name in self.document.operations[0].variable_references:
+            parts.append(source[last:ref_start])
+            parts.append(replace(name))
+            last = ref_end
+        parts.append(source[last:end])
+        return "".join(parts)
 
     def validate(self):
-        """This function checks if the transaction instructions has match with the
-         transaction regex.
+        """This function checks if the transaction instructions are a valid
+         mutation document.
 
         Returns:
             (boolean): Returns if it is valid or not.
         """
-        match = self.re.match(self.regex, self.gql_doc)
-        self.isValid = match is not None
-        if self.isValid:
-            self.match = match
+        return self._parse_operation(("mutation",))
+
+    def _parse_operation(self, operation_types):
+        try:
+            self.document = parse_document(self.gql_doc)
+        except GraphQLSyntaxError as e:
+            self.error = e
+            self.isValid = False
+            return self.isValid
+        operations = self.document.operations
+        self.isValid = bool(operations) and operations[0].operation in operation_types
         return self.isValid
 
     def format_value(self, value):
-        """This function formats document's values.
+        """This function formats document's values as GraphQL literals.
 
         Args:
-            value (any): Value that want to format.
+            value (any): Value that want to format (dicts are formatted as
+              input objects and lists as GraphQL lists).
 
         Returns:
             (string): Returns a formated string.
         """
         if type(value) == str:
-            return f'"{value}"'
+            # JSON string escapes are valid GraphQL string escapes
+            return orjson.dumps(value).decode("utf-8")
         elif type(value) == bool:
             return f"{'true' if value else 'false'}"
         elif type(value) == type(None):
             return "null"
+        elif isinstance(value, dict):
+            fields = ", ".join(
+                f"{key}: {self.format_value(item)}" for key, item in value.items()
+            )
+            return f"{{{fields}}}"
+        elif isinstance(value, (list, tuple)):
+            return f"[{', '.join(self.format_value(item) for item in value)}]"
         else:
             return str(value)
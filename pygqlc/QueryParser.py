@@ -1,15 +1,24 @@
-import re
-# ! works, but quite slow when graphql query handles more than two items in the response (20+ seconds)
-# query_regex = r'^\s*(query(\s+[a-zA-Z_]+[a-zA-Z_0-9]?)?)?\s*(\(\s*(((\$[a-zA-Z_]+[a-zA-Z_0-9]?)\s*:\s*([a-zA-Z_]+[a-zA-Z_0-9]?!?)\s*)+\s*)\))?\s*{\s*(\s*(([a-zA-Z_]+[a-zA-Z_0-9]?)\s*:)?\s*([a-zA-Z_]+[a-zA-Z_0-9]?\s*(\(\s*((.\s*)+)\s*\))?)\s*{\s*((.\s*)+)\s*})\s*}'
-
-query_regex = r"^\s*(query(\s+[a-zA-Z_]+[a-zA-Z_0-9]?)?)?\s*(\(\s*(((\$[a-zA-Z_]+[a-zA-Z_0-9]?)\s*:\s*([a-zA-Z_]+[a-zA-Z_0-9]?!?)\s*)+\s*)\))?\s*{\s*((.\s*)+)\s*}\s*}"
+from .DocumentParser import parse_document, GraphQLSyntaxError
 
 
 class QueryParser:
+    """This is the QueryParser class, it validates graphql query documents."""
+
     def __init__(self, gql_doc):
         self.gql_doc = gql_doc
-        self.match = None
+        self.document = None
+        self.error = None
 
     def validate(self):
-        self.match = re.match(query_regex, self.gql_doc)
-        return self.match is not None
+        """This function checks if the document is a valid query document.
+
+        Returns:
+            (boolean): Returns if it is valid or not.
+        """
+        try:
+            self.document = parse_document(self.gql_doc)
+        except GraphQLSyntaxError as e:
+            self.error = e
+            return False
+        operations = self.document.operations
+        return bool(operations) and operations[0].operation == "query"
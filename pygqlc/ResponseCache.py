@@ -0,0 +1,148 @@
+"""Client-side query response cache
+
+`ResponseCache` keeps raw response bodies (bytes) of successful queries,
+keyed by (environment, document, canonical variables). Entries expire after
+their TTL and the least recently used ones are evicted once the entry or byte
+budget is exceeded. Callers decode the bytes themselves, so a cached response
+is never shared as a mutable dict.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+import orjson
+
+
+def cache_key(environment, query, variables=None):
+    """This function builds the cache key of a query.
+
+    Args:
+        environment (string): Name of the environment.
+        query (string): GraphQL query instructions.
+        variables (dict, optional): Query variables. Defaults to None.
+
+    Returns:
+        (tuple): Key with the variables canonicalized (sorted JSON), or None
+          when the variables are not JSON serializable.
+    """
+    try:
+        canonical = orjson.dumps(variables, option=orjson.OPT_SORT_KEYS)
+    except TypeError:
+        return None
+    return (environment, query, canonical)
+
+
+class ResponseCache:
+    """Thread-safe LRU cache of response bodies with per-entry TTL.
+
+    Args:
+        max_entries (int, optional): Maximum number of responses kept.
+          Defaults to 1024.
+        max_bytes (int, optional): Maximum total size of the kept responses.
+          Defaults to 64 MiB.
+
+    Attributes:
+        hits (int): Lookups answered from the cache.
+        misses (int): Lookups not found (or expired).
+        evictions (int): Entries dropped to respect the budgets.
+        size (int): Bytes currently kept.
+    """
+
+    def __init__(self, max_entries=1024, max_bytes=64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # key -> (expires_at, content)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.size = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        """This function looks a response up.
+
+        Args:
+            key (tuple): Key built by `cache_key`.
+
+        Returns:
+            (bytes): The cached response body, or None.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[1]
+                self._remove(key)
+            self.misses += 1
+            return None
+
+    def set(self, key, content, ttl):
+        """This function stores a response body for `ttl` seconds.
+
+        Bodies bigger than `max_bytes` are not stored.
+
+        Args:
+            key (tuple): Key built by `cache_key`.
+            content (bytes): Raw response body.
+            ttl (float): Seconds the response stays valid.
+        """
+        if ttl <= 0 or len(content) > self.max_bytes:
+            return
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = (time.monotonic() + ttl, content)
+            self.size += len(content)
+            while self._entries and (
+                len(self._entries) > self.max_entries or self.size > self.max_bytes
+            ):
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def invalidate(self, environment=None, query=None, variables=None):
+        """This function drops cached responses.
+
+        Args:
+            environment (string, optional): Only responses of this environment.
+              Defaults to None (any).
+            query (string, optional): Only responses of this document.
+              Defaults to None (any).
+            variables (dict, optional): Only responses for these variables
+              (requires `environment` and `query`). Defaults to None (any).
+
+        Returns:
+            (int): Number of dropped responses.
+        """
+        with self._lock:
+            if variables is not None and environment is not None and query:
+                key = cache_key(environment, query, variables)
+                if key in self._entries:
+                    self._remove(key)
+                    return 1
+                return 0
+            keys = [
+                key
+                for key in self._entries
+                if (environment is None or key[0] == environment)
+                and (query is None or key[1] == query)
+            ]
+            for key in keys:
+                self._remove(key)
+            return len(keys)
+
+    def clear(self):
+        """This function drops every cached response."""
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.size -= len(entry[1])
@@ -0,0 +1,173 @@
+"""In-flight request coalescing
+
+`SingleFlight` lets identical concurrent requests share one execution: the
+first caller of a key runs the request, later callers of the same key wait
+for its result instead of sending their own. Works for threads (`do`) and
+coroutines (`async_do`, per event loop). At most `limit` keys per environment
+are coalesced at once; beyond that requests run on their own.
+
+The uncontended path stays cheap: a request is registered under a key that
+is cheap to hash (e.g. the raw query text) together with its `args` object.
+Only a caller that finds a flight under its key compares `args` (values and
+their types, nothing is serialized). Requests that must not be shared (e.g.
+mutations) are ruled out before anything is registered, so they never join
+nor lead a flight.
+"""
+
+import asyncio
+import threading
+
+
+class _Flight:
+    __slots__ = ("event", "result", "error")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Lock-protected map of in-flight requests.
+
+    Args:
+        limit (int, optional): Maximum keys coalesced at once per environment.
+          Defaults to 256.
+
+    Attributes:
+        shared (int): Requests answered by another caller's execution.
+    """
+
+    def __init__(self, limit=256):
+        self.limit = limit
+        self.shared = 0
+        self._lock = threading.Lock()
+        self._flights = {}
+        self._counts = {}  # environment -> keys in flight
+
+    def __len__(self):
+        return sum(len(flights) for flights in list(self._flights.values()))
+
+    def _join(self, environment, key, args, shareable, new_flight):
+        """Returns (flight, leader); flight is None when it runs on its own."""
+        with self._lock:
+            if shareable is not None and not shareable():
+                return None, False  # never registered: runs on its own
+            flights = self._flights.setdefault(key, [])
+            for other_args, flight in flights:
+                if _same(args, other_args):
+                    self.shared += 1
+                    return flight, False
+            if self._counts.get(environment, 0) >= self.limit:
+                if not flights:
+                    del self._flights[key]
+                return None, False
+            flight = new_flight()
+            flights.append((args, flight))
+            self._counts[environment] = self._counts.get(environment, 0) + 1
+            return flight, True
+
+    def _leave(self, environment, key, flight):
+        with self._lock:
+            flights = self._flights[key]
+            flights[:] = [entry for entry in flights if entry[1] is not flight]
+            if not flights:
+                del self._flights[key]
+            self._counts[environment] -= 1
+            if not self._counts[environment]:
+                del self._counts[environment]
+
+    def do(self, environment, key, fetch, args=None, shareable=None):
+        """This function runs `fetch()` once for concurrent callers of `key`.
+
+        Args:
+            environment (string): Environment the request is sent to.
+            key (hashable): Identity of the request (cheap to hash).
+            fetch (function): Runs the request.
+            args (any, optional): Rest of the identity, compared by equality
+              only when `key` is in flight (e.g. the variables). Defaults to
+              None.
+            shareable (function, optional): Called before the request is
+              registered (keep it cheap, e.g. memoized); returns False when
+              the request must run on its own (e.g. a mutation). Defaults to
+              None (always shareable).
+
+        Returns:
+            (any): The result of `fetch`, shared by every caller.
+        """
+        flight, leader = self._join(environment, key, args, shareable, _Flight)
+        if flight is None:
+            return fetch()
+        if not leader:
+            flight.event.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+        try:
+            flight.result = fetch()
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            self._leave(environment, key, flight)
+            flight.event.set()
+        return flight.result
+
+    async def async_do(self, environment, key, fetch, args=None, shareable=None):
+        """Async version of `do`: `fetch` is a coroutine function and callers
+        are coalesced per running event loop.
+
+        Args:
+            environment (string): Environment the request is sent to.
+            key (hashable): Identity of the request (cheap to hash).
+            fetch (function): Returns the coroutine that runs the request.
+            args (any, optional): As in `do`. Defaults to None.
+            shareable (function, optional): As in `do`. Defaults to None.
+
+        Returns:
+            (any): The result of `fetch`, shared by every caller.
+        """
+        loop = asyncio.get_running_loop()
+        key = (loop, key)
+        flight, leader = self._join(
+            environment, key, args, shareable, loop.create_future
+        )
+        if flight is None:
+            return await fetch()
+        if not leader:
+            await asyncio.wait([flight])
+            if not flight.cancelled():
+                return flight.result()
+            return await fetch()  # the leader was cancelled: fetch on our own
+        try:
+            result = await fetch()
+        except asyncio.CancelledError:
+            flight.cancel()
+            raise
+        except BaseException as e:
+            flight.set_exception(e)
+            flight.exception()  # retrieved by the waiters, if any
+            raise
+        finally:
+            self._leave(environment, key, flight)
+        flight.set_result(result)
+        return result
+
+
+def _same(args, other):
+    """Equality of two requests' `args`, types included: `True`, `1` and
+    `1.0` are different variables (False when they can't be compared)."""
+    if args is other:
+        return True
+    if type(args) is not type(other):
+        return False
+    if isinstance(args, dict):
+        return args.keys() == other.keys() and all(
+            _same(value, other[name]) for name, value in args.items()
+        )
+    if isinstance(args, (list, tuple)):
+        return len(args) == len(other) and all(map(_same, args, other))
+    try:
+        return bool(args == other)
+    except Exception:  # pylint: disable=broad-except
+        return False  # e.g. numpy arrays, whose == is elementwise
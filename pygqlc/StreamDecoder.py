@@ -0,0 +1,278 @@
+"""Incremental decoding of large GraphQL responses
+
+`StreamingListDecoder` is fed the response body chunk by chunk and returns
+the elements of one target list (e.g. `data.measurements`) as soon as each of
+them is complete, decoding every element on its own with orjson. Only the
+bytes of the element being received are buffered. Everything outside the
+target list (e.g. `errors`, `extensions`) is kept as a small skeleton
+document, where the target list shows up empty.
+"""
+
+import re
+
+import orjson
+
+# Rest of a string after its opening quote
+_STRING_TAIL = re.compile(rb'(?:[^"\\]|\\.)*+"', re.S)
+# Bytes up to the next bracket, skipping over complete strings
+_NON_STRUCTURAL = re.compile(rb'[^"\[\]{}]*+(?:"(?:[^"\\]|\\.)*+"[^"\[\]{}]*+)*+', re.S)
+_SCALAR = re.compile(rb"[^,\]}\s]*+")
+_WHITESPACE = re.compile(rb"\s*+")
+_COMPACT_SIZE = 1 << 16
+
+_QUOTE, _COLON, _COMMA = ord('"'), ord(":"), ord(",")
+_OPEN_OBJECT, _CLOSE_OBJECT = ord("{"), ord("}")
+_OPEN_LIST, _CLOSE_LIST = ord("["), ord("]")
+
+
+def _container_end(buffer, position, depth):
+    """Scans a list/object from `position` with `depth` brackets open;
+    returns where it stopped and the depth there (0 once the value ends)."""
+    while True:
+        # jump over everything but brackets, complete strings included
+        position = _NON_STRUCTURAL.match(buffer, position).end()
+        if position == len(buffer) or buffer[position] == _QUOTE:
+            return position, depth  # cut inside a string or at the end
+        depth += 1 if buffer[position] in (_OPEN_OBJECT, _OPEN_LIST) else -1
+        position += 1
+        if depth == 0:
+            return position, depth
+
+
+class StreamDecodeError(ValueError):
+    """Raised when a streamed response is not valid JSON or is truncated."""
+
+
+class StreamingListDecoder:
+    """Push decoder that yields the elements of the list at `path`.
+
+    Args:
+        path (string): Dotted object keys of the list to stream (e.g.
+          'data.measurements').
+
+    Attributes:
+        found (boolean): The target list was found in the response.
+
+    Examples:
+        >>> decoder = StreamingListDecoder('data.lines')
+        >>> decoder.feed(b'{"data": {"lines": [{"id": 1}, {"id"')
+        [{'id': 1}]
+        >>> decoder.feed(b': 2}]}}') + decoder.close()
+        [{'id': 2}]
+        >>> decoder.response()
+        {'data': {'lines': []}}
+    """
+
+    def __init__(self, path):
+        self.path = tuple(path.split(".")) if path else ()
+        self.found = False
+        self._buffer = bytearray()
+        self._pos = 0
+        self._offset = 0  # bytes dropped from the front of the buffer
+        self._skeleton = bytearray()
+        self._items = []
+        self._eof = False
+        self._done = False
+        self._parser = self._parse()
+        next(self._parser)
+
+    def feed(self, chunk):
+        """This function decodes the next chunk of the body.
+
+        Args:
+            chunk (bytes): Next bytes of the response.
+
+        Raises:
+            StreamDecodeError: The body is not valid JSON.
+
+        Returns:
+            (list): Elements of the target list completed by this chunk.
+        """
+        if chunk:
+            self._buffer.extend(chunk)
+            self._resume()
+        items, self._items = self._items, []
+        return items
+
+    def close(self):
+        """This function ends the body.
+
+        Raises:
+            StreamDecodeError: The body is truncated or not valid JSON.
+
+        Returns:
+            (list): Elements of the target list completed at the end.
+        """
+        self._eof = True
+        self._resume()
+        if not self._done:
+            raise StreamDecodeError("unexpected end of response")
+        items, self._items = self._items, []
+        return items
+
+    def response(self):
+        """This function decodes the response without the streamed elements.
+
+        Returns:
+            (any): The decoded skeleton (e.g. with `errors`), or None before
+              the body is complete.
+        """
+        if not self._done:
+            return None
+        return orjson.loads(bytes(self._skeleton))
+
+    def _resume(self):
+        if self._done:
+            return
+        try:
+            self._parser.send(None)
+        except StopIteration:
+            self._done = True
+        except orjson.JSONDecodeError as e:
+            raise StreamDecodeError(f"invalid JSON in response: {e}") from None
+
+    # * generator based parser: `yield` waits for the next chunk
+    def _fill(self):
+        if self._eof:
+            raise StreamDecodeError("unexpected end of response")
+        yield
+
+    def _next_byte(self):
+        """Skips whitespace; returns the next byte without consuming it."""
+        while True:
+            self._pos = _WHITESPACE.match(self._buffer, self._pos).end()
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            yield from self._fill()
+
+    def _consume(self, expected=None):
+        byte = yield from self._next_byte()
+        if expected is not None and byte not in expected:
+            raise StreamDecodeError(
+                f"unexpected {chr(byte)!r} in response at byte {self._offset + self._pos}"
+            )
+        self._skeleton.append(byte)
+        self._pos += 1
+        return byte
+
+    def _compact(self):
+        if self._pos < _COMPACT_SIZE:
+            return  # drop consumed bytes in batches, not once per element
+        self._offset += self._pos
+        del self._buffer[: self._pos]
+        self._pos = 0
+
+    def _string_end(self, start):
+        while True:
+            match = _STRING_TAIL.match(self._buffer, start + 1)
+            if match:
+                return match.end()
+            yield from self._fill()
+
+    def _value_end(self, start):
+        """End offset of the JSON value starting at `start`."""
+        buffer = self._buffer
+        first = buffer[start]
+        if first == _QUOTE:
+            return (yield from self._string_end(start))
+        if first not in (_OPEN_OBJECT, _OPEN_LIST):
+            while True:
+                end = _SCALAR.match(buffer, start).end()
+                if end < len(buffer) or self._eof:
+                    if end == start:
+                        raise StreamDecodeError(
+                            f"unexpected {chr(first)!r} in response at byte {self._offset + start}"
+                        )
+                    return end
+                yield from self._fill()
+        position, depth = _container_end(buffer, start, 0)
+        while depth:
+            yield from self._fill()
+            position, depth = _container_end(buffer, position, depth)
+        return position
+
+    def _skip_value(self):
+        yield from self._next_byte()
+        end = yield from self._value_end(self._pos)
+        self._skeleton.extend(self._buffer[self._pos : end])
+        self._pos = end
+
+    def _parse(self):
+        yield
+        yield from self._value(())
+        self._compact()
+
+    def _value(self, path):
+        byte = yield from self._next_byte()
+        if path == self.path and byte == _OPEN_LIST:
+            yield from self._target_list()
+        elif byte == _OPEN_OBJECT and len(path) < len(self.path):
+            yield from self._object(path)
+        else:
+            yield from self._skip_value()
+
+    def _object(self, path):
+        yield from self._consume((_OPEN_OBJECT,))
+        if (yield from self._next_byte()) == _CLOSE_OBJECT:
+            yield from self._consume()
+            return
+        wanted = self.path[len(path)]
+        while True:
+            self._compact()
+            if (yield from self._next_byte()) != _QUOTE:
+                raise StreamDecodeError(
+                    f"expected an object key in response at byte {self._offset + self._pos}"
+                )
+            end = yield from self._string_end(self._pos)
+            key = orjson.loads(bytes(self._buffer[self._pos : end]))
+            self._skeleton.extend(self._buffer[self._pos : end])
+            self._pos = end
+            yield from self._consume((_COLON,))
+            if key == wanted:
+                yield from self._value(path + (key,))
+            else:
+                yield from self._skip_value()
+            if (yield from self._consume((_COMMA, _CLOSE_OBJECT))) == _CLOSE_OBJECT:
+                return
+
+    def _target_list(self):
+        self.found = True
+        yield from self._consume((_OPEN_LIST,))
+        if (yield from self._next_byte()) == _CLOSE_LIST:
+            yield from self._consume()
+            return
+        while True:
+            self._take_buffered_elements()
+            self._compact()
+            yield from self._next_byte()
+            end = yield from self._value_end(self._pos)
+            self._items.append(orjson.loads(bytes(self._buffer[self._pos : end])))
+            self._pos = end
+            byte = yield from self._next_byte()
+            if byte == _CLOSE_LIST:
+                yield from self._consume()
+                return
+            if byte != _COMMA:
+                raise StreamDecodeError(
+                    f"unexpected {chr(byte)!r} in response at byte {self._offset + self._pos}"
+                )
+            self._pos += 1
+
+    def _take_buffered_elements(self):
+        """Fast path of `_target_list`: decodes the list/object elements that
+        are already complete (and followed by a comma) without suspending."""
+        buffer = self._buffer
+        items = self._items
+        while True:
+            self._compact()
+            start = _WHITESPACE.match(buffer, self._pos).end()
+            if start == len(buffer) or buffer[start] not in (_OPEN_OBJECT, _OPEN_LIST):
+                return
+            end, depth = _container_end(buffer, start, 0)
+            if depth:
+                return
+            separator = _WHITESPACE.match(buffer, end).end()
+            if separator == len(buffer) or buffer[separator] != _COMMA:
+                return
+            items.append(orjson.loads(bytes(buffer[start:end])))
+            self._pos = separator + 1
@@ -1,6 +1,25 @@
+from .DocumentParser import parse_document, GraphQLSyntaxError
+
+
 class SubscriptionParser:
+    """This is the SubscriptionParser class, it validates graphql subscription
+    documents."""
+
     def __init__(self, gql_doc):
         self.gql_doc = gql_doc
+        self.document = None
+        self.error = None
 
     def validate(self):
-        return False
+        """This function checks if the document is a valid subscription document.
+
+        Returns:
+            (boolean): Returns if it is valid or not.
+        """
+        try:
+            self.document = parse_document(self.gql_doc)
+        except GraphQLSyntaxError as e:
+            self.error = e
+            return False
+        operations = self.document.operations
+        return bool(operations) and operations[0].operation == "subscription"
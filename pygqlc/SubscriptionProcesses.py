@@ -0,0 +1,349 @@
+"""Subscription callbacks on worker processes
+
+Callbacks that parse and aggregate payloads in Python are bound by the GIL,
+so on threads one socket's traffic never uses more than one core. With
+`GraphQLClient.setSubscriptionProcesses(n)` the websocket router stays in the
+parent and forwards the raw frames of every subscription to one of `n`
+worker processes over a pipe-backed `multiprocessing` queue. A subscription
+always goes to the same process (chosen from its id), so its frames are
+decoded and handled serially and in order there, while different
+subscriptions use different cores.
+
+Callbacks cross the process boundary by reference, so they must be
+importable: a module-level function or a `"module:function"` string.
+"""
+
+import importlib
+import itertools
+import multiprocessing
+import threading
+import traceback
+import zlib
+
+import orjson
+
+# Start method of the worker processes: spawn never forks the router's threads
+DEFAULT_START_METHOD = "spawn"
+
+
+def callable_reference(callback):
+    """This function turns a callback into a reference a worker can import.
+
+    Args:
+        callback (function, string): Module-level function, or a
+          `"module:function"` string.
+
+    Raises:
+        ValueError: The callback can't be imported by name (a lambda, a
+          nested function, a bound method...).
+
+    Returns:
+        (string): The `"module:function"` reference.
+    """
+    if isinstance(callback, str):
+        reference = callback
+    else:
+        module = getattr(callback, "__module__", None)
+        name = getattr(callback, "__qualname__", None)
+        reference = f"{module}:{name}"
+    try:
+        resolved = resolve_callable(reference)
+    except (ImportError, AttributeError, ValueError) as error:
+        raise ValueError(
+            f"subscription processes need an importable callback, got {callback!r}"
+        ) from error
+    if not callable(resolved) or (
+        not isinstance(callback, str) and resolved is not callback
+    ):
+        raise ValueError(
+            f"subscription processes need an importable callback, got {callback!r}"
+        )
+    return reference
+
+
+def resolve_callable(reference):
+    """This function imports the callable named by a `"module:function"`
+    reference.
+
+    Args:
+        reference (string): The reference.
+
+    Returns:
+        (function): The callable.
+    """
+    module_name, _, name = reference.partition(":")
+    if not module_name or not name:
+        raise ValueError(f"expected 'module:function', got {reference!r}")
+    target = importlib.import_module(module_name)
+    for attribute in name.split("."):
+        target = getattr(target, attribute)
+    return target
+
+
+class _RemoteSubscription:
+    """A subscription as its worker process sees it."""
+
+    def __init__(self, callback, on_error, flatten):
+        self.callback = callback
+        self.on_error = on_error
+        self.flatten = flatten
+        self.runs = 0
+
+    def handle(self, raw, client):
+        """Handles one raw frame; returns False when the subscription ends."""
+        try:
+            message = client.decode_frame(raw)
+        except orjson.JSONDecodeError:
+            client.log(client.LogLevel.WARNING, "invalid WSS message, dropped")
+            return True
+        message_type = message.get("type")
+        if message_type == client.ERROR_TYPE:
+            self._error(message, client)
+            return False
+        if message_type == client.COMPLETE_TYPE:
+            return False
+        if message_type != client.NEXT_TYPE:
+            return True
+        if client.is_ws_payloadErrors_msg(message):
+            self._error(message, client)
+        elif not client.is_ws_connection_init_msg(message):
+            data = message.get("payload") or {}
+            try:
+                self.callback(client.data_flatten(data) if self.flatten else data)
+                self.runs += 1
+            except Exception:  # pylint: disable=broad-except
+                client.log(client.LogLevel.ERROR, "Error on subscription callback")
+                client.log(client.LogLevel.ERROR, traceback.format_exc())
+        return True
+
+    def _error(self, message, client):
+        if self.on_error is None:
+            return
+        try:
+            self.on_error(message)
+        except Exception:  # pylint: disable=broad-except
+            client.log(client.LogLevel.ERROR, "Error on subscription error callback")
+            client.log(client.LogLevel.ERROR, traceback.format_exc())
+
+
+def _worker_main(inbox, events):
+    """Loop of a worker process: runs the subscriptions routed to it."""
+    # imported here: it imports this module (and `pygqlc.GraphQLClient` is
+    # shadowed by the class on the package)
+    client = importlib.import_module(".GraphQLClient", __package__)
+
+    subs = {}
+    while True:
+        item = inbox.get()
+        if item is None:
+            break
+        kind, token, *args = item
+        if kind == "start":
+            callback, on_error, flatten = args
+            subs[token] = _RemoteSubscription(
+                resolve_callable(callback),
+                resolve_callable(on_error) if on_error else None,
+                flatten,
+            )
+            continue
+        sub = subs.get(token)
+        if sub is None:
+            continue  # stopped already; late frames are dropped
+        if kind == "frame" and sub.handle(args[0], client):
+            continue
+        del subs[token]  # a stop request, or an error/complete frame
+        events.put(("stopped", token, sub.runs))
+    for token, sub in subs.items():
+        events.put(("stopped", token, sub.runs))
+
+
+class ProcessSubscription:
+    """Parent-side handle of a subscription run by a `SubscriptionProcessPool`.
+
+    Stands in for both the subscription's thread (`start`, `is_alive`,
+    `join`) and its queue (`put`, `close`, `stats`): frames put on it are
+    sent, raw, to its worker process.
+
+    Args:
+        pool (SubscriptionProcessPool): Pool that runs it.
+        token (int): Pool-wide key of the subscription.
+        worker (int): Index of its worker process.
+        start (tuple): Message that starts it on the worker.
+        on_stop (function): Called with the callbacks run once it stopped.
+    """
+
+    def __init__(self, pool, token, worker, start, on_stop):
+        self.pool = pool
+        self.token = token
+        self.worker = worker
+        self.on_stop = on_stop
+        self.closed = False
+        self.forwarded = 0
+        self._start = start
+        self._done = threading.Event()
+
+    def start(self):
+        """Starts the subscription on its worker process."""
+        self.pool.send(self.worker, self._start)
+
+    def put(self, frame, control=False):
+        """This function sends a raw frame to the worker process.
+
+        Args:
+            frame (bytes, string, dict): The frame, as read off the websocket
+              (or decoded, when the router had to decode it).
+            control (bool, optional): Unused (worker queues are unbounded).
+              Defaults to False.
+
+        Returns:
+            (bool): The frame was sent (False once closed).
+        """
+        if self.closed:
+            return False
+        self.pool.send(self.worker, ("frame", self.token, frame))
+        self.forwarded += 1
+        return True
+
+    def stop(self):
+        """Asks the worker to stop the subscription after its queued frames."""
+        if not self.closed:
+            self.closed = True
+            self.pool.send(self.worker, ("stop", self.token))
+
+    def close(self):
+        self.stop()
+
+    def stopped(self, runs):
+        """Called by the pool once the worker stopped the subscription."""
+        self.closed = True
+        self.on_stop(runs)
+        self._done.set()
+
+    def is_alive(self):
+        return not self._done.is_set()
+
+    def join(self, timeout=None):
+        """Waits for the worker to stop the subscription."""
+        self._done.wait(timeout)
+
+    def stats(self):
+        """This function reports the frames sent to the worker.
+
+        Returns:
+            (dict): `forwarded` frames and the `process` index that handles
+              them.
+        """
+        return {"forwarded": self.forwarded, "process": self.worker}
+
+
+class SubscriptionProcessPool:
+    """Fixed-size pool of processes running subscription callbacks.
+
+    Args:
+        processes (int): Number of worker processes.
+        start_method (string, optional): `multiprocessing` start method.
+          Defaults to DEFAULT_START_METHOD.
+    """
+
+    def __init__(self, processes, start_method=DEFAULT_START_METHOD):
+        if processes < 1:
+            raise ValueError("a subscription process pool needs at least 1 process")
+        context = multiprocessing.get_context(start_method)
+        self.processes = processes
+        self._inboxes = [context.Queue() for _ in range(processes)]
+        self._events = context.Queue()
+        self._handles = {}  # token -> ProcessSubscription
+        self._tokens = itertools.count(1)
+        self._lock = threading.Lock()
+        self._closed = False
+        self._workers = [
+            context.Process(
+                target=_worker_main,
+                args=(inbox, self._events),
+                name=f"pygqlc-subscription-process-{n}",
+                daemon=True,
+            )
+            for n, inbox in enumerate(self._inboxes)
+        ]
+        for worker in self._workers:
+            worker.start()
+        self._listener = threading.Thread(
+            target=self._listen, name="pygqlc-subscription-events", daemon=True
+        )
+        self._listener.start()
+
+    def worker_of(self, _id):
+        """This function picks the worker process of a subscription id.
+
+        Args:
+            _id (string): Subscription id.
+
+        Returns:
+            (int): Index of the worker; the same for the same id, so
+              resubscribing keeps a subscription on its process.
+        """
+        return zlib.crc32(str(_id).encode("utf-8")) % self.processes
+
+    def register(self, _id, callback, on_error, flatten, on_stop):
+        """This function creates the handle of a new subscription.
+
+        Args:
+            _id (string): Subscription id.
+            callback (string): Reference of the callback.
+            on_error (string): Reference of the error callback, or None.
+            flatten (bool): Flatten the messages before the callback.
+            on_stop (function): Called in the parent with the callbacks run
+              once the subscription stopped.
+
+        Returns:
+            (ProcessSubscription): The handle (not started yet).
+        """
+        token = next(self._tokens)
+        handle = ProcessSubscription(
+            self,
+            token,
+            self.worker_of(_id),
+            ("start", token, callback, on_error, flatten),
+            on_stop,
+        )
+        with self._lock:
+            self._handles[token] = handle
+        return handle
+
+    def send(self, worker, item):
+        if not self._closed:
+            self._inboxes[worker].put(item)
+
+    def _listen(self):
+        while True:
+            event = self._events.get()
+            if event is None:
+                return
+            _, token, runs = event
+            with self._lock:
+                handle = self._handles.pop(token, None)
+            if handle is not None:
+                handle.stopped(runs)
+
+    def close(self, timeout=None):
+        """This function stops the workers after their queued frames.
+
+        Args:
+            timeout (float, optional): Seconds to wait for each process.
+              Defaults to None.
+        """
+        if self._closed:
+            return
+        for inbox in self._inboxes:
+            inbox.put(None)
+        self._closed = True
+        for worker in self._workers:
+            worker.join(timeout)
+            if worker.is_alive():
+                worker.terminate()
+        self._events.put(None)
+        self._listener.join(timeout)
+        with self._lock:
+            handles, self._handles = list(self._handles.values()), {}
+        for handle in handles:
+            handle.stopped(0)  # its process is gone
@@ -0,0 +1,245 @@
+"""Subscription message queues and callback batches
+
+`SubscriptionQueue` sits between the websocket router thread and the
+dispatch thread of one subscription. It is unbounded unless given a
+`maxsize`; it then holds at most `maxsize` data frames and, once full, its
+`overflow` policy decides what happens to the next one:
+
+- 'block': the router waits for room (backpressure, nothing is lost; the
+  router serves every subscription of the socket, so they all wait).
+- 'drop_oldest': the oldest queued frame is dropped.
+- 'drop_newest': the incoming frame is dropped.
+- 'coalesce': a frame replaces the queued frame with the same
+  `coalesce_key(frame)` (latest value wins), at any depth; when full and
+  nothing matches, the oldest frame is dropped.
+
+Control frames (`error`, `complete`, wake-ups) bypass the limit, so a
+subscription can always be stopped.
+
+`MessageBatch` collects the messages of a subscription subscribed with
+`batch_size`/`batch_window_ms`, so its callback runs once per batch.
+"""
+
+import queue
+import threading
+import time
+from collections import deque
+
+OVERFLOW_POLICIES = ("block", "drop_oldest", "drop_newest", "coalesce")
+
+
+class SubscriptionQueue:
+    """Thread-safe FIFO of subscription frames with an overflow policy.
+
+    Args:
+        maxsize (int, optional): Data frames kept at most. Defaults to None
+          (unbounded).
+        overflow (string, optional): One of OVERFLOW_POLICIES. Defaults to
+          'block'.
+        coalesce_key (function, optional): With 'coalesce', returns the key of
+          a frame (None, or raising, means it is never coalesced). Defaults to
+          None.
+        on_put (function, optional): Called after every queued frame (e.g. to
+          schedule the subscription on a worker pool). Defaults to None.
+
+    Attributes:
+        dropped (int): Frames dropped by the overflow policy.
+        coalesced (int): Frames replaced by a newer one with the same key.
+        high_water (int): Deepest the queue has been.
+    """
+
+    def __init__(
+        self,
+        maxsize=None,
+        overflow="block",
+        coalesce_key=None,
+        on_put=None,
+    ):
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(
+                f"unknown overflow policy {overflow!r}, "
+                f"expected one of {OVERFLOW_POLICIES}"
+            )
+        if overflow == "coalesce" and coalesce_key is None:
+            raise ValueError("overflow='coalesce' requires a coalesce_key")
+        self.maxsize = maxsize
+        self.overflow = overflow
+        self.coalesce_key = coalesce_key
+        self.on_put = on_put
+        self.dropped = 0
+        self.coalesced = 0
+        self.high_water = 0
+        self.closed = False
+        self._items = deque()  # [frame, key] cells, so coalescing swaps in place
+        self._keys = {}  # coalesce key -> its queued cell
+        self._cond = threading.Condition()
+
+    def __len__(self):
+        return len(self._items)
+
+    @property
+    def depth(self):
+        """Frames waiting to be dispatched."""
+        return len(self._items)
+
+    def put(self, message, control=False):
+        """This function enqueues a frame, applying the overflow policy.
+
+        Args:
+            message (any): Frame to enqueue.
+            control (bool, optional): Bypass the limit (error/complete frames
+              and wake-ups). Defaults to False.
+
+        Returns:
+            (bool): The frame was queued (False when dropped or closed).
+        """
+        queued = self._put(message, control)
+        if queued and self.on_put is not None:
+            self.on_put()
+        return queued
+
+    def _put(self, message, control):
+        with self._cond:
+            if self.closed:
+                return False
+            key = None
+            if self.overflow == "coalesce" and not control:
+                key = self._key(message)
+                cell = self._keys.get(key) if key is not None else None
+                if cell is not None:
+                    cell[0] = message
+                    self.coalesced += 1
+                    return True
+            if not control and self.maxsize and len(self._items) >= self.maxsize:
+                if self.overflow == "block":
+                    while len(self._items) >= self.maxsize and not self.closed:
+                        self._cond.wait()
+                    if self.closed:
+                        return False
+                elif self.overflow == "drop_newest":
+                    self.dropped += 1
+                    return False
+                else:  # drop_oldest, coalesce
+                    self._forget(self._items.popleft())
+                    self.dropped += 1
+            cell = [message, key]
+            self._items.append(cell)
+            if key is not None:
+                self._keys[key] = cell
+            self.high_water = max(self.high_water, len(self._items))
+            self._cond.notify_all()
+            return True
+
+    def get(self, block=True, timeout=None):
+        """This function takes the next frame.
+
+        Args:
+            block (bool, optional): Wait for a frame. Defaults to True.
+            timeout (float, optional): Seconds to wait at most. Defaults to
+              None (no limit).
+
+        Raises:
+            queue.Empty: No frame arrived (without `block`, or in time).
+
+        Returns:
+            (any): The oldest queued frame.
+        """
+        with self._cond:
+            if not self._items and block and timeout is not None:
+                self._cond.wait_for(lambda: self._items, timeout)
+            while not self._items:
+                if not block or timeout is not None:
+                    raise queue.Empty
+                self._cond.wait()
+            cell = self._items.popleft()
+            self._forget(cell)
+            self._cond.notify_all()  # room for a blocked put
+            return cell[0]
+
+    def close(self):
+        """This function releases a blocked `put` and rejects later frames."""
+        with self._cond:
+            self.closed = True
+            self._cond.notify_all()
+
+    def _key(self, message):
+        try:
+            return self.coalesce_key(message)
+        except Exception:  # pylint: disable=broad-except
+            return None  # e.g. a frame without the keyed field
+
+    def _forget(self, cell):
+        key = cell[1]
+        if key is not None and self._keys.get(key) is cell:
+            del self._keys[key]
+
+    def stats(self):
+        """This function reports the queue counters.
+
+        Returns:
+            (dict): `depth`, `maxsize`, `overflow`, `dropped`, `coalesced` and
+              `high_water`.
+        """
+        return {
+            "depth": len(self._items),
+            "maxsize": self.maxsize,
+            "overflow": self.overflow,
+            "dropped": self.dropped,
+            "coalesced": self.coalesced,
+            "high_water": self.high_water,
+        }
+
+
+class MessageBatch:
+    """Messages waiting to be handed to a callback together.
+
+    Args:
+        size (int): Messages per batch at most (None: no limit).
+        window (float): Seconds a batch waits for more messages after its
+          first one (None: it is flushed as soon as no more frames are
+          queued).
+    """
+
+    def __init__(self, size=None, window=None):
+        self.size = size
+        self.window = window
+        self.items = []
+        self.deadline = None
+
+    def __len__(self):
+        return len(self.items)
+
+    def add(self, item):
+        """This function adds a message.
+
+        Args:
+            item (any): Message to add.
+
+        Returns:
+            (bool): The batch is full.
+        """
+        if not self.items and self.window is not None:
+            self.deadline = time.monotonic() + self.window
+        self.items.append(item)
+        return self.size is not None and len(self.items) >= self.size
+
+    def remaining(self):
+        """This function reports how long the batch may still wait.
+
+        Returns:
+            (float): Seconds (0 when due), or None when it is empty.
+        """
+        if not self.items:
+            return None
+        if self.deadline is None:
+            return 0
+        return max(0.0, self.deadline - time.monotonic())
+
+    def take(self):
+        """This function empties the batch.
+
+        Returns:
+            (list): The collected messages.
+        """
+        items, self.items, self.deadline = self.items, [], None
+        return items
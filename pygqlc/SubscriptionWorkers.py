@@ -0,0 +1,215 @@
+"""Shared worker threads for subscription callbacks
+
+By default every subscription gets its own dispatch thread. With
+`GraphQLClient.setSubscriptionWorkers(n)` the callbacks of all subscriptions
+run on `n` shared threads instead: a subscription with queued frames is put
+on a ready list once, a worker drains up to `budget` of its frames and puts
+it back at the end of the list if more are waiting. A subscription is never
+on the list twice, so its frames are handled serially and in order, while
+different subscriptions run in parallel.
+
+A subscription that goes idle with a pending batch asks for a wake-up: the
+pool puts it back on the ready list when the batch window ends.
+"""
+
+import heapq
+import itertools
+import queue
+import threading
+import time
+import traceback
+from collections import deque
+
+from pygqlc.logging import log, LogLevel
+
+
+def _log_failure(what):
+    log(LogLevel.ERROR, f"Error {what} on a subscription worker")
+    log(LogLevel.ERROR, traceback.format_exc())
+
+
+class PooledSubscription:
+    """Dispatch handle of one subscription on a `SubscriptionWorkerPool`.
+
+    Stands in for the subscription's thread (`start`, `is_alive`, `join`).
+
+    Args:
+        pool (SubscriptionWorkerPool): Pool that runs it.
+        messages (SubscriptionQueue): Queue of the subscription.
+        step (function): Handles one frame; returns False to stop.
+        stop (function): Called once, on the worker, when the subscription
+          stops.
+        idle (function, optional): Called when its queue runs empty; returns
+          the `time.monotonic()` deadline of a wake-up, or None. Defaults to
+          None.
+    """
+
+    def __init__(self, pool, messages, step, stop, idle=None):
+        self.pool = pool
+        self.messages = messages
+        self.step = step
+        self.stop = stop
+        self.idle = idle
+        self.wake_at = None  # deadline of the pending wake-up
+        self.scheduled = False
+        self._done = threading.Event()
+        self._worker = None  # thread running it right now
+
+    def start(self):
+        """Queued frames are dispatched from now on."""
+        self.schedule()
+
+    def schedule(self):
+        """Puts the subscription on the ready list (called on every put)."""
+        self.pool.schedule(self)
+
+    def is_alive(self):
+        return not self._done.is_set()
+
+    def join(self, timeout=None):
+        """Waits for the subscription to stop (its last callback included);
+        returns at once when called from its own callback."""
+        if self._worker is not threading.current_thread():
+            self._done.wait(timeout)
+
+    def run(self, budget):
+        """Handles up to `budget` frames; returns (alive, wake-up deadline)."""
+        self._worker = threading.current_thread()
+        try:
+            for _ in range(budget):
+                try:
+                    message = self.messages.get(block=False)
+                except queue.Empty:
+                    return True, self._idle()
+                try:
+                    alive = self.step(message)
+                except Exception:  # pylint: disable=broad-except
+                    _log_failure("handling a frame")  # the frame is skipped
+                    continue
+                if not alive:
+                    self.finish()
+                    return False, None
+            return True, None
+        finally:
+            self._worker = None
+
+    def _idle(self):
+        if self.idle is None:
+            return None
+        try:
+            return self.idle()
+        except Exception:  # pylint: disable=broad-except
+            _log_failure("in an idle hook")
+            return None
+
+    def finish(self):
+        """Stops the subscription: runs `stop` once and releases `join`."""
+        if self._done.is_set():
+            return
+        try:
+            self.stop()
+        except Exception:  # pylint: disable=broad-except
+            _log_failure("stopping a subscription")
+        finally:
+            self._done.set()
+
+
+class SubscriptionWorkerPool:
+    """Fixed-size pool of threads running subscription callbacks.
+
+    Args:
+        workers (int): Number of threads.
+        budget (int, optional): Frames of a subscription handled before the
+          worker moves on to the next one. Defaults to 64.
+    """
+
+    def __init__(self, workers, budget=64):
+        if workers < 1:
+            raise ValueError("a subscription worker pool needs at least 1 worker")
+        self.workers = workers
+        self.budget = budget
+        self._ready = deque()
+        self._timers = []  # heap of (deadline, seq, subscription)
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._closed = False
+        self._threads = [
+            threading.Thread(
+                target=self._work, name=f"pygqlc-subscription-{n}", daemon=True
+            )
+            for n in range(workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def schedule(self, sub):
+        """This function marks a subscription as having frames to handle.
+
+        Args:
+            sub (PooledSubscription): The subscription.
+        """
+        with self._cond:
+            self._schedule(sub)
+
+    def _schedule(self, sub):
+        if sub.scheduled or not sub.is_alive():
+            return
+        sub.scheduled = True
+        self._ready.append(sub)
+        self._cond.notify()
+
+    def _fire_timers(self):
+        """Schedules the subscriptions whose wake-up is due; returns the
+        seconds until the next one (None without timers)."""
+        now = time.monotonic()
+        while self._timers and self._timers[0][0] <= now:
+            deadline, _, sub = heapq.heappop(self._timers)
+            if sub.wake_at == deadline:
+                sub.wake_at = None
+                self._schedule(sub)
+        return self._timers[0][0] - now if self._timers else None
+
+    def _work(self):
+        while True:
+            with self._cond:
+                while True:
+                    timeout = self._fire_timers()
+                    if self._ready or self._closed:
+                        break
+                    self._cond.wait(timeout)
+                if not self._ready:
+                    return
+                sub = self._ready.popleft()
+            try:
+                alive, wake_at = sub.run(self.budget)
+            except Exception:  # pylint: disable=broad-except
+                # never lose the worker; the failing subscription ends
+                _log_failure("running a subscription")
+                sub.finish()
+                alive, wake_at = False, None
+            with self._cond:
+                if wake_at is not None and wake_at != sub.wake_at:
+                    sub.wake_at = wake_at
+                    heapq.heappush(self._timers, (wake_at, next(self._seq), sub))
+                    self._cond.notify()  # a waiting worker may need a shorter wait
+                # re-checked under the lock: a put made while we were running
+                # found `scheduled` set and relied on us to pick it up
+                if alive and sub.messages.depth:
+                    self._ready.append(sub)
+                    self._cond.notify()
+                else:
+                    sub.scheduled = False
+
+    def close(self, timeout=None):
+        """This function stops the workers once the ready list is empty.
+
+        Args:
+            timeout (float, optional): Seconds to wait for each worker.
+              Defaults to None.
+        """
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        for thread in self._threads:
+            if thread is not threading.current_thread():
+                thread.join(timeout)
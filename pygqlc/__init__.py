@@ -1,8 +1,10 @@
 from .__version__ import __version__
 from .GraphQLClient import GraphQLClient, GQLResponseException
+from .ConnectionPool import PoolConfig
 from .QueryParser import QueryParser
 from .MutationParser import MutationParser
 from .SubscriptionParser import SubscriptionParser
+from .DocumentParser import GraphQLSyntaxError
 from .helper_modules.Singleton import Singleton
 
 # * Package name:
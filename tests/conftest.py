@@ -1,6 +1,8 @@
 from socket import timeout
+import httpx
 import pytest
-from pygqlc import GraphQLClient  # main package
+from pygqlc import GraphQLClient, PoolConfig  # main package
+from pygqlc.helper_modules.Singleton import Singleton
 
 
 class EnvironmentVariablesException(Exception):
@@ -40,18 +42,14 @@ def gql():
 
     post_timeout_str = os.environ.get("POST_TIMEOUT") or "10"
 
-    import httpx
-
-    no_keepalive = httpx.Limits(max_keepalive_connections=0)
     gql = GraphQLClient()
-    gql.client_params["limits"] = no_keepalive
-    gql.async_client_params["limits"] = no_keepalive
     gql.addEnvironment(
         "dev",
         url=os.environ.get("API"),
         wss=os.environ.get("WSS"),
         headers={"Authorization": os.environ.get("TOKEN")},
         post_timeout=int(post_timeout_str),
+        pool=PoolConfig(max_keepalive_connections=0),
         default=True,
     )
 
@@ -74,3 +72,40 @@ def gql():
     yield gql
     # ! Teardown for GQL fixture
     gql.close()
+
+
+@pytest.fixture
+def make_client():
+    """Factory of hermetic clients: each call builds a fresh GraphQLClient
+    (bypassing the process-wide singleton cache) with a default environment
+    whose requests go to an in-memory server (httpx.MockTransport).
+
+    Args:
+        name (string): Name of the default environment.
+        handler (function, optional): Mock server of the sync and async
+          clients. Defaults to None (no transport: nothing is mocked).
+        async_handler (function, optional): Mock server of the async client
+          only. Defaults to None (`handler`).
+        **environment: Further addEnvironment arguments (url defaults to
+          "http://ex/api").
+    """
+    clients = []
+
+    def make(name, handler=None, async_handler=None, **environment):
+        Singleton._instances.pop(GraphQLClient, None)
+        gql = GraphQLClient()
+        environment.setdefault("url", "http://ex/api")
+        gql.addEnvironment(name, default=True, **environment)
+        if handler is not None:
+            gql.client_params["transport"] = httpx.MockTransport(handler)
+        if handler is not None or async_handler is not None:
+            gql.async_client_params["transport"] = httpx.MockTransport(
+                async_handler or handler
+            )
+        clients.append(gql)
+        return gql
+
+    yield make
+    for gql in clients:
+        gql._close()
+    Singleton._instances.pop(GraphQLClient, None)
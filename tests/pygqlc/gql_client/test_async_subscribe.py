@@ -0,0 +1,127 @@
+"""async_subscribe multiplexes every async subscription over ONE asyncio
+websocket (graphql-transport-ws) and resubscribes after a reconnect.
+
+Hermetic: a local `websockets` server plays the GraphQL gateway."""
+
+import asyncio
+
+import orjson
+import pytest
+
+pytest.importorskip("websockets")
+from websockets.asyncio.server import serve  # noqa: E402
+
+from pygqlc import GraphQLClient  # noqa: E402
+from pygqlc.helper_modules.Singleton import Singleton  # noqa: E402
+
+
+class _FakeGateway:
+    """Acks connection_init and answers every `subscribe` with `messages`
+    `next` frames; can drop the connection after the first of them."""
+
+    def __init__(self, messages=2, drop_first_connection=False):
+        self.messages = messages
+        self.drop_first_connection = drop_first_connection
+        self.connections = 0
+        self.subscribes = []
+        self.completes = []
+
+    async def handler(self, ws):
+        self.connections += 1
+        connection = self.connections
+        async for raw in ws:
+            frame = orjson.loads(raw)
+            if frame["type"] == "connection_init":
+                await ws.send(orjson.dumps({"type": "connection_ack"}))
+            elif frame["type"] == "subscribe":
+                self.subscribes.append((connection, frame["id"]))
+                for n in range(self.messages):
+                    payload = {"data": {"authorCreated": {"id": n, "conn": connection}}}
+                    await ws.send(
+                        orjson.dumps(
+                            {"id": frame["id"], "type": "next", "payload": payload}
+                        )
+                    )
+                    if self.drop_first_connection and connection == 1:
+                        await ws.close()
+                        return
+            elif frame["type"] == "complete":
+                self.completes.append(frame["id"])
+
+
+@pytest.fixture
+def client():
+    Singleton._instances.pop(GraphQLClient, None)
+    gql = GraphQLClient()
+    yield gql
+    Singleton._instances.pop(GraphQLClient, None)
+
+
+async def _start_gateway(client, gateway):
+    server = await serve(gateway.handler, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    client.addEnvironment(
+        "async-ws", url="http://ex", wss=f"ws://127.0.0.1:{port}", default=True
+    )
+    return server
+
+
+@pytest.mark.asyncio
+async def test_async_subscribe_iterates_messages(client):
+    gateway = _FakeGateway(messages=2)
+    server = await _start_gateway(client, gateway)
+    try:
+        sub = await client.async_subscribe("subscription { authorCreated { id conn } }")
+        first = await asyncio.wait_for(anext(sub), 5)
+        second = await asyncio.wait_for(anext(sub), 5)
+        await sub.unsubscribe()
+        assert [first, second] == [{"id": 0, "conn": 1}, {"id": 1, "conn": 1}]
+        assert sub.runs == 2
+        await asyncio.sleep(0.05)
+        assert gateway.completes == [sub.id]
+    finally:
+        await client.async_close_subscriptions()
+        server.close()
+        await server.wait_closed()
+
+
+@pytest.mark.asyncio
+async def test_async_subscriptions_share_one_socket(client):
+    gateway = _FakeGateway(messages=1)
+    server = await _start_gateway(client, gateway)
+    received = []
+    done = asyncio.Event()
+
+    async def on_message(message):
+        received.append(message)
+        if len(received) == 3:
+            done.set()
+
+    try:
+        for _ in range(3):
+            await client.async_subscribe("subscription { a }", callback=on_message)
+        await asyncio.wait_for(done.wait(), 5)
+        assert gateway.connections == 1, "all async subscriptions share ONE socket"
+        assert [_id for _, _id in gateway.subscribes] == ["1", "2", "3"]
+    finally:
+        await client.async_close_subscriptions()
+        server.close()
+        await server.wait_closed()
+
+
+@pytest.mark.asyncio
+async def test_async_subscribe_resubscribes_after_reconnect(client):
+    gateway = _FakeGateway(messages=1, drop_first_connection=True)
+    server = await _start_gateway(client, gateway)
+    try:
+        sub = await client.async_subscribe("subscription { a }")
+        first = await asyncio.wait_for(anext(sub), 5)
+        second = await asyncio.wait_for(anext(sub), 5)
+        assert first["conn"] == 1 and second["conn"] == 2
+        assert gateway.subscribes == [(1, sub.id), (2, sub.id)], (
+            "the subscription is resent with the same id on the new connection"
+        )
+    finally:
+        await client.async_close_subscriptions()
+        server.close()
+        await server.wait_closed()
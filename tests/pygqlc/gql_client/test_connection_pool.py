@@ -0,0 +1,186 @@
+"""Per-environment connection pool settings (PoolConfig)."""
+
+import asyncio
+import threading
+import time
+
+import httpx
+import pytest
+
+from pygqlc import PoolConfig
+from pygqlc.ConnectionPool import pool_stats
+
+
+@pytest.fixture
+def client(make_client):
+    return make_client("pool-test", post_timeout=5)
+
+
+def serve(gql, delay=0.0):
+    """Mocks the server, recording the most requests seen in flight at once."""
+    gql.in_flight = gql.peak = 0
+    lock = threading.Lock()
+
+    def handler(request):
+        with lock:
+            gql.in_flight += 1
+            gql.peak = max(gql.peak, gql.in_flight)
+        time.sleep(delay)
+        with lock:
+            gql.in_flight -= 1
+        return httpx.Response(200, json={"data": {"ok": True}})
+
+    async def async_handler(request):
+        gql.in_flight += 1
+        gql.peak = max(gql.peak, gql.in_flight)
+        await asyncio.sleep(delay)
+        gql.in_flight -= 1
+        return httpx.Response(200, json={"data": {"ok": True}})
+
+    gql.client_params["transport"] = httpx.MockTransport(handler)
+    gql.async_client_params["transport"] = httpx.MockTransport(async_handler)
+
+
+def test_pool_settings_reach_the_clients_and_template(client):
+    client.setPool(
+        pool=PoolConfig(
+            max_connections=7,
+            max_keepalive_connections=3,
+            keepalive_expiry=2.0,
+            http2=False,
+            connect_timeout=1.5,
+            pool_timeout=0.5,
+        )
+    )
+    for params in client._environment_params("pool-test"):
+        assert params["limits"] == httpx.Limits(
+            max_connections=7, max_keepalive_connections=3, keepalive_expiry=2.0
+        )
+        assert params["http2"] is False
+    assert client._request_environment().timeout == httpx.Timeout(
+        5.0, connect=1.5, pool=0.5
+    )
+    assert client._async_concurrency_limit() == 7
+
+
+def test_environments_own_isolated_clients(client):
+    client.addEnvironment("small", url="http://ex/small", pool=PoolConfig(10, 1))
+    client.addEnvironment("v4", url="http://ex/v4", ipv4_only=True)
+    first = client._get_http_client()
+    client.setEnvironment("small")
+    small = client._get_http_client()
+    client.setEnvironment("v4")
+    v4 = client._get_http_client()
+    client.setEnvironment("pool-test")
+    assert client._get_http_client() is first  # switching back rebuilds nothing
+    assert len({id(first), id(small), id(v4)}) == 3
+    assert not any(http.is_closed for http in (first, small, v4))
+    assert client._pools["small"].client_params["limits"].max_connections == 10
+    assert "transport" in client._pools["v4"].client_params
+    assert "transport" not in client._pools["pool-test"].client_params
+
+
+def test_changing_an_environments_pool_replaces_only_its_clients(client):
+    client.addEnvironment("other", url="http://ex/other")
+    first = client._get_http_client()
+    other = client._environment_pool("other").client()
+    client.addEnvironment("pool-test", url="http://ex/api")  # same settings
+    assert client._get_http_client() is first
+    client.addEnvironment("pool-test", pool=PoolConfig(max_connections=3))
+    assert first.is_closed and not other.is_closed
+    assert client._get_http_client() is not first
+
+
+def test_shared_client_is_used_by_every_thread(client):
+    client.setPool(pool=PoolConfig(shared_client=True))
+    seen = []
+    threads = [
+        threading.Thread(target=lambda: seen.append(client._get_http_client()))
+        for _ in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert all(other is seen[0] for other in seen)
+    assert client.pool_stats()["pool-test"]["sync"]["clients"] == 1
+
+
+def test_idle_pools_are_reaped_and_recreated(client):
+    serve(client)
+    client.addEnvironment("other", url="http://ex/other")
+    client.query("query { ok }")
+    idle = client._get_http_client()
+    client._pools["pool-test"].last_used -= 600
+    client._environment_pool("other").client()
+    client._next_reap = 0  # due now
+    client.query("query { ok }")
+    assert idle.is_closed
+    assert set(client.pool_stats()) == {"pool-test", "other"}
+    assert sorted(client.close_idle_pools()) == ["other", "pool-test"]
+    assert client.pool_stats() == {}
+
+
+def test_a_pool_in_use_is_closed_after_its_last_request(client):
+    pool = client._environment_pool()
+    http = pool.client()
+    with pool.using():
+        assert pool.retire() is False
+        assert not http.is_closed
+    assert http.is_closed
+
+
+def test_max_streams_caps_requests_in_flight(client):
+    client.setPool(pool=PoolConfig(http2_max_streams=2))
+    serve(client, delay=0.02)
+    results = client.query_many([("query { ok }", {"n": n}) for n in range(8)])
+    assert all(errors == [] for _, errors in results)
+    assert client.peak == 2
+
+
+@pytest.mark.asyncio
+async def test_max_streams_caps_async_requests_in_flight(client):
+    client.setPool(pool=PoolConfig(http2_max_streams=3))
+    serve(client, delay=0.01)
+    results = await client.async_query_many(
+        [("query { ok }", {"n": n}) for n in range(10)]
+    )
+    assert all(errors == [] for _, errors in results)
+    assert client.peak == 3
+    await client._drop_async_client()
+
+
+def test_pool_stats_reports_an_unused_pool():
+    http = httpx.Client(limits=httpx.Limits(max_connections=5))
+    assert pool_stats(http, max_connections=5) == {
+        "connections": 0,
+        "active": 0,
+        "idle": 0,
+        "max_connections": 5,
+    }
+    http.close()
+    assert pool_stats(http)["connections"] == 0
+
+
+def test_pool_counts_requests_in_flight_and_waiting_for_a_slot(client):
+    client.setPool(pool=PoolConfig(http2_max_streams=1))
+    pool = client._environment_pool()
+    release = threading.Event()
+
+    def request():
+        with pool.using(), pool.slot():
+            release.wait(5)
+
+    threads = [threading.Thread(target=request) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    deadline = time.monotonic() + 5
+    while pool.pending < 2 and time.monotonic() < deadline:
+        time.sleep(0.001)
+    stats = client.pool_stats()["pool-test"]
+    assert (stats["in_flight"], stats["pending"]) == (3, 2)
+    release.set()
+    for thread in threads:
+        thread.join()
+    stats = client.pool_stats()["pool-test"]
+    assert (stats["in_flight"], stats["pending"]) == (0, 0)
@@ -0,0 +1,108 @@
+"""Streaming decode: list elements are yielded while the body is received.
+
+The mock server sends the body in small chunks."""
+
+import httpx
+import orjson
+import pytest
+
+from pygqlc import GQLResponseException
+from pygqlc.StreamDecoder import StreamDecodeError, StreamingListDecoder
+
+QUERY = "query { measurements { id value } }"
+RESPONSE = {
+    "errors": [{"message": 'tricky "]}' + "\\"}],
+    "data": {
+        "other": [{"a": "]"}],
+        "measurements": [{"id": i, "value": [i, {"s": '"]}{['}]} for i in range(50)]
+        + [1, "x", None, []],
+    },
+}
+
+
+def _chunks(raw, size):
+    return [raw[i : i + size] for i in range(0, len(raw), size)]
+
+
+@pytest.mark.parametrize("size", [1, 7, 4096])
+def test_decoder_yields_elements_across_chunk_boundaries(size):
+    decoder = StreamingListDecoder("data.measurements")
+    items = []
+    for chunk in _chunks(orjson.dumps(RESPONSE, option=orjson.OPT_INDENT_2), size):
+        items += decoder.feed(chunk)
+    items += decoder.close()
+    assert items == RESPONSE["data"]["measurements"]
+    assert decoder.found
+    skeleton = decoder.response()
+    assert skeleton["errors"] == RESPONSE["errors"]
+    assert skeleton["data"] == {"other": [{"a": "]"}], "measurements": []}
+
+
+def test_decoder_yields_before_the_body_ends():
+    decoder = StreamingListDecoder("data.rows")
+    assert decoder.feed(b'{"data": {"rows": [{"id": 1}, {"id": 2}, {"id"') == [
+        {"id": 1},
+        {"id": 2},
+    ]
+    with pytest.raises(StreamDecodeError):
+        decoder.close()  # truncated
+
+
+def test_decoder_missing_path_and_invalid_json():
+    decoder = StreamingListDecoder("data.rows")
+    assert decoder.feed(b'{"data": null}') + decoder.close() == []
+    assert not decoder.found
+    with pytest.raises(StreamDecodeError):
+        StreamingListDecoder("data.rows").feed(b'{"data": {"rows": [1 2]}}')
+
+
+def _body(payload):
+    return _chunks(orjson.dumps(payload), 16)
+
+
+class _AsyncBody(httpx.AsyncByteStream):
+    def __init__(self, chunks):
+        self.chunks = chunks
+
+    async def __aiter__(self):
+        for chunk in self.chunks:
+            yield chunk
+
+
+@pytest.fixture
+def client(make_client):
+    payload = {"data": {"measurements": [{"id": i} for i in range(100)]}}
+
+    def handler(request):
+        return httpx.Response(200, content=iter(_body(payload)))
+
+    async def async_handler(request):
+        return httpx.Response(200, stream=_AsyncBody(_body(payload)))
+
+    return make_client("stream-test", handler, async_handler)
+
+
+def test_execute_stream(client):
+    rows = list(client.execute_stream(QUERY, path="data.measurements"))
+    assert rows == [{"id": i} for i in range(100)]
+
+
+def test_execute_stream_raises_response_errors(client):
+    payload = {"data": {"measurements": [{"id": 1}]}, "errors": [{"message": "x"}]}
+    client.client_params["transport"] = httpx.MockTransport(
+        lambda request: httpx.Response(200, content=iter(_body(payload)))
+    )
+    stream = client.execute_stream(QUERY, path="data.measurements")
+    assert next(stream) == {"id": 1}
+    with pytest.raises(GQLResponseException):
+        next(stream)
+
+
+@pytest.mark.asyncio
+async def test_async_execute_stream(client):
+    rows = [
+        row
+        async for row in client.async_execute_stream(QUERY, path="data.measurements")
+    ]
+    assert rows == [{"id": i} for i in range(100)]
+    await client.async_cleanup()
@@ -0,0 +1,96 @@
+"""Automatic Persisted Queries: hash-only requests, registration on a miss."""
+
+import hashlib
+
+import httpx
+import orjson
+import pytest
+
+QUERY = "query { authors { id } }"
+MUTATION = "mutation { createAuthor(name: 1) { successful } }"
+
+
+class _ApqServer:
+    def __init__(self, supported=True):
+        self.supported = supported
+        self.store = {}
+        self.requests = []
+
+    def __call__(self, request):
+        if request.method == "GET":
+            body = {
+                key: orjson.loads(value) for key, value in request.url.params.items()
+            }
+        else:
+            body = orjson.loads(request.content)
+        self.requests.append((request.method, body))
+        persisted = (body.get("extensions") or {}).get("persistedQuery")
+        if persisted and not self.supported:
+            errors = [{"message": "PersistedQueryNotSupported"}]
+            return httpx.Response(200, json={"errors": errors})
+        query = body.get("query")
+        if persisted:
+            digest = persisted["sha256Hash"]
+            if query is None:
+                if digest not in self.store:
+                    errors = [
+                        {
+                            "message": "PersistedQueryNotFound",
+                            "extensions": {"code": "PERSISTED_QUERY_NOT_FOUND"},
+                        }
+                    ]
+                    return httpx.Response(200, json={"errors": errors})
+                query = self.store[digest]
+            else:
+                assert hashlib.sha256(query.encode()).hexdigest() == digest
+                self.store[digest] = query
+        return httpx.Response(200, json={"data": {"echo": query}})
+
+
+@pytest.fixture
+def server():
+    return _ApqServer()
+
+
+@pytest.fixture
+def client(make_client, server):
+    return make_client("apq-test", server, persisted_queries=True)
+
+
+def test_registers_on_miss_then_sends_hash_only(client, server):
+    assert client.execute(QUERY) == {"data": {"echo": QUERY}}
+    assert client.execute(QUERY) == {"data": {"echo": QUERY}}
+    sent = [("query" in body) for _, body in server.requests]
+    assert sent == [False, True, False]  # miss, register, hit
+
+
+def test_get_for_queries_only(client, server):
+    client.setPersistedQueries(enabled=True, use_get=True)
+    client.execute(QUERY)
+    client.execute(QUERY, {"n": 1})
+    client.execute(MUTATION)
+    methods = [method for method, _ in server.requests]
+    assert methods == ["GET", "POST", "GET", "POST", "POST"]
+    assert server.requests[2][1]["variables"] == {"n": 1}
+
+
+def test_unsupported_server_disables_apq(client):
+    server = _ApqServer(supported=False)
+    client.client_params["transport"] = httpx.MockTransport(server)
+    assert client.execute(QUERY) == {"data": {"echo": QUERY}}
+    assert client.execute(QUERY) == {"data": {"echo": QUERY}}
+    assert len(server.requests) == 3
+    assert not client.environments["apq-test"]["persisted_queries"]
+
+
+def test_re_registration_keeps_apq_setting(client):
+    client.addEnvironment("apq-test", url="http://other/api")
+    assert client.environments["apq-test"]["persisted_queries"]
+
+
+@pytest.mark.asyncio
+async def test_async_execute_uses_persisted_queries(client, server):
+    assert await client.async_execute(QUERY) == {"data": {"echo": QUERY}}
+    assert await client.async_execute(QUERY) == {"data": {"echo": QUERY}}
+    assert len(server.requests) == 3
+    await client.async_cleanup()
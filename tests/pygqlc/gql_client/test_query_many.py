@@ -0,0 +1,129 @@
+"""Concurrent fan-out: bounded, lazily-consumed, results in request order.
+
+execute/async_execute are replaced by an in-memory fake server."""
+
+import asyncio
+import threading
+import time
+
+import httpx
+import pytest
+
+
+@pytest.fixture
+def client(make_client):
+    return make_client("many-test", url="http://ex")
+
+
+class _FakeServer:
+    def __init__(self):
+        self.in_flight = 0
+        self.peak = 0
+
+    async def async_execute(self, query, variables=None):
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        # later requests finish first, to exercise ordering
+        await asyncio.sleep(0.001 * (10 - variables["n"]))
+        self.in_flight -= 1
+        if variables["n"] == 3:
+            return {"data": None, "errors": [{"message": "boom"}]}
+        return {"data": {"author": {"id": variables["n"], "name": "x"}}}
+
+
+@pytest.mark.asyncio
+async def test_async_query_many_bounded_and_ordered(client, monkeypatch):
+    server = _FakeServer()
+    monkeypatch.setattr(client, "async_execute", server.async_execute)
+    requests = [("query { author { id name } }", {"n": n}) for n in range(10)]
+
+    results = await client.async_query_many(requests, max_concurrency=3)
+
+    assert server.peak == 3
+    assert [data["id"] for data, _ in results if data] == [
+        0, 1, 2, 4, 5, 6, 7, 8, 9
+    ]  # fmt: skip
+    assert results[3] == (None, [{"message": "boom"}])
+
+
+@pytest.mark.asyncio
+async def test_async_query_as_completed_yields_in_completion_order(client, monkeypatch):
+    server = _FakeServer()
+    monkeypatch.setattr(client, "async_execute", server.async_execute)
+    requests = (("query { author { id name } }", {"n": n}) for n in range(5))
+
+    order = [
+        index
+        async for index, _ in client.async_query_as_completed(
+            requests, max_concurrency=5
+        )
+    ]
+
+    assert order == [4, 3, 2, 1, 0]
+
+
+@pytest.mark.asyncio
+async def test_async_mutate_many_reports_messages(client, monkeypatch):
+    async def async_execute(mutation, variables=None):
+        return {
+            "data": {
+                "createAuthor": {
+                    "successful": variables["ok"],
+                    "messages": [] if variables["ok"] else [{"message": "taken"}],
+                }
+            }
+        }
+
+    monkeypatch.setattr(client, "async_execute", async_execute)
+    results = await client.async_mutate_many(
+        [
+            ("mutation { createAuthor { successful } }", {"ok": ok})
+            for ok in (True, False)
+        ]
+    )
+    assert results[0][1] == []
+    assert results[1][1] == [{"message": "taken"}]
+
+
+def test_async_concurrency_limit_follows_pool_limits(client):
+    assert client._async_concurrency_limit() == 100
+    client.async_client_params["limits"] = httpx.Limits(max_connections=7)
+    assert client._async_concurrency_limit() == 7
+
+
+def test_query_many_runs_on_worker_pool_in_order(client, monkeypatch):
+    threads = set()
+
+    def execute(query, variables=None):
+        threads.add(threading.current_thread().name)
+        time.sleep(0.001 * (10 - variables["n"]))
+        return {"data": {"author": {"id": variables["n"], "name": "x"}}}
+
+    monkeypatch.setattr(client, "execute", execute)
+    client.setMaxWorkers(4)
+    requests = [("query { author { id name } }", {"n": n}) for n in range(10)]
+
+    results = client.query_many(requests)
+
+    assert [data["id"] for data, _ in results] == list(range(10))
+    assert 1 < len(threads) <= 4
+    assert all(name.startswith("pygqlc") for name in threads)
+    executor = client._executor
+    client.query_many(requests)
+    assert client._executor is executor, "the worker pool is reused across batches"
+    client._close()
+    assert client._executor is None
+
+
+def test_mutate_many_reports_errors(client, monkeypatch):
+    def execute(mutation, variables=None):
+        if variables["fail"]:
+            raise httpx.ReadTimeout("")
+        return {"data": {"createAuthor": {"successful": True, "messages": []}}}
+
+    monkeypatch.setattr(client, "execute", execute)
+    results = client.mutate_many(
+        [("mutation { createAuthor { successful } }", {"fail": f}) for f in (0, 1)]
+    )
+    assert results[0][1] == []
+    assert "ReadTimeout" in results[1][1][0]["message"]
@@ -0,0 +1,134 @@
+"""query_pages / async_query_pages stream rows page by page.
+
+execute/async_execute are replaced by an in-memory fake server."""
+
+import asyncio
+
+import pytest
+
+from pygqlc import GQLResponseException
+
+ROWS = [{"id": i, "name": f"author-{i}"} for i in range(7)]
+
+OFFSET_QUERY = """
+  query Authors($limit: Int!, $offset: Int!){
+    authors(limit: $limit, offset: $offset){ id name }
+  }
+"""
+
+CURSOR_QUERY = """
+  query Authors($first: Int!, $after: String){
+    authors(first: $first, after: $after){
+      edges{ node{ id name } }
+      pageInfo{ endCursor hasNextPage }
+    }
+  }
+"""
+
+
+def offset_server(_query, variables):
+    start = variables["offset"]
+    return {"data": {"authors": ROWS[start : start + variables["limit"]]}}
+
+
+def cursor_server(_query, variables):
+    start = int(variables["after"] or 0)
+    end = start + variables["first"]
+    return {
+        "data": {
+            "authors": {
+                "edges": [{"node": row} for row in ROWS[start:end]],
+                "pageInfo": {"endCursor": str(end), "hasNextPage": end < len(ROWS)},
+            }
+        }
+    }
+
+
+@pytest.fixture
+def client(make_client):
+    return make_client("pages-test", url="http://ex")
+
+
+def test_query_pages_offset(client, monkeypatch):
+    calls = []
+
+    def execute(query, variables=None):
+        calls.append(dict(variables))
+        return offset_server(query, variables)
+
+    monkeypatch.setattr(client, "execute", execute)
+    pages = client.query_pages(OFFSET_QUERY, page_size=3)
+    assert calls == [], "pages are fetched lazily"
+    assert list(pages) == ROWS
+    assert [c["offset"] for c in calls] == [0, 3, 6]
+    assert all(c["limit"] == 3 for c in calls)
+
+
+def test_query_pages_cursor(client, monkeypatch):
+    calls = []
+
+    def execute(query, variables=None):
+        calls.append(dict(variables))
+        return cursor_server(query, variables)
+
+    monkeypatch.setattr(client, "execute", execute)
+    rows = list(client.query_pages(CURSOR_QUERY, page_size=3, paginate="cursor"))
+    assert rows == ROWS
+    assert [c["after"] for c in calls] == [None, "3", "6"]
+
+
+def test_query_pages_keeps_other_variables(client, monkeypatch):
+    calls = []
+
+    def execute(query, variables=None):
+        calls.append(dict(variables))
+        return offset_server(query, variables)
+
+    monkeypatch.setattr(client, "execute", execute)
+    list(client.query_pages(OFFSET_QUERY, {"active": True}, page_size=10))
+    assert calls == [{"active": True, "limit": 10, "offset": 0}]
+
+
+def test_query_pages_raises_on_errors(client, monkeypatch):
+    monkeypatch.setattr(
+        client,
+        "execute",
+        lambda q, v=None: {"data": None, "errors": [{"message": "x"}]},
+    )
+    with pytest.raises(GQLResponseException):
+        list(client.query_pages(OFFSET_QUERY))
+
+
+@pytest.mark.asyncio
+async def test_async_query_pages_prefetches_next_page(client, monkeypatch):
+    requested = []
+
+    async def async_execute(query, variables=None):
+        requested.append(variables["offset"])
+        await asyncio.sleep(0)
+        return offset_server(query, variables)
+
+    monkeypatch.setattr(client, "async_execute", async_execute)
+    rows = []
+    async for row in client.async_query_pages(OFFSET_QUERY, page_size=3):
+        if not rows:
+            await asyncio.sleep(0)  # caller busy with page 1...
+            assert requested == [0, 3], "...while page 2 is already in flight"
+        rows.append(row)
+    assert rows == ROWS
+    assert requested == [0, 3, 6]
+
+
+@pytest.mark.asyncio
+async def test_async_query_pages_cursor(client, monkeypatch):
+    async def async_execute(query, variables=None):
+        return cursor_server(query, variables)
+
+    monkeypatch.setattr(client, "async_execute", async_execute)
+    rows = [
+        row
+        async for row in client.async_query_pages(
+            CURSOR_QUERY, page_size=2, paginate="cursor"
+        )
+    ]
+    assert rows == ROWS
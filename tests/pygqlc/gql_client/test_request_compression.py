@@ -0,0 +1,76 @@
+"""Opt-in request body compression with a size threshold.
+
+The mock server decodes `Content-Encoding` bodies."""
+
+import gzip
+
+import httpx
+import orjson
+import pytest
+
+MUTATION = "mutation($rows: [MeasurementInput]){ createMeasurements(rows: $rows) { successful } }"
+BIG_ROWS = [{"sensorId": i % 10, "value": i * 0.5} for i in range(2000)]
+
+
+class _Server:
+    def __init__(self):
+        self.requests = []
+
+    def __call__(self, request):
+        encoding = request.headers.get("content-encoding")
+        raw = request.content
+        body = gzip.decompress(raw) if encoding == "gzip" else raw
+        self.requests.append((encoding, len(raw), orjson.loads(body)))
+        return httpx.Response(200, json={"data": {"ok": True}})
+
+
+@pytest.fixture
+def server():
+    return _Server()
+
+
+@pytest.fixture
+def client(make_client, server):
+    return make_client("compress-test", server, compression="gzip")
+
+
+def test_large_bodies_are_compressed(client, server):
+    assert client.execute(MUTATION, {"rows": BIG_ROWS}) == {"data": {"ok": True}}
+    encoding, size, body = server.requests[0]
+    assert encoding == "gzip"
+    assert body == {"query": MUTATION, "variables": {"rows": BIG_ROWS}}
+    assert size < len(orjson.dumps(body)) / 4
+
+
+def test_small_bodies_are_sent_as_is(client, server):
+    client.execute(MUTATION, {"rows": BIG_ROWS[:2]})
+    encoding, _, body = server.requests[0]
+    assert encoding is None
+    assert body["variables"] == {"rows": BIG_ROWS[:2]}
+
+
+def test_compression_settings(client, server):
+    client.setCompression(compression=None)
+    client.execute(MUTATION, {"rows": BIG_ROWS})
+    assert server.requests[-1][0] is None
+    client.setCompression(compression="gzip", threshold=0)
+    client.execute(MUTATION, {"rows": BIG_ROWS[:2]})
+    assert server.requests[-1][0] == "gzip"
+    with pytest.raises(ValueError):
+        client.addEnvironment("compress-test", compression="brotli")
+
+
+@pytest.mark.asyncio
+async def test_async_execute_compresses(client, server):
+    await client.async_execute(MUTATION, {"rows": BIG_ROWS})
+    assert server.requests[0][0] == "gzip"
+    await client.async_cleanup()
+
+
+def test_zstd():
+    zstandard = pytest.importorskip("zstandard")
+    from pygqlc.GraphQLClient import compress_body
+
+    body = orjson.dumps({"rows": BIG_ROWS})
+    compressed = compress_body(body, "zstd")
+    assert zstandard.ZstdDecompressor().decompress(compressed) == body
@@ -0,0 +1,84 @@
+"""Request bodies are encoded with orjson (`encode_json`), not stdlib json."""
+
+import dataclasses
+import datetime
+import decimal
+import uuid
+
+import httpx
+import orjson
+import pytest
+
+from pygqlc.GraphQLClient import encode_json, subscribe_frame
+
+
+@dataclasses.dataclass
+class _Row:
+    sensor: str
+    value: float
+
+
+@pytest.fixture
+def client(make_client):
+    sent = []
+
+    def handler(request):
+        sent.append(orjson.loads(request.content))
+        return httpx.Response(200, json={"data": {"ok": True}})
+
+    gql = make_client("encoding-test", handler)
+    gql.sent = sent
+    return gql
+
+
+def test_encode_json_types():
+    value = {
+        "at": datetime.datetime(2026, 1, 2, 3, 4, 5, tzinfo=datetime.timezone.utc),
+        "row": _Row("s1", 1.5),
+        "amount": decimal.Decimal("10.25"),
+        "tags": {"a"},
+        "id": uuid.UUID(int=1),
+        1: "int key",
+    }
+    assert orjson.loads(encode_json(value)) == {
+        "at": "2026-01-02T03:04:05+00:00",
+        "row": {"sensor": "s1", "value": 1.5},
+        "amount": "10.25",
+        "tags": ["a"],
+        "id": "00000000-0000-0000-0000-000000000001",
+        "1": "int key",
+    }
+    with pytest.raises(TypeError):
+        encode_json({"x": object()})
+
+
+def test_encode_json_numpy():
+    numpy = pytest.importorskip("numpy")
+    assert encode_json({"v": numpy.arange(3)}) == b'{"v":[0,1,2]}'
+
+
+def test_execute_sends_orjson_body(client):
+    day = datetime.date(2026, 1, 2)
+    client.execute(
+        "mutation($d: Date){ f(d: $d) { id } }", {"d": day, "r": _Row("a", 1)}
+    )
+    assert client.sent[0]["variables"] == {
+        "d": "2026-01-02",
+        "r": {"sensor": "a", "value": 1},
+    }
+
+
+@pytest.mark.asyncio
+async def test_async_execute_sends_orjson_body(client):
+    await client.async_execute(
+        "query($d: Date){ f(d: $d) { id } }", {"d": datetime.date(2026, 1, 2)}
+    )
+    assert client.sent[0]["variables"] == {"d": "2026-01-02"}
+    await client.async_cleanup()
+
+
+def test_subscribe_frame_variables():
+    frame = subscribe_frame(
+        "1", {"query": "q", "variables": {"d": datetime.date(2026, 1, 2)}}
+    )
+    assert orjson.loads(frame)["payload"]["variables"] == {"d": "2026-01-02"}
@@ -0,0 +1,71 @@
+"""Environments are compiled into request templates, rebuilt on changes."""
+
+import httpx
+import pytest
+
+
+@pytest.fixture
+def client(make_client):
+    sent = []
+
+    def handler(request):
+        sent.append(request)
+        return httpx.Response(200, json={"data": {"ok": True}})
+
+    gql = make_client(
+        "template-test", handler, headers={"Authorization": "a"}, post_timeout=5
+    )
+    gql.sent = sent
+    return gql
+
+
+def test_template_is_reused_until_the_environment_changes(client):
+    template = client._request_environment()
+    assert client._request_environment() is template
+    assert template.headers["Authorization"] == "a"
+    assert template.headers["Content-Type"] == "application/json"
+    assert template.timeout == httpx.Timeout(5.0)
+    client.addHeader(header={"Authorization": "b"})
+    assert client._request_environment() is not template
+    client.setUrl(url="http://other/api")
+    client.setPostTimeout(post_timeout=9)
+    template = client._request_environment()
+    assert (template.url, template.headers["Authorization"]) == (
+        "http://other/api",
+        "b",
+    )
+    assert template.timeout == httpx.Timeout(9.0)
+
+
+def test_requests_use_the_current_template(client):
+    client.execute("query { ok }")
+    client.addHeader(header={"X-Plant": "7"})
+    client.addEnvironment("template-test", url="http://ex/v2")
+    client.execute("query { ok }")
+    first, second = client.sent
+    assert "x-plant" not in first.headers
+    assert second.headers["x-plant"] == "7"
+    assert str(second.url) == "http://ex/v2"
+    assert second.headers["authorization"] == "a"
+
+
+def test_missing_environment(client):
+    client.environment = "nope"
+    with pytest.raises(Exception, match="without setting an environment"):
+        client.execute("query { ok }")
+
+
+def test_direct_environment_changes_are_picked_up(client):
+    client.execute("query { ok }")
+    env = client.environments["template-test"]
+    env["headers"] = {"X-Old": "1"}
+    client.execute("query { ok }")
+    env["headers"]["X-Old"] = "2"
+    env["url"] = "http://ex/v3"
+    client.execute("query { ok }")
+    first, second, third = client.sent
+    assert first.headers["authorization"] == "a"
+    assert "authorization" not in second.headers
+    assert second.headers["x-old"] == "1"
+    assert third.headers["x-old"] == "2"
+    assert str(third.url) == "http://ex/v3"
@@ -0,0 +1,111 @@
+"""Query response cache: TTL, LRU budgets, invalidation, async miss collapsing."""
+
+import asyncio
+import time
+
+import httpx
+import orjson
+import pytest
+
+from pygqlc.ResponseCache import ResponseCache, cache_key
+
+QUERY = "query($n: Int){ author(n: $n) { id name } }"
+MUTATION = "mutation { createAuthor(name: 1) { successful } }"
+
+
+class _Server:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, request):
+        self.calls += 1
+        body = orjson.loads(request.content)
+        n = (body.get("variables") or {}).get("n")
+        if n == -1:
+            return httpx.Response(200, json={"errors": [{"message": "boom"}]})
+        return httpx.Response(200, json={"data": {"author": {"id": n, "name": "x"}}})
+
+    async def handle_async_request(self, request):
+        await asyncio.sleep(0.01)
+        return self(request)
+
+
+@pytest.fixture
+def server():
+    return _Server()
+
+
+@pytest.fixture
+def client(make_client, server):
+    return make_client("cache-test", server, server.handle_async_request, cache_ttl=60)
+
+
+def test_cache_key_canonicalizes_variables():
+    assert cache_key("e", "q", {"a": 1, "b": 2}) == cache_key(
+        "e", "q", {"b": 2, "a": 1}
+    )
+    assert cache_key("e", "q", {"a": object()}) is None
+
+
+def test_response_cache_lru_and_budgets():
+    cache = ResponseCache(max_entries=2, max_bytes=10)
+    cache.set("a", b"1234", 60)
+    cache.set("b", b"1234", 60)
+    assert cache.get("a") == b"1234"  # a is now the most recent
+    cache.set("c", b"1234", 60)  # over 10 bytes: evicts b
+    assert cache.get("b") is None
+    assert (len(cache), cache.size, cache.evictions) == (2, 8, 1)
+    cache.set("big", b"x" * 11, 60)
+    assert cache.get("big") is None
+
+
+def test_response_cache_ttl():
+    cache = ResponseCache()
+    cache.set("a", b"1", 0.01)
+    time.sleep(0.02)
+    assert cache.get("a") is None
+    assert cache.size == 0
+
+
+def test_query_is_served_from_cache(client, server):
+    first = client.query(QUERY, {"n": 1})
+    first[0]["name"] = "mutated by the caller"
+    assert client.query(QUERY, {"n": 1}) == ({"id": 1, "name": "x"}, [])
+    assert server.calls == 1
+    client.query(QUERY, {"n": 2})
+    assert server.calls == 2
+    assert client.response_cache.hits == 1
+
+
+def test_errors_and_mutations_are_not_cached(client, server):
+    client.query(QUERY, {"n": -1})
+    client.query(QUERY, {"n": -1})
+    client.query(MUTATION)
+    client.query(MUTATION)
+    assert server.calls == 4
+
+
+def test_per_call_ttl_and_invalidation(client, server):
+    client.setCacheTtl(cache_ttl=None)
+    client.query(QUERY, {"n": 1})
+    client.query(QUERY, {"n": 1})
+    assert server.calls == 2
+    client.query(QUERY, {"n": 1}, cache_ttl=30)
+    client.query(QUERY, {"n": 1}, cache_ttl=30)
+    assert server.calls == 3
+    assert client.invalidateCache(QUERY, {"n": 1}) == 1
+    client.query(QUERY, {"n": 1}, cache_ttl=30)
+    assert server.calls == 4
+    assert client.invalidateCache() == 1
+
+
+@pytest.mark.asyncio
+async def test_async_query_collapses_concurrent_misses(client, server):
+    results = await asyncio.gather(
+        *(client.async_query(QUERY, {"n": 1}) for _ in range(20))
+    )
+    assert all(result == ({"id": 1, "name": "x"}, []) for result in results)
+    assert server.calls == 1
+    assert client.query(QUERY, {"n": 1}) == ({"id": 1, "name": "x"}, [])
+    assert server.calls == 1  # the sync path shares the cache
+    await client.async_cleanup()
@@ -0,0 +1,145 @@
+"""Identical in-flight queries share one request; mutations never do."""
+
+import asyncio
+import threading
+import time
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from pygqlc.SingleFlight import SingleFlight
+
+QUERY = "query { lines { id } }"
+MUTATION = "mutation { createLine(name: 1) { successful } }"
+
+
+class _SlowServer:
+    def __init__(self):
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, request):
+        with self._lock:
+            self.calls += 1
+        time.sleep(0.05)
+        return httpx.Response(200, json={"data": {"lines": [{"id": 1}]}})
+
+    async def handle_async_request(self, request):
+        self.calls += 1
+        await asyncio.sleep(0.05)
+        return httpx.Response(200, json={"data": {"lines": [{"id": 1}]}})
+
+
+@pytest.fixture
+def server():
+    return _SlowServer()
+
+
+@pytest.fixture
+def client(make_client, server):
+    return make_client("flight-test", server, server.handle_async_request)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_async_queries_share_one_request(client, server):
+    results = await asyncio.gather(*(client.async_query(QUERY) for _ in range(50)))
+    assert server.calls == 1
+    assert all(result == ([{"id": 1}], []) for result in results)
+    results[0][0].append("mutated by one caller")
+    assert results[1][0] == [{"id": 1}]  # every caller decodes its own copy
+    await asyncio.gather(*(client.async_mutate(MUTATION) for _ in range(3)))
+    assert server.calls == 4
+    await client.async_cleanup()
+
+
+def test_concurrent_sync_queries_share_one_request(client, server):
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(client.query(QUERY)))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(results) == 8
+    assert server.calls == 1
+    assert client.single_flight.shared == 7
+    assert len(client.single_flight) == 0
+
+
+@pytest.mark.asyncio
+async def test_single_flight_can_be_disabled(client, server):
+    client.addEnvironment("flight-test", single_flight=False)
+    await asyncio.gather(*(client.async_query(QUERY) for _ in range(3)))
+    assert server.calls == 3
+    await client.async_cleanup()
+
+
+def test_single_flight_limit_and_errors():
+    flight = SingleFlight(limit=1)
+    started = threading.Event()
+    release = threading.Event()
+
+    def slow():
+        started.set()
+        release.wait()
+        return "a"
+
+    thread = threading.Thread(target=lambda: flight.do("env", "a", slow))
+    thread.start()
+    started.wait()
+    # over the limit for "env": runs on its own instead of being tracked
+    assert flight.do("env", "b", lambda: "b") == "b"
+    assert len(flight) == 1
+    release.set()
+    thread.join()
+
+    def boom():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        flight.do("env", "a", boom)
+    assert len(flight) == 0
+
+
+def test_uncontended_queries_skip_serialization(client, server):
+    with patch("pygqlc.GraphQLClient.cache_key") as canonical:
+        for n in range(3):
+            client.query(f"query {{ lines(first: {n}) {{ id }} }}", {"n": n})
+    assert not canonical.called
+    assert server.calls == 3 and len(client.single_flight) == 0
+
+
+def test_concurrent_identical_mutations_are_never_shared(client, server):
+    start = threading.Barrier(2)
+    results = []
+
+    def mutate():
+        start.wait()
+        results.append(client.mutate(MUTATION))
+
+    threads = [threading.Thread(target=mutate) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(results) == 2
+    assert server.calls == 2 and client.single_flight.shared == 0
+    assert len(client.single_flight) == 0
+
+
+def test_only_equal_variables_share_a_request(client, server):
+    results = []
+    variables = [{"n": 1}, {"n": 1}, {"n": True}, {"n": 1.0}, {"n": 2}, {"n": 2}]
+    threads = [
+        threading.Thread(target=lambda v=v: results.append(client.query(QUERY, v)))
+        for v in variables
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(results) == 6
+    assert server.calls == 4 and client.single_flight.shared == 2
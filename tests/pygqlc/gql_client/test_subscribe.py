@@ -2,12 +2,15 @@ from . import subscriptions as subs
 from . import mutations as muts
 import types
 import time
+import os
 
 import threading
 from contextlib import contextmanager
 from unittest.mock import MagicMock, patch
 
+import orjson
 import pytest
+import websocket
 
 from pygqlc import GraphQLClient
 from pygqlc.helper_modules.Singleton import Singleton
@@ -366,3 +369,438 @@ def test_multiple_subscriptions_share_one_connection():
     )
     gql.closing = True
     Singleton._instances.pop(GraphQLClient, None)
+
+
+def _next_frame(_id, payload):
+    return orjson.dumps({"id": _id, "type": "next", "payload": payload})
+
+
+def test_routed_frame_reaches_callback_without_polling(routing_client):
+    """Dispatch is event-driven: a frame read off the socket is handed to the
+    blocked subscription thread straight away, with no poll sleep on either side
+    (poll_interval is set absurdly high to prove it is not used)."""
+    gql = routing_client
+    gql.poll_interval = 60
+    received = []
+    delivered = threading.Event()
+
+    def on_message(msg):
+        received.append(msg)
+        delivered.set()
+
+    frames = iter(
+        [_next_frame("1", {"data": {"authorCreated": {"id": 7, "name": "Ada"}}})]
+    )
+
+    def _recv():
+        try:
+            return next(frames)
+        except StopIteration:
+            delivered.wait(5)
+            gql.closing = True
+            raise websocket.WebSocketTimeoutException()
+
+    gql._conn.recv.side_effect = _recv
+    with patch.object(gql, "_start"):
+        unsub = gql.subscribe(
+            "subscription { authorCreated { id } }", callback=on_message
+        )
+    _run_routing_loop(gql)
+
+    assert delivered.wait(5), "callback was not invoked"
+    started = time.time()
+    unsub()
+    assert time.time() - started < 1, "unsubscribe must wake the idle thread at once"
+    assert received == [{"id": 7, "name": "Ada"}]
+
+
+def test_unsubscribe_wakes_idle_subscription_thread(routing_client):
+    """An idle subscription thread blocks on its queue; unsubscribing must wake
+    it so the join returns immediately."""
+    gql = routing_client
+    gql.poll_interval = 60
+    with patch.object(gql, "_start"):
+        unsub = gql.subscribe("subscription { a }", callback=lambda _m: None)
+    thread = gql.subs["1"]["thread"]
+    unsub()
+    assert not thread.is_alive()
+    assert gql.subs["1"]["running"] is False
+
+
+def test_full_queue_drops_oldest_frames_of_a_slow_subscription(routing_client):
+    """A subscription whose callback can't keep up keeps only `max_queue`
+    frames with the drop_oldest policy; the router never blocks on it and the
+    complete frame still gets through."""
+    gql = routing_client
+    release = threading.Event()
+    received = []
+
+    def on_message(msg):
+        release.wait(5)
+        received.append(msg)
+
+    frames = iter(
+        [_next_frame("1", {"data": {"m": {"n": n}}}) for n in range(6)]
+        + [orjson.dumps({"id": "1", "type": "complete"})]
+    )
+
+    def _recv():
+        try:
+            return next(frames)
+        except StopIteration:
+            gql.closing = True
+            raise websocket.WebSocketTimeoutException()
+
+    gql._conn.recv.side_effect = _recv
+    with patch.object(gql, "_start"):
+        gql.subscribe(
+            "subscription { m { n } }",
+            callback=on_message,
+            max_queue=2,
+            overflow="drop_oldest",
+        )
+    thread = gql.subs["1"]["thread"]
+    _run_routing_loop(gql)
+    stats = gql.subscription_stats()["1"]
+    release.set()
+    thread.join(5)
+
+    assert stats["maxsize"] == 2 and stats["dropped"] >= 3
+    assert received[-2:] == [4, 5]
+    assert len(received) == 6 - stats["dropped"]
+
+
+def test_default_queue_is_unbounded_and_never_blocks_the_router(routing_client):
+    """Without max_queue a slow callback only grows its own queue: the router
+    reads every frame without waiting for it."""
+    gql = routing_client
+    release = threading.Event()
+    received = []
+
+    def on_message(msg):
+        release.wait(5)
+        received.append(msg)
+
+    frames = iter([_next_frame("1", {"data": {"m": {"n": n}}}) for n in range(50)])
+
+    def _recv():
+        try:
+            return next(frames)
+        except StopIteration:
+            gql.closing = True
+            raise websocket.WebSocketTimeoutException()
+
+    gql._conn.recv.side_effect = _recv
+    with patch.object(gql, "_start"):
+        gql.subscribe("subscription { m { n } }", callback=on_message)
+    thread = gql.subs["1"]["thread"]
+    _run_routing_loop(gql)
+    stats = gql.subscription_stats()["1"]
+    release.set()
+    gql.subs["1"]["queue"].put(orjson.dumps({"id": "1", "type": "complete"}))
+    thread.join(5)
+
+    assert stats["maxsize"] is None and stats["dropped"] == 0
+    assert stats["high_water"] >= 49
+    assert received == list(range(50)) and not thread.is_alive()
+
+
+def test_worker_pool_runs_callbacks_in_order_without_a_thread_per_sub(
+    routing_client,
+):
+    """With setSubscriptionWorkers, subscriptions share the pool's threads and
+    each one still sees its frames in order."""
+    gql = routing_client
+    gql.setSubscriptionWorkers(2)
+    received = {"1": [], "2": [], "3": []}
+    threads = set()
+    done = threading.Event()
+
+    def on_message(_id):
+        def callback(msg):
+            threads.add(threading.current_thread().name)
+            received[_id].append(msg)
+            if all(len(values) == 20 for values in received.values()):
+                done.set()
+
+        return callback
+
+    frames = iter(
+        [
+            _next_frame(_id, {"data": {"m": n}})
+            for n in range(20)
+            for _id in ("1", "2", "3")
+        ]
+    )
+
+    def _recv():
+        try:
+            return next(frames)
+        except StopIteration:
+            done.wait(5)
+            gql.closing = True
+            raise websocket.WebSocketTimeoutException()
+
+    gql._conn.recv.side_effect = _recv
+    before = threading.active_count()
+    with patch.object(gql, "_start"):
+        for _id in received:
+            gql.subscribe("subscription { m }", callback=on_message(_id))
+    assert threading.active_count() - before == 2  # the pool, not one per sub
+    _run_routing_loop(gql)
+
+    assert all(values == list(range(20)) for values in received.values())
+    assert threads <= {"pygqlc-subscription-0", "pygqlc-subscription-1"}
+    with patch.object(gql, "_start"), patch.object(gql, "_stop"):
+        gql._resubscribe_all()
+        assert threading.active_count() - before == 2
+        for sub in list(gql.subs.values()):
+            sub["unsub"]()
+    gql._close_sub_worker_pools()
+
+
+def _batched_frames(gql, frames, done):
+    frames = iter(frames)
+
+    def _recv():
+        try:
+            return next(frames)
+        except StopIteration:
+            done.wait(5)
+            gql.closing = True
+            raise websocket.WebSocketTimeoutException()
+
+    gql._conn.recv.side_effect = _recv
+
+
+def test_batched_callback_gets_lists_and_error_flushes_first(routing_client):
+    """With batch_size the callback gets lists of messages; an error frame
+    hands over the pending partial batch before the error callback runs."""
+    gql = routing_client
+    calls = []
+    done = threading.Event()
+
+    def on_error(msg):
+        calls.append(("error", msg["type"]))
+        done.set()
+
+    _batched_frames(
+        gql,
+        [_next_frame("1", {"data": {"m": n}}) for n in range(7)]
+        + [orjson.dumps({"id": "1", "type": "error", "payload": []})],
+        done,
+    )
+    with patch.object(gql, "_start"):
+        gql.subscribe(
+            "subscription { m }",
+            callback=calls.append,
+            on_error_callback=on_error,
+            batch_size=3,
+            batch_window_ms=10_000,  # only size and the error flush
+        )
+    thread = gql.subs["1"]["thread"]
+    _run_routing_loop(gql)
+    thread.join(5)
+
+    assert calls == [[0, 1, 2], [3, 4, 5], [6], ("error", "error")]
+    assert gql.subs["1"]["runs"] == 3
+
+
+def test_batch_window_flushes_on_the_worker_pool(routing_client):
+    """On the worker pool a partial batch is handed over once its window
+    ends, and complete flushes whatever is still pending."""
+    gql = routing_client
+    gql.setSubscriptionWorkers(1)
+    calls = []
+    first = threading.Event()
+    done = threading.Event()
+    frames = [_next_frame("1", {"data": {"m": n}}) for n in range(2)]
+
+    def on_batch(batch):
+        calls.append(batch)
+        first.set()
+
+    def _recv():
+        if frames:
+            return frames.pop(0)
+        if not first.wait(5):
+            raise AssertionError("window never ended")
+        if not done.is_set():
+            done.set()
+            return _next_frame("1", {"data": {"m": 2}})
+        if len(calls) == 1:
+            return orjson.dumps({"id": "1", "type": "complete"})
+        gql.closing = True
+        raise websocket.WebSocketTimeoutException()
+
+    gql._conn.recv.side_effect = _recv
+    with patch.object(gql, "_start"):
+        gql.subscribe(
+            "subscription { m }",
+            callback=on_batch,
+            batch_size=100,
+            batch_window_ms=30,
+        )
+    handle = gql.subs["1"]["thread"]
+    _run_routing_loop(gql)
+    handle.join(5)
+    gql._close_sub_worker_pools()
+
+    assert calls == [[0, 1], [2]]
+
+
+def test_batch_size_must_be_positive(routing_client):
+    with pytest.raises(ValueError):
+        routing_client.subscribe("subscription { m }", batch_size=0)
+
+
+def record_in_process(msg):
+    """Importable callback for subscription processes."""
+    path = os.path.join(os.environ["PYGQLC_TEST_OUT"], str(msg["sub"]))
+    with open(path, "a", encoding="utf-8") as out:
+        out.write(f"{msg['n']} {os.getpid()}\n")
+
+
+def test_subscription_processes_get_raw_frames_in_order(
+    routing_client, tmp_path, monkeypatch
+):
+    """With setSubscriptionProcesses the router forwards raw frames; each
+    subscription is handled in order on one worker process."""
+    monkeypatch.setenv("PYGQLC_TEST_OUT", str(tmp_path))
+    gql = routing_client
+    gql.setSubscriptionProcesses(2)
+    frames = iter(
+        [
+            _next_frame(_id, {"data": {"m": {"sub": _id, "n": n}}})
+            for n in range(20)
+            for _id in ("1", "2", "3")
+        ]
+        + [orjson.dumps({"id": "3", "type": "complete"})]
+    )
+
+    def _recv():
+        try:
+            return next(frames)
+        except StopIteration:
+            gql.closing = True
+            raise websocket.WebSocketTimeoutException()
+
+    gql._conn.recv.side_effect = _recv
+    with patch.object(gql, "_start"):
+        with pytest.raises(ValueError):
+            gql.subscribe("subscription { m }", callback=lambda msg: None)
+        unsubs = [
+            gql.subscribe("subscription { m }", callback=record_in_process)
+            for _ in range(3)
+        ]
+    handles = [sub["thread"] for sub in gql.subs.values()]
+    _run_routing_loop(gql)
+    handles[-1].join(30)  # stopped by its complete frame
+    assert gql.subs["3"]["running"] is False and gql.subs["3"]["runs"] == 20
+    with patch.object(gql, "_stop"):
+        for unsub in unsubs[:2]:
+            unsub()
+    gql._close_sub_worker_pools()
+
+    for _id in ("1", "2", "3"):
+        lines = (tmp_path / _id).read_text().split()
+        assert [int(n) for n in lines[::2]] == list(range(20))
+        assert len(set(lines[1::2])) == 1 and lines[1] != str(os.getpid())
+    assert all(not handle.is_alive() for handle in handles)
+
+
+def test_router_routes_raw_frames_and_decodes_once(routing_client):
+    """The router reads only the id and type: frames of unknown or killed
+    subscriptions are never decoded, the others once, by their consumer."""
+    gql = routing_client
+    received = []
+    done = threading.Event()
+    big = {"data": {"m": {"values": list(range(1000))}}}
+    frames = iter(
+        [
+            _next_frame("1", big),
+            _next_frame("99", big),  # unknown id
+            _next_frame("2", big),  # killed
+            _next_frame("1", {"data": {"m": 1}}),
+        ]
+    )
+
+    def _recv():
+        try:
+            return next(frames)
+        except StopIteration:
+            done.wait(5)
+            gql.closing = True
+            raise websocket.WebSocketTimeoutException()
+
+    def on_message(msg):
+        received.append(msg)
+        if len(received) == 2:
+            done.set()
+
+    gql._conn.recv.side_effect = _recv
+    with patch.object(gql, "_start"):
+        gql.subscribe("subscription { m }", callback=on_message)
+        gql.subscribe("subscription { m }", callback=on_message)
+    killed = gql.subs["2"]
+    killed["kill"] = True  # not woken: the router may still see it
+    thread = gql.subs["1"]["thread"]
+    decoded = []
+    loads = orjson.loads
+
+    def counting_loads(raw):
+        decoded.append(raw)
+        return loads(raw)
+
+    with patch("pygqlc.GraphQLClient.orjson.loads", side_effect=counting_loads):
+        _run_routing_loop(gql)
+        assert done.wait(5)
+    with patch.object(gql, "_stop"):
+        gql._unsubscribe("1")
+    gql._wake_subscription(killed)
+    thread.join(5)
+    killed["thread"].join(5)
+
+    assert received == [list(range(1000)), 1]
+    assert [orjson.loads(raw)["id"] for raw in decoded] == ["1", "1"]
+
+
+def test_raising_error_callback_does_not_take_down_the_worker_pool(routing_client):
+    """A subscription whose on_error_callback raises keeps running, and so do
+    the other subscriptions on the shared worker."""
+    gql = routing_client
+    gql.setSubscriptionWorkers(1)
+    received = []
+    done = threading.Event()
+
+    def on_error(msg):
+        raise RuntimeError("error callback failed")
+
+    def on_message(msg):
+        received.append(msg)
+        if len(received) == 2:
+            done.set()
+
+    errors = {"data": None, "errors": [{"message": "boom"}]}
+    _batched_frames(
+        gql,
+        [
+            _next_frame("1", errors),
+            _next_frame("2", {"data": {"m": 1}}),
+            _next_frame("1", {"data": {"m": 2}}),
+        ],
+        done,
+    )
+    with patch.object(gql, "_start"):
+        gql.subscribe(
+            "subscription { m }", callback=on_message, on_error_callback=on_error
+        )
+        gql.subscribe("subscription { m }", callback=on_message)
+    _run_routing_loop(gql)
+
+    assert done.wait(5) and sorted(received) == [1, 2]
+    assert all(thread.is_alive() for thread in gql._sub_worker_pool._threads)
+    with patch.object(gql, "_stop"):
+        for sub in list(gql.subs.values()):
+            sub["unsub"]()
+    gql._close_sub_worker_pools()
@@ -0,0 +1,23 @@
+# * Valid mutations
+m_short = 'mutation { createAuthor(name: "Baruc") { successful } }'
+m_alias_vars = """
+  mutation CreateAuthor(
+    $name: String!
+    $tags: [String!] = ["new"]
+  ){
+    createAuthor(name: $name, tags: $tags){
+      successful
+      messages { field message }
+    }
+  }
+"""
+m_block_string = '''
+  mutation {
+    createPost(body: """multi-line
+    body with $notAVariable and a \\""" quote"""){ id }
+  }
+'''
+# ! Wrong mutation (unbalanced brackets)
+m_bad_brackets = "mutation { createAuthor(name: 1) { id }"
+# ! Wrong mutation (missing argument value)
+m_bad_argument = "mutation { createAuthor(name: ) { id } }"
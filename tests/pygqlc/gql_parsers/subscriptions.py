@@ -0,0 +1,12 @@
+# * Valid subscriptions
+s_short = "subscription { authorCreated { id name } }"
+s_vars = """
+  subscription AuthorUpdated($id: ID!){
+    authorUpdated(id: $id){
+      successful
+      result { id name }
+    }
+  }
+"""
+# ! Wrong subscription (no selection)
+s_bad_no_selection = "subscription AuthorCreated"
@@ -0,0 +1,122 @@
+import time
+
+import pytest
+
+from . import mutations as m
+from . import queries as q
+from . import subscriptions as s
+from pygqlc import MutationParser, SubscriptionParser
+from pygqlc.DocumentParser import (
+    GraphQLSyntaxError,
+    parse_document,
+    tokenize,
+)
+
+
+def test_tokenize_ignores_whitespace_commas_and_comments():
+    tokens = tokenize("{ a, b # comment\n c }")
+    assert [t.value for t in tokens] == ["{", "a", "b", "c", "}", ""]
+
+
+def test_tokenize_strings_and_numbers():
+    tokens = tokenize('"x\\"y" """block "quoted" \\""" text""" -1.5e3 ...')
+    assert [t.kind for t in tokens[:-1]] == [
+        "string",
+        "block_string",
+        "number",
+        "punctuator",
+    ]
+
+
+def test_tokenize_rejects_unknown_characters():
+    with pytest.raises(GraphQLSyntaxError) as error:
+        tokenize("{ a % }")
+    assert error.value.position == 4
+
+
+def test_parse_operation_metadata():
+    operation = parse_document(m.m_alias_vars).operations[0]
+    assert operation.operation == "mutation"
+    assert operation.name == "CreateAuthor"
+    assert [(v.name, v.type, v.default) for v in operation.variable_definitions] == [
+        ("name", "String!", None),
+        ("tags", "[String!]", '["new"]'),
+    ]
+
+
+def test_parse_fragments_and_directives():
+    document = parse_document(
+        """
+        query($full: Boolean!){
+          authors { ...AuthorFields  ... on Author @include(if: $full) { bio } }
+        }
+        fragment AuthorFields on Author { id name }
+        """
+    )
+    assert len(document.definitions) == 2
+    assert document.definitions[1].name == "AuthorFields"
+
+
+def test_mutation_parser_extracts_content():
+    parser = MutationParser(m.m_alias_vars)
+    assert parser.parse()
+    assert parser.alias == "CreateAuthor"
+    assert parser.content.startswith("createAuthor(name: $name, tags: $tags){")
+    assert parser.content.endswith("}")
+    assert parser.variable_definitions == {
+        "name": ("String!", None),
+        "tags": ("[String!]", '["new"]'),
+    }
+
+
+def test_mutation_parser_accepts_block_strings():
+    assert MutationParser(m.m_block_string).validate()
+
+
+@pytest.mark.parametrize("doc", [m.m_bad_brackets, m.m_bad_argument, q.q_short])
+def test_mutation_parser_rejects(doc):
+    assert not MutationParser(doc).validate()
+
+
+def test_subscription_parser():
+    assert SubscriptionParser(s.s_short).validate()
+    assert SubscriptionParser(s.s_vars).validate()
+    assert not SubscriptionParser(s.s_bad_no_selection).validate()
+    assert not SubscriptionParser(q.q_short).validate()
+
+
+def test_parser_is_linear_on_large_and_malformed_documents():
+    fields = " ".join(f"f{i}(a: {{b: [1, 2]}}) {{ id name }}" for i in range(20000))
+    large = f"query {{ {fields} }}"
+    started = time.perf_counter()
+    assert parse_document(large).operations[0].operation == "query"
+    with pytest.raises(GraphQLSyntaxError):
+        parse_document(large[:-1])  # unterminated: used to backtrack for ages
+    assert time.perf_counter() - started < 5
+
+
+def test_parse_document_is_cached_by_text():
+    parse_document.cache_clear()
+    doc = "mutation($name: String!){ createAuthor(name: $name){ successful } }"
+    first = parse_document(doc)
+    assert parse_document(doc) is first
+    info = parse_document.cache_info()
+    assert (info.hits, info.misses) == (1, 1)
+    for _ in range(3):
+        with pytest.raises(GraphQLSyntaxError):
+            parse_document("query { a")
+    assert parse_document.cache_info().misses == 2
+
+
+def test_operation_records_variable_references():
+    doc = 'mutation($a: Int = 1){ f(a: $a, s: "$b") @include(if: $c) { id } }'
+    operation = parse_document(doc).operations[0]
+    assert [name for _, _, name in operation.variable_references] == ["a", "c"]
+    start, end, _ = operation.variable_references[0]
+    assert doc[start:end] == "$a"
+
+
+def test_mutation_parser_substitutes_content_variables():
+    mp = MutationParser('mutation{ f(a: $a, s: "$a") { id } }')
+    assert mp.parse()
+    assert mp.substitute_variables(lambda name: "1") == 'f(a: 1, s: "$a") { id }'
@@ -91,19 +91,19 @@ def test_validate_q_short_bad_brackets():
     assert not parser.validate(), '"q_short_bad_brackets" should be an INVALID query'
 
 
-# TODO: Better regex (this tests are not passing, but it's not the scope of the current features to validate them)
-# * Currently, the regex it's only used for extraction of tokens, it is not a fully functional GraphQL validator
-# ! def test_validate_q_short_bad_no_content():
-# !   parser = QueryParser(q.q_short_bad_no_content)
-# !   assert not parser.validate(), '"q_short_bad_no_content" should be an INVALID query'
-
-# ! def test_validate_q_short_bad_no_name():
-# !   parser = QueryParser(q.q_short_bad_no_name)
-# !   assert not parser.validate(), '"q_short_bad_no_name" should be an INVALID query'
-
-# ! def test_validate_q_short_bad_no_params():
-# !   parser = QueryParser(q.q_short_bad_no_params)
-# !   assert not parser.validate(), '"q_short_bad_no_params" should be an INVALID query'
+def test_validate_q_short_bad_no_content():
+    parser = QueryParser(q.q_short_bad_no_content)
+    assert not parser.validate(), '"q_short_bad_no_content" should be an INVALID query'
+
+
+def test_validate_q_short_bad_no_name():
+    parser = QueryParser(q.q_short_bad_no_name)
+    assert not parser.validate(), '"q_short_bad_no_name" should be an INVALID query'
+
+
+def test_validate_q_short_bad_no_params():
+    parser = QueryParser(q.q_short_bad_no_params)
+    assert not parser.validate(), '"q_short_bad_no_params" should be an INVALID query'
 
 
 def test_validate_q_long_bad_no_vars():
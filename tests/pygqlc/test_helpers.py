@@ -1,4 +1,6 @@
-from pygqlc.GraphQLClient import safe_pop
+import orjson
+
+from pygqlc.GraphQLClient import data_flatten, read_frame_header, safe_pop
 from pygqlc.helper_modules.Singleton import Singleton
 
 
@@ -45,3 +47,54 @@ def test_singleton_cannot_be_instantiated_twice():
     # Third call: no cached instance, so create one
     third_instance = UselessLetterClass()
     assert first_instance is not third_instance, "Should be a different instance"
+
+
+def test_data_flatten_single_keys():
+    data = {"authors": [{"id": 1}, {"id": 2}]}
+    assert data_flatten(data) == [{"id": 1}, {"id": 2}]
+
+
+def test_data_flatten_is_zero_copy():
+    rows = [{"id": 1, "name": "a"}, {"id": 2, "name": "b"}]
+    assert data_flatten({"data": {"authors": rows}}) is rows, (
+        "flattening must walk the decoded response in place, not copy it"
+    )
+
+
+def test_data_flatten_single_child():
+    assert data_flatten({"authors": [{"id": 1, "name": "a"}]}, single_child=True) == {
+        "id": 1,
+        "name": "a",
+    }
+    assert data_flatten({"authors": []}, single_child=True) is None
+    assert data_flatten({"authors": []}) == []
+
+
+def test_data_flatten_non_serializable_values():
+    marker = object()
+    assert data_flatten({"value": marker}) is marker
+    assert data_flatten(None) is None
+
+
+def test_read_frame_header_skips_the_payload():
+    payload = b',"payload":{"data":{"m":{"id":"nested","type":"x"}}}}'
+    assert read_frame_header(b'{"id":"7","type":"next"' + payload) == (
+        "7",
+        "next",
+        None,
+    )
+    assert read_frame_header('{ "type" : "complete", "id" : "7" }') == (
+        "7",
+        "complete",
+        None,
+    )
+    assert read_frame_header('{"type":"pong"}') == (None, "pong", None)
+
+
+def test_read_frame_header_decodes_other_frames_in_full():
+    frame = {"payload": {"data": {"id": "nested"}}, "id": "7", "type": "next"}
+    assert read_frame_header(orjson.dumps(frame)) == ("7", "next", frame)
+    escaped = '{"id":"a\\"b","type":"next"}'
+    assert read_frame_header(escaped)[0] == 'a"b'
+    assert read_frame_header(b"null") == (None, None, None)
+    assert read_frame_header(b"[1]") == (None, None, [1])
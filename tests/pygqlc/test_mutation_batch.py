@@ -0,0 +1,170 @@
+import re
+from unittest.mock import MagicMock
+
+import pytest
+
+from pygqlc import GraphQLClient
+from pygqlc.MutationBatch import MutationBatch, InvalidMutationException
+from pygqlc.helper_modules.Singleton import Singleton
+from .gql_client import mutations as muts
+
+
+def test_batch_binds_declared_variables():
+    batch = MutationBatch(label="mut")
+    batch.append(muts.create_author, {"name": "Elon", "lastName": "Musk"})
+    batch.append(muts.create_author, {"name": "Ada", "lastName": "Lovelace"})
+    doc = batch.get_doc()
+    assert doc.startswith("mutation BatchMutation(")
+    assert "$mut_1_name: String!" in doc and "$mut_2_lastName: String!" in doc
+    assert "mut_2: createAuthor(" in doc and "name: $mut_2_name" in doc
+    assert "Elon" not in doc, "values travel as variables, not inlined literals"
+    assert batch.get_variables() == {
+        "mut_1_name": "Elon",
+        "mut_1_lastName": "Musk",
+        "mut_2_name": "Ada",
+        "mut_2_lastName": "Lovelace",
+    }
+
+
+def test_batch_inlines_undeclared_variables_token_aware():
+    batch = MutationBatch()
+    batch.append(
+        'mutation { f(a: $name, b: $name2, s: "$name", o: $obj){ x } }',
+        {"name": 'say "hi"', "name2": 2, "obj": {"ids": [1, 2], "on": True}},
+    )
+    doc = batch.get_doc()
+    assert 'a: "say \\"hi\\""' in doc
+    assert "b: 2" in doc, "$name must not clobber the $name2 prefix"
+    assert 's: "$name"' in doc, "string literals are left untouched"
+    assert "o: {ids: [1, 2], on: true}" in doc
+    assert batch.get_variables() == {}
+
+
+def test_batch_execute_sends_variables():
+    client = MagicMock()
+    client.mutate.return_value = (
+        {"mutation_1": {"successful": True, "messages": []}},
+        [],
+    )
+    batch = MutationBatch(client=client)
+    batch.append(muts.author_set_active, {"active": True})
+    data, error_dict = batch.execute()
+    doc, variables = client.mutate.call_args.args
+    assert "$mutation_1_active: Boolean!" in doc
+    assert variables == {"mutation_1_active": True}
+    assert error_dict == {"mutation_1": []}
+
+
+def test_batch_builds_large_batches():
+    batch = MutationBatch()
+    for n in range(5000):
+        batch.append(muts.author_set_active, {"active": n % 2 == 0})
+    assert batch.get_doc().count("upsertAuthor(") == 5000
+    assert len(batch.get_variables()) == 5000
+
+
+def test_batch_rejects_invalid_documents():
+    with pytest.raises(InvalidMutationException):
+        MutationBatch().append("createAuthor(name: 1)")
+
+
+@pytest.fixture
+def client():
+    Singleton._instances.pop(GraphQLClient, None)
+    gql = GraphQLClient()
+    gql.addEnvironment("batch-test", url="http://ex", default=True)
+    yield gql
+    gql._close()
+    Singleton._instances.pop(GraphQLClient, None)
+
+
+def _fake_execute(requests):
+    """Answers every label of a batch document; the 2nd label fails validation."""
+
+    def execute(doc, variables=None):
+        requests.append((doc, variables))
+        labels = re.findall(r"^\t(\w+): ", doc, re.MULTILINE)
+        return {
+            "data": {
+                label: {
+                    "successful": label != "mut_2",
+                    "messages": [{"message": "taken"}] if label == "mut_2" else [],
+                }
+                for label in labels
+            }
+        }
+
+    return execute
+
+
+def test_batch_execute_in_chunks(client, monkeypatch):
+    requests = []
+    monkeypatch.setattr(client, "execute", _fake_execute(requests))
+    batch = client.batchMutate(label="mut", max_ops_per_request=2, max_concurrency=3)
+    for n in range(5):
+        batch.append(muts.author_set_active, {"active": n % 2 == 0})
+
+    data, error_dict = batch.execute()
+
+    assert len(requests) == 3, "5 mutations in chunks of 2 -> 3 requests"
+    assert [len(variables) for _, variables in requests] == [2, 2, 1]
+    assert sorted(data) == ["mut_1", "mut_2", "mut_3", "mut_4", "mut_5"]
+    assert error_dict["mut_2"] == [{"message": "taken"}]
+    assert error_dict["mut_5"] == []
+    assert error_dict["server"] == [{"message": "taken"}], (
+        "same shape as a single request: label messages also count as errors"
+    )
+
+
+def test_batch_chunked_matches_single_request(client, monkeypatch):
+    monkeypatch.setattr(client, "execute", _fake_execute([]))
+    results = []
+    for max_ops in (None, 1):
+        batch = client.batchMutate(label="mut", max_ops_per_request=max_ops)
+        for n in range(3):
+            batch.append(muts.author_set_active, {"active": True})
+        results.append(batch.execute())
+    assert results[0] == results[1]
+
+
+@pytest.mark.asyncio
+async def test_batch_async_execute_matches_execute(client, monkeypatch):
+    requests = []
+    execute = _fake_execute(requests)
+
+    async def async_execute(doc, variables=None):
+        return execute(doc, variables)
+
+    monkeypatch.setattr(client, "execute", execute)
+    monkeypatch.setattr(client, "async_execute", async_execute)
+    batch = client.batchMutate(label="mut", max_ops_per_request=2, max_concurrency=2)
+    for n in range(5):
+        batch.append(muts.author_set_active, {"active": True})
+
+    assert await batch.async_execute() == batch.execute()
+    assert len(requests) == 6
+
+
+@pytest.mark.asyncio
+async def test_batch_query_async_execute(client, monkeypatch):
+    docs = []
+
+    async def async_execute(doc, variables=None):
+        docs.append(doc)
+        return {
+            "data": {
+                "query_1": [{"id": "1"}],
+                "query_2": [{"id": "2"}],
+            }
+        }
+
+    monkeypatch.setattr(client, "async_execute", async_execute)
+    batch = client.batchQuery()
+    batch.append("query Authors($name: String){ authors(name: $name){ id } }", {})
+    batch.append("{ authors { id } }")
+
+    data, error_dict = await batch.async_execute()
+
+    assert docs[0].startswith("query BatchQuery(\n\t$query_1_name: String\n)")
+    assert data == {"query_1": [{"id": "1"}], "query_2": [{"id": "2"}]}
+    assert error_dict == {"query_1": [], "query_2": []}
@@ -0,0 +1,105 @@
+"""Subscription callbacks on worker processes."""
+
+import os
+import threading
+
+import orjson
+import pytest
+
+from pygqlc.SubscriptionProcesses import (
+    SubscriptionProcessPool,
+    callable_reference,
+    resolve_callable,
+)
+
+
+def record(message):
+    """Importable callback: appends the message and the worker's pid."""
+    path = os.path.join(os.environ["PYGQLC_TEST_OUT"], str(message["sub"]))
+    with open(path, "a", encoding="utf-8") as out:
+        out.write(f"{message['n']} {os.getpid()}\n")
+
+
+def record_error(message):
+    path = os.path.join(os.environ["PYGQLC_TEST_OUT"], "errors")
+    with open(path, "a", encoding="utf-8") as out:
+        out.write(f"{message['type']}\n")
+
+
+def frame(sub, n):
+    return orjson.dumps(
+        {"id": sub, "type": "next", "payload": {"data": {"m": {"sub": sub, "n": n}}}}
+    )
+
+
+def read(tmp_path, name):
+    lines = (tmp_path / name).read_text().split()
+    return [int(value) for value in lines[::2]], set(lines[1::2])
+
+
+def test_callbacks_must_be_importable():
+    assert callable_reference(record) == f"{__name__}:record"
+    assert resolve_callable(f"{__name__}:record") is record
+    with pytest.raises(ValueError):
+        callable_reference(lambda message: None)
+
+    def nested(message):
+        pass
+
+    with pytest.raises(ValueError):
+        callable_reference(nested)
+    with pytest.raises(ValueError):
+        callable_reference("pygqlc.nothing_here:callback")
+
+
+def test_frames_are_sticky_and_ordered_per_subscription(tmp_path, monkeypatch):
+    monkeypatch.setenv("PYGQLC_TEST_OUT", str(tmp_path))
+    pool = SubscriptionProcessPool(2)
+    ids = [str(n) for n in range(1, 7)]
+    runs = {}
+    stopped = threading.Event()
+
+    def on_stop(_id):
+        def done(count):
+            runs[_id] = count
+            if len(runs) == len(ids):
+                stopped.set()
+
+        return done
+
+    handles = {
+        _id: pool.register(
+            _id,
+            f"{__name__}:record",
+            f"{__name__}:record_error",
+            True,
+            on_stop(_id),
+        )
+        for _id in ids
+    }
+    for handle in handles.values():
+        handle.start()
+    for n in range(50):
+        for _id, handle in handles.items():
+            handle.put(frame(_id, n))
+    handles["1"].put(orjson.dumps({"id": "1", "type": "error", "payload": []}))
+    for _id, handle in handles.items():
+        handle.stop()
+    assert stopped.wait(30), "the workers did not stop every subscription"
+    pool.close(5)
+
+    pids = set()
+    for _id in ids:
+        order, sub_pids = read(tmp_path, _id)
+        assert order == list(range(50))
+        assert len(sub_pids) == 1  # sticky: one process per subscription
+        pids |= sub_pids
+        assert runs[_id] == 50 and not handles[_id].is_alive()
+    assert len(pids) == 2 and str(os.getpid()) not in pids
+    assert (tmp_path / "errors").read_text() == "error\n"
+    assert {pool.worker_of(_id) for _id in ids} == {0, 1}
+
+
+def test_pool_needs_a_process():
+    with pytest.raises(ValueError):
+        SubscriptionProcessPool(0)
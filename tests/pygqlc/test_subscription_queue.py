@@ -0,0 +1,115 @@
+"""Bounded subscription queues and their overflow policies."""
+
+import queue
+import threading
+import time
+
+import pytest
+
+from pygqlc.SubscriptionQueue import MessageBatch, SubscriptionQueue
+
+
+def frame(sensor, value):
+    return {"type": "next", "payload": {"data": {"m": {"sensor": sensor, "v": value}}}}
+
+
+def sensor_key(message):
+    return message["payload"]["data"]["m"]["sensor"]
+
+
+def drain(messages):
+    return [messages.get() for _ in range(len(messages))]
+
+
+def test_drop_oldest_keeps_the_latest_frames():
+    messages = SubscriptionQueue(3, "drop_oldest")
+    for n in range(5):
+        assert messages.put(n)
+    assert drain(messages) == [2, 3, 4]
+    assert messages.stats()["dropped"] == 2
+    assert messages.high_water == 3
+
+
+def test_drop_newest_keeps_the_first_frames():
+    messages = SubscriptionQueue(3, "drop_newest")
+    assert [messages.put(n) for n in range(5)] == [True] * 3 + [False] * 2
+    assert drain(messages) == [0, 1, 2]
+    assert messages.dropped == 2
+
+
+def test_control_frames_bypass_the_limit():
+    messages = SubscriptionQueue(1, "drop_newest")
+    messages.put(0)
+    assert messages.put({"type": "complete"}, control=True)
+    assert drain(messages) == [0, {"type": "complete"}]
+
+
+def test_coalesce_replaces_the_queued_frame_with_the_same_key():
+    messages = SubscriptionQueue(2, "coalesce", coalesce_key=sensor_key)
+    for value in range(3):
+        messages.put(frame("a", value))
+    messages.put(frame("b", 0))
+    messages.put({"type": "next", "payload": {}})  # no key: never coalesced
+    assert [m["payload"] for m in drain(messages)] == [
+        {"data": {"m": {"sensor": "b", "v": 0}}},
+        {},
+    ]  # "a" was the oldest once full
+    assert (messages.coalesced, messages.dropped) == (2, 1)
+    messages.put(frame("a", 9))
+    assert messages.get() == frame("a", 9)
+    assert messages.depth == 0
+
+
+def test_block_waits_for_room_until_closed():
+    messages = SubscriptionQueue(1, "block")
+    messages.put(0)
+    results = []
+    writer = threading.Thread(target=lambda: results.append(messages.put(1)))
+    writer.start()
+    writer.join(0.05)
+    assert writer.is_alive() and messages.depth == 1
+    assert messages.get() == 0
+    writer.join(1)
+    assert results == [True] and messages.get() == 1
+
+    messages.put(2)
+    writer = threading.Thread(target=lambda: results.append(messages.put(3)))
+    writer.start()
+    messages.close()
+    writer.join(1)
+    assert results[-1] is False and messages.dropped == 0
+
+
+def test_unknown_policy_is_rejected():
+    with pytest.raises(ValueError):
+        SubscriptionQueue(1, "spill")
+    with pytest.raises(ValueError):
+        SubscriptionQueue(1, "coalesce")
+
+
+def test_get_with_timeout_raises_empty():
+    messages = SubscriptionQueue(None)
+    started = time.monotonic()
+    with pytest.raises(queue.Empty):
+        messages.get(timeout=0.05)
+    assert time.monotonic() - started >= 0.04
+    messages.put(1)
+    assert messages.get(timeout=0) == 1
+
+
+def test_message_batch_fills_and_times_out():
+    batch = MessageBatch(size=2, window=0.05)
+    assert batch.remaining() is None and not batch
+    assert batch.add("a") is False
+    assert 0 < batch.remaining() <= 0.05
+    assert batch.add("b") is True
+    assert batch.take() == ["a", "b"] and batch.remaining() is None
+    batch.add("c")
+    time.sleep(0.06)
+    assert batch.remaining() == 0
+
+
+def test_message_batch_without_window_is_due_at_once():
+    batch = MessageBatch(size=None)
+    assert all(batch.add(n) is False for n in range(100))
+    assert batch.remaining() == 0 and len(batch.take()) == 100
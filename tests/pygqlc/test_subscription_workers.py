@@ -0,0 +1,113 @@
+"""Subscription callbacks on a shared worker pool."""
+
+import threading
+import time
+
+import pytest
+
+from pygqlc.SubscriptionQueue import SubscriptionQueue
+from pygqlc.SubscriptionWorkers import PooledSubscription, SubscriptionWorkerPool
+
+
+def pooled(pool, handled, stop_on=None):
+    messages = SubscriptionQueue(None)
+    stopped = threading.Event()
+
+    def step(message):
+        if message == stop_on:
+            return False
+        time.sleep(0.001)
+        handled.append((message, threading.current_thread().name))
+        return True
+
+    handle = PooledSubscription(pool, messages, step, stopped.set)
+    messages.on_put = handle.schedule
+    handle.start()
+    return messages, handle, stopped
+
+
+def test_frames_are_serial_per_subscription_and_parallel_across():
+    pool = SubscriptionWorkerPool(3, budget=4)
+    handled = {name: [] for name in "abc"}
+    subs = {name: pooled(pool, handled[name], stop_on="end") for name in "abc"}
+    for n in range(40):
+        for messages, _, _ in subs.values():
+            messages.put(n)
+    for messages, handle, stopped in subs.values():
+        messages.put("end", control=True)
+        handle.join(5)
+        assert stopped.is_set() and not handle.is_alive()
+    for name in "abc":
+        assert [message for message, _ in handled[name]] == list(range(40))
+    workers = {worker for frames in handled.values() for _, worker in frames}
+    assert len(workers) > 1 and all(
+        w.startswith("pygqlc-subscription") for w in workers
+    )
+    pool.close(1)
+
+
+def test_a_stopped_subscription_is_not_scheduled_again():
+    pool = SubscriptionWorkerPool(1)
+    handled = []
+    messages, handle, stopped = pooled(pool, handled, stop_on="end")
+    messages.put("end", control=True)
+    handle.join(5)
+    messages.put(1)
+    pool.close(1)
+    assert handled == [] and stopped.is_set()
+
+
+def test_a_raising_step_keeps_the_worker_and_other_subscriptions():
+    pool = SubscriptionWorkerPool(1)
+    handled = []
+    failing = SubscriptionQueue(None)
+
+    def step(message):
+        if message == "boom":
+            raise RuntimeError("callback failed")
+        handled.append(message)
+        return True
+
+    handle = PooledSubscription(pool, failing, step, lambda: None)
+    failing.on_put = handle.schedule
+    handle.start()
+    failing.put("boom")
+    failing.put("after")
+    other, _, _ = pooled(pool, handled)
+    other.put("other")
+    deadline = time.monotonic() + 5
+    while len(handled) < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert sorted(m if isinstance(m, str) else m[0] for m in handled) == [
+        "after",
+        "other",
+    ]
+    assert all(thread.is_alive() for thread in pool._threads)
+    assert not handle.scheduled
+    pool.close(1)
+
+
+def test_an_idle_subscription_is_woken_at_its_deadline():
+    pool = SubscriptionWorkerPool(1)
+    messages = SubscriptionQueue(None)
+    woken = threading.Event()
+    deadline = [None]
+
+    def idle():
+        if deadline[0] is None:
+            deadline[0] = time.monotonic() + 0.05
+            return deadline[0]
+        if time.monotonic() >= deadline[0]:
+            woken.set()
+        return None
+
+    handle = PooledSubscription(pool, messages, lambda _m: True, lambda: None, idle)
+    messages.on_put = handle.schedule
+    handle.start()
+    assert woken.wait(2), "the pool did not wake the idle subscription"
+    pool.close(1)
+
+
+def test_pool_needs_a_worker():
+    with pytest.raises(ValueError):
+        SubscriptionWorkerPool(0)